@@ -0,0 +1,145 @@
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.corpus import CorpusSpec, build_corpus
+from benchmarks.suite import BENCHMARKS, compare, get_environment, run_benchmark
+
+DEFAULT_CORPUS_DIR = Path(__file__).parent / ".corpus"
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option(
+    "-k",
+    "--select",
+    "selected",
+    multiple=True,
+    type=click.Choice([benchmark.name for benchmark in BENCHMARKS]),
+    help="Run only the given benchmark. Can be repeated. By default, all the benchmarks are run.",
+)
+@click.option(
+    "-n",
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    show_default=True,
+    help="The number of runs of each benchmark. The median time is reported.",
+)
+@click.option(
+    "-s",
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    show_default=True,
+    help="Multiply the number of fonts in each corpus, and the number of CJK glyphs, by this "
+    "value.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="The value of the ``--jobs`` option passed to the commands.",
+)
+@click.option(
+    "--corpus-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_CORPUS_DIR,
+    help="The directory where the corpora are generated. Existing corpora are reused if they were "
+    "generated with the same scale.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Save the results to a JSON file, that can be used as a baseline for later runs.",
+)
+@click.option(
+    "-b",
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Compare the results with the ones saved in a JSON file.",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.1,
+    show_default=True,
+    help="The relative change of the median time above which a benchmark is reported as slower or "
+    "faster than the baseline.",
+)
+@click.option(
+    "--fail-on-regression",
+    is_flag=True,
+    help="Exit with a non-zero status if a benchmark is slower than the baseline.",
+)
+def cli(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    selected: tuple[str, ...],
+    repeat: int,
+    scale: float,
+    jobs: int,
+    corpus_dir: Path,
+    output: Path | None,
+    baseline: Path | None,
+    threshold: float,
+    fail_on_regression: bool,
+) -> None:
+    """
+    Time foundrytools-cli commands on deterministic synthetic font corpora.
+    """
+    console = Console()
+    spec = CorpusSpec(scale=scale)
+    with console.status("Generating the corpora..."):
+        build_corpus(corpus_dir, spec)
+
+    results = {"environment": get_environment(), "corpus": asdict(spec), "benchmarks": {}}
+    table = Table("Benchmark", "Median (s)", "Min (s)", "Slowest phase")
+    for benchmark in BENCHMARKS:
+        if selected and benchmark.name not in selected:
+            continue
+        with console.status(f"Running {benchmark.name}..."):
+            result = run_benchmark(benchmark, corpus_dir, repeat=repeat, jobs=jobs)
+        results["benchmarks"][benchmark.name] = result
+        phases = result["phases"]
+        slowest_phase = max(phases, key=phases.get) if phases else "-"
+        table.add_row(
+            benchmark.name, f"{result['median']:.4f}", f"{min(result['runs']):.4f}", slowest_phase
+        )
+    console.print(table)
+
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        console.print(f"Results saved to {output}")
+
+    if baseline is None:
+        return
+
+    comparison = compare(results, json.loads(baseline.read_text()), threshold=threshold)
+    colors = {"slower": "red", "faster": "green", "unchanged": "default"}
+    table = Table(
+        "Benchmark", "Baseline (s)", "Current (s)", "Change", title=f"Baseline: {baseline}"
+    )
+    for name, baseline_time, current_time, status in comparison:
+        change = (current_time - baseline_time) / baseline_time if baseline_time else 0.0
+        table.add_row(
+            name,
+            f"{baseline_time:.4f}",
+            f"{current_time:.4f}",
+            f"[{colors[status]}]{change:+.1%} ({status})[/]",
+        )
+    console.print(table)
+
+    if fail_on_regression and any(status == "slower" for *_, status in comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()  # pylint: disable=no-value-for-parameter
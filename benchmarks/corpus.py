@@ -0,0 +1,314 @@
+"""
+Deterministic synthetic font corpora for the benchmarks.
+
+All the fonts are built from scratch with fontTools' ``FontBuilder``, using a seeded random
+generator and fixed timestamps, so that the same corpus is generated byte for byte on every run
+and on every machine with the same fontTools version.
+"""
+
+import json
+import math
+import random
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from fontTools import version as fonttools_version
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.boundsPen import BoundsPen
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib.tables.TupleVariation import TupleVariation
+
+# Increment when the generated fonts change, to invalidate the existing corpora
+CORPUS_VERSION = 1
+
+UNITS_PER_EM = 1000
+ASCENT = 800
+DESCENT = -200
+ADVANCE_WIDTH = 600
+
+# 2024-01-01 00:00:00, in seconds since 1904-01-01
+TIMESTAMP = 3786825600
+
+LATIN_CODEPOINTS = list(range(0x20, 0x7F))
+CJK_FIRST_CODEPOINT = 0x4E00
+
+# Glyphs that are neither mapped nor referenced, for ``fix unreachable-glyphs``
+UNREACHABLE_GLYPHS = 16
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """
+    The size of a corpus. The number of fonts and of CJK glyphs are multiplied by ``scale``.
+    """
+
+    scale: float = 1.0
+    latin_fonts: int = 8
+    cjk_fonts: int = 1
+    cjk_glyphs: int = 6000
+    variable_fonts: int = 2
+    seed: int = 0
+
+    def scaled(self, value: int) -> int:
+        """Scale a number of items, keeping at least one."""
+        return max(1, round(value * self.scale))
+
+
+def build_corpus(corpus_dir: Path, spec: CorpusSpec) -> Path:
+    """
+    Build the corpora in ``corpus_dir``, unless they were already built with the same spec.
+
+    The corpus directory contains one subdirectory per corpus: ``latin-ttf``, ``latin-otf``,
+    ``cjk-ttf``, ``variable-ttf`` and ``latin-woff2``.
+
+    :param corpus_dir: The directory where the corpora are built
+    :type corpus_dir: Path
+    :param spec: The size of the corpora
+    :type spec: CorpusSpec
+    :return: The corpus directory
+    :rtype: Path
+    """
+    manifest_file = corpus_dir / "manifest.json"
+    manifest = {
+        "corpus_version": CORPUS_VERSION,
+        "fonttools_version": fonttools_version,
+        "spec": asdict(spec),
+    }
+    if manifest_file.is_file() and json.loads(manifest_file.read_text()) == manifest:
+        return corpus_dir
+
+    builders: dict[str, tuple[int, Callable[[int], FontBuilder], str | None, str]] = {
+        "latin-ttf": (
+            spec.scaled(spec.latin_fonts),
+            _latin_builder(spec, is_ttf=True),
+            None,
+            "ttf",
+        ),
+        "latin-otf": (
+            spec.scaled(spec.latin_fonts),
+            _latin_builder(spec, is_ttf=False),
+            None,
+            "otf",
+        ),
+        "latin-woff2": (
+            spec.scaled(spec.latin_fonts),
+            _latin_builder(spec, is_ttf=True),
+            "woff2",
+            "woff2",
+        ),
+        "cjk-ttf": (spec.scaled(spec.cjk_fonts), _cjk_builder(spec), None, "ttf"),
+        "variable-ttf": (spec.scaled(spec.variable_fonts), _variable_builder(spec), None, "ttf"),
+    }
+
+    for name, (count, builder, flavor, extension) in builders.items():
+        _save_fonts(corpus_dir / name, count, builder, flavor, extension)
+
+    manifest_file.write_text(json.dumps(manifest, indent=2))
+    return corpus_dir
+
+
+def _save_fonts(
+    out_dir: Path,
+    count: int,
+    builder: Callable[[int], FontBuilder],
+    flavor: str | None,
+    extension: str,
+) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old_file in out_dir.iterdir():
+        old_file.unlink()
+    prefix = "Bench" + out_dir.name.title().replace("-", "")
+    for index in range(count):
+        fb = builder(index)
+        fb.font.flavor = flavor
+        fb.save(str(out_dir / f"{prefix}-{index:03d}.{extension}"))
+
+
+def _latin_builder(spec: CorpusSpec, is_ttf: bool) -> Callable[[int], FontBuilder]:
+    def _build(index: int) -> FontBuilder:
+        rng = random.Random(f"latin-{spec.seed}-{index}")
+        cmap = {codepoint: f"uni{codepoint:04X}" for codepoint in LATIN_CODEPOINTS}
+        return _build_font(
+            family_name="Bench Latin",
+            style_name=f"Style{index:03d}",
+            cmap=cmap,
+            extra_glyphs=[f"unused{i:02d}" for i in range(UNREACHABLE_GLYPHS)],
+            rng=rng,
+            is_ttf=is_ttf,
+        )
+
+    return _build
+
+
+def _cjk_builder(spec: CorpusSpec) -> Callable[[int], FontBuilder]:
+    def _build(index: int) -> FontBuilder:
+        rng = random.Random(f"cjk-{spec.seed}-{index}")
+        glyph_count = spec.scaled(spec.cjk_glyphs)
+        cmap = {
+            codepoint: f"uni{codepoint:04X}"
+            for codepoint in range(CJK_FIRST_CODEPOINT, CJK_FIRST_CODEPOINT + glyph_count)
+        }
+        return _build_font(
+            family_name="Bench CJK",
+            style_name=f"Style{index:03d}",
+            cmap=cmap,
+            extra_glyphs=[f"unused{i:02d}" for i in range(UNREACHABLE_GLYPHS)],
+            rng=rng,
+            is_ttf=True,
+            contours=4,
+        )
+
+    return _build
+
+
+def _variable_builder(spec: CorpusSpec) -> Callable[[int], FontBuilder]:
+    def _build(index: int) -> FontBuilder:
+        rng = random.Random(f"variable-{spec.seed}-{index}")
+        cmap = {codepoint: f"uni{codepoint:04X}" for codepoint in LATIN_CODEPOINTS}
+        fb = _build_font(
+            family_name=f"Bench Variable {index:03d}",
+            style_name="Regular",
+            cmap=cmap,
+            extra_glyphs=[],
+            rng=rng,
+            is_ttf=True,
+        )
+        weights = ((100, "Thin"), (400, "Regular"), (900, "Black"))
+        fb.setupFvar(
+            axes=[("wght", 100, 400, 900, "Weight")],
+            instances=[
+                {"location": {"wght": weight}, "stylename": style_name}
+                for weight, style_name in weights
+            ],
+        )
+        fb.setupStat(
+            [
+                {
+                    "tag": "wght",
+                    "name": "Weight",
+                    "values": [
+                        {"value": weight, "name": style_name, "flags": 0x2 if weight == 400 else 0}
+                        for weight, style_name in weights
+                    ],
+                }
+            ]
+        )
+        variations: dict[str, list[TupleVariation]] = {}
+        glyf = fb.font["glyf"]
+        for glyph_name in fb.font.getGlyphOrder():
+            glyph = glyf[glyph_name]
+            # The four phantom points don't move
+            coordinates = list(glyph.coordinates) if glyph.numberOfContours > 0 else []
+            deltas = [(round(x * 0.1), 0) for x, _ in coordinates] + [(0, 0)] * 4
+            variations[glyph_name] = [TupleVariation({"wght": (0.0, 1.0, 1.0)}, deltas)]
+        fb.setupGvar(variations)
+        return fb
+
+    return _build
+
+
+def _build_font(
+    family_name: str,
+    style_name: str,
+    cmap: dict[int, str],
+    extra_glyphs: list[str],
+    rng: random.Random,
+    is_ttf: bool,
+    contours: int = 2,
+) -> FontBuilder:
+    glyph_order = [".notdef", *sorted(set(cmap.values())), *extra_glyphs]
+
+    fb = FontBuilder(UNITS_PER_EM, isTTF=is_ttf)
+    fb.setupHead(unitsPerEm=UNITS_PER_EM, created=TIMESTAMP, modified=TIMESTAMP)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap(cmap)
+
+    glyphs: dict[str, Any] = {}
+    metrics: dict[str, tuple[int, int]] = {}
+    for glyph_name in glyph_order:
+        recording_pen = RecordingPen()
+        if glyph_name != "uni0020":
+            for _ in range(contours):
+                _draw_blob(recording_pen, rng, quadratic=is_ttf)
+
+        bounds_pen = BoundsPen(None)
+        recording_pen.replay(bounds_pen)
+        left_side_bearing = round(bounds_pen.bounds[0]) if bounds_pen.bounds else 0
+        metrics[glyph_name] = (ADVANCE_WIDTH, left_side_bearing)
+
+        if is_ttf:
+            tt_pen = TTGlyphPen(None)
+            recording_pen.replay(tt_pen)
+            glyphs[glyph_name] = tt_pen.glyph()
+        else:
+            t2_pen = T2CharStringPen(ADVANCE_WIDTH, None)
+            recording_pen.replay(t2_pen)
+            glyphs[glyph_name] = t2_pen.getCharString()
+
+    ps_name = f"{family_name}-{style_name}".replace(" ", "")
+    if is_ttf:
+        fb.setupGlyf(glyphs)
+    else:
+        fb.setupCFF(
+            psName=ps_name,
+            fontInfo={"FullName": f"{family_name} {style_name}"},
+            charStringsDict=glyphs,
+            privateDict={},
+        )
+
+    fb.setupHorizontalMetrics(metrics)
+    fb.setupHorizontalHeader(ascent=ASCENT, descent=DESCENT)
+    fb.setupNameTable(
+        {
+            "familyName": family_name,
+            "styleName": style_name,
+            "uniqueFontIdentifier": f"{ps_name};{CORPUS_VERSION}",
+            "fullName": f"{family_name} {style_name}",
+            "psName": ps_name,
+            "version": "Version 1.000",
+        }
+    )
+    fb.setupOS2(
+        sTypoAscender=ASCENT,
+        sTypoDescender=DESCENT,
+        usWinAscent=ASCENT,
+        usWinDescent=-DESCENT,
+        achVendID="BNCH",
+    )
+    fb.setupPost()
+    return fb
+
+
+def _draw_blob(pen: RecordingPen, rng: random.Random, quadratic: bool) -> None:
+    """
+    Draw a closed contour around a random center, with curved segments. Blobs drawn in the same
+    glyph usually overlap, which gives ``correct-contours`` something to do.
+    """
+    center_x = rng.randint(150, ADVANCE_WIDTH - 150)
+    center_y = rng.randint(100, ASCENT - 200)
+    points = rng.randint(4, 8)
+    radii = [rng.randint(60, 140) for _ in range(points)]
+
+    def _point(angle_index: float, radius: float) -> tuple[int, int]:
+        angle = 2 * math.pi * angle_index / points
+        return round(center_x + radius * math.cos(angle)), round(
+            center_y + radius * math.sin(angle)
+        )
+
+    pen.moveTo(_point(0, radii[0]))
+    for i in range(1, points + 1):
+        radius = radii[i % points]
+        control_radius = (radii[i - 1] + radius) / 2 * 1.15
+        if quadratic:
+            pen.qCurveTo(_point(i - 0.5, control_radius), _point(i, radius))
+        else:
+            pen.curveTo(
+                _point(i - 0.66, control_radius),
+                _point(i - 0.33, control_radius),
+                _point(i, radius),
+            )
+    pen.closePath()
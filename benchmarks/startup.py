@@ -0,0 +1,113 @@
+"""
+Measure the startup time of ``ftcli --version`` with ``python -X importtime``, and check it against
+a time budget.
+
+Run with ``python -m benchmarks.startup``.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+# Modules that must not be imported to answer ``ftcli --version`` or ``ftcli --help``
+HEAVY_MODULES = ("fontTools", "foundrytools", "afdko", "rich", "loguru", "pathvalidate")
+
+
+def measure_startup(args: tuple[str, ...]) -> tuple[float, dict[str, float], set[str]]:
+    """
+    Run ``ftcli`` with the given arguments in a new interpreter, with ``-X importtime``.
+
+    :param args: The arguments to pass to ``ftcli``
+    :type args: tuple[str, ...]
+    :return: The wall time in seconds, the cumulative import time of each top level import in
+        seconds, and the names of all the imported modules
+    :rtype: tuple[float, dict[str, float], set[str]]
+    """
+    command = [sys.executable, "-X", "importtime", "-m", "foundrytools_cli", *args]
+    start_time = time.perf_counter()
+    process = subprocess.run(command, check=True, capture_output=True, text=True)
+    wall_time = time.perf_counter() - start_time
+
+    # Lines look like "import time: <self us> | <cumulative us> | <indented module name>"
+    top_level: dict[str, float] = {}
+    imported: set[str] = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        imported.add(name.strip())
+        # Nested imports are indented, and their time is included in the top level ones
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative) / 1_000_000
+    return wall_time, top_level, imported
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option(
+    "-n",
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="The number of runs. The median time is compared with the budget.",
+)
+@click.option(
+    "--budget",
+    type=click.FloatRange(min=0),
+    default=0.15,
+    show_default=True,
+    help="The maximum median import time of ``ftcli --version``, in seconds.",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=0),
+    default=10,
+    show_default=True,
+    help="The number of slowest top level imports to show.",
+)
+def cli(repeat: int, budget: float, top: int) -> None:
+    """
+    Check that ``ftcli --version`` starts within a time budget, without importing the modules
+    needed only by the subcommands.
+    """
+    console = Console()
+    wall_times: list[float] = []
+    import_times: list[float] = []
+    top_level: dict[str, float] = {}
+    imported: set[str] = set()
+    for _ in range(repeat):
+        wall_time, top_level, imported = measure_startup(("--version",))
+        wall_times.append(wall_time)
+        import_times.append(sum(top_level.values()))
+
+    table = Table("Module", "Cumulative import time (ms)", title="Slowest top level imports")
+    for name, value in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:top]:
+        table.add_row(name, f"{value * 1000:.1f}")
+    console.print(table)
+
+    median_import_time = statistics.median(import_times)
+    console.print(f"Median wall time: {statistics.median(wall_times) * 1000:.1f} ms")
+    console.print(
+        f"Median import time: {median_import_time * 1000:.1f} ms (budget: {budget * 1000:.1f} ms)"
+    )
+
+    failed = False
+    heavy_imports = sorted(name for name in imported if name in HEAVY_MODULES)
+    if heavy_imports:
+        console.print(f"[red]Modules imported at startup: {', '.join(heavy_imports)}[/]")
+        failed = True
+    if median_import_time > budget:
+        console.print("[red]The import time exceeds the budget[/]")
+        failed = True
+    if failed:
+        sys.exit(1)
+    console.print("[green]OK[/]")
+
+
+if __name__ == "__main__":
+    cli()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,148 @@
+"""
+The benchmarks, and the functions to run them and compare the results with a baseline.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fontTools import version as fonttools_version
+
+from foundrytools_cli import VERSION
+from foundrytools_cli.utils.metrics import PHASES
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """
+    A command to time on one of the corpora.
+
+    ``shared_options`` is ``False`` for the commands that don't accept the options shared by the
+    ``TaskRunner`` commands, like ``--output-dir`` and ``--metrics-out``. Those commands are only
+    timed end to end.
+    """
+
+    name: str
+    args: tuple[str, ...]
+    corpus: str
+    shared_options: bool = True
+
+
+BENCHMARKS = (
+    Benchmark("otf2ttf", ("converter", "otf2ttf"), "latin-otf"),
+    Benchmark("ttf2otf", ("converter", "ttf2otf"), "latin-ttf"),
+    Benchmark("ft2wf", ("converter", "ft2wf"), "latin-ttf"),
+    Benchmark("var2static", ("converter", "var2static"), "variable-ttf"),
+    Benchmark("correct-contours", ("font", "correct-contours"), "latin-ttf"),
+    Benchmark("subr", ("otf", "subr"), "latin-otf"),
+    Benchmark("unreachable-glyphs", ("fix", "unreachable-glyphs"), "cjk-ttf"),
+    Benchmark("font-info", ("print", "font-info"), "latin-woff2", shared_options=False),
+)
+
+
+def run_benchmark(
+    benchmark: Benchmark, corpus_dir: Path, repeat: int, jobs: int = 1
+) -> dict[str, Any]:
+    """
+    Run a benchmark ``repeat`` times, in a new interpreter each time.
+
+    :param benchmark: The benchmark to run
+    :type benchmark: Benchmark
+    :param corpus_dir: The directory containing the corpora
+    :type corpus_dir: Path
+    :param repeat: The number of runs
+    :type repeat: int
+    :param jobs: The value of the ``--jobs`` option
+    :type jobs: int
+    :return: The wall time of each run, their median and the median time of each phase, in seconds
+    :rtype: dict[str, Any]
+    """
+    runs: list[float] = []
+    phases: dict[str, list[float]] = {phase: [] for phase in PHASES}
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="ftcli-bench-") as temp_dir:
+            command = [
+                sys.executable,
+                "-m",
+                "foundrytools_cli",
+                *benchmark.args,
+                str(corpus_dir / benchmark.corpus),
+            ]
+            metrics_file = Path(temp_dir) / "metrics.jsonl"
+            if benchmark.shared_options:
+                output_dir = Path(temp_dir) / "out"
+                command += ["-out", str(output_dir), "-j", str(jobs)]
+                command += ["--metrics-out", str(metrics_file)]
+
+            start_time = time.perf_counter()
+            subprocess.run(
+                command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            runs.append(time.perf_counter() - start_time)
+
+            if metrics_file.is_file():
+                records = [json.loads(line) for line in metrics_file.read_text().splitlines()]
+                for phase, values in phases.items():
+                    values.append(sum(record[phase] for record in records))
+
+    return {
+        "median": statistics.median(runs),
+        "runs": runs,
+        "phases": {phase: statistics.median(values) for phase, values in phases.items() if values},
+    }
+
+
+def get_environment() -> dict[str, str]:
+    """
+    Describe the environment where the benchmarks are run, to be stored with the results.
+
+    :return: The versions of foundrytools-cli, fontTools and Python, and the platform
+    :rtype: dict[str, str]
+    """
+    return {
+        "foundrytools_cli": VERSION,
+        "fonttools": fonttools_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[tuple[str, float, float, str]]:
+    """
+    Compare the median time of each benchmark with the baseline.
+
+    :param results: The current results
+    :type results: dict[str, Any]
+    :param baseline: The baseline results
+    :type baseline: dict[str, Any]
+    :param threshold: The relative change above which a benchmark is reported as slower or faster
+    :type threshold: float
+    :return: A list of ``(name, baseline time, current time, status)`` tuples, where status is
+        ``"slower"``, ``"faster"`` or ``"unchanged"``
+    :rtype: list[tuple[str, float, float, str]]
+    """
+    comparison = []
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        baseline_time = baseline["benchmarks"][name]["median"]
+        current_time = result["median"]
+        ratio = current_time / baseline_time if baseline_time else 1.0
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "unchanged"
+        comparison.append((name, baseline_time, current_time, status))
+    return comparison
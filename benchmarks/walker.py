@@ -0,0 +1,169 @@
+"""
+Compare the discovery of the fonts of a deep directory tree with ``Path.rglob``, as done before,
+and with the parallel walker of ``foundrytools_cli.utils.walker``.
+
+Run with ``python -m benchmarks.walker``. Use ``--tree-dir`` on a network file system to measure
+the effect of the latency.
+"""
+
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from foundrytools_cli.utils.sniffing import sniff_font
+from foundrytools_cli.utils.walker import walk_fonts
+
+# An sfnt header without tables: enough to be recognized as a font by ``sniff_font``
+FONT_DATA = b"\0\1\0\0" + bytes(8)
+# The files that are not fonts, with or without an extension
+OTHER_FILES = {".png": b"\x89PNG\r\n\x1a\n", ".txt": b"OFL\n", "": b"#!/bin/sh\n"}
+SEED = 1
+
+
+def build_tree(root: Path, depth: int, fanout: int, files_per_dir: int) -> int:
+    """
+    Generate a tree of directories with font files and other files, some of them without an
+    extension.
+
+    :param root: The directory to generate the tree in
+    :type root: Path
+    :param depth: The number of levels of subdirectories
+    :type depth: int
+    :param fanout: The number of subdirectories of each directory
+    :type fanout: int
+    :param files_per_dir: The number of files in each directory
+    :type files_per_dir: int
+    :return: The number of font files
+    :rtype: int
+    """
+    rng = random.Random(SEED)
+    num_fonts = 0
+    directories = [root]
+    for level in range(depth + 1):
+        next_directories: list[Path] = []
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            for i in range(files_per_dir):
+                if rng.random() < 0.5:
+                    suffix = rng.choice((".ttf", ".otf", ""))
+                    (directory / f"font-{i}{suffix}").write_bytes(FONT_DATA)
+                    num_fonts += 1
+                else:
+                    suffix, data = rng.choice(list(OTHER_FILES.items()))
+                    (directory / f"file-{i}{suffix}").write_bytes(data)
+            if level < depth:
+                next_directories.extend(directory / f"dir-{i}" for i in range(fanout))
+        directories = next_directories
+    return num_fonts
+
+
+def rglob_fonts(root: Path) -> Iterator[Path]:
+    """Find the files with ``Path.rglob``, like the task runner did before the parallel walker."""
+    return (x for x in root.rglob("*") if x.is_file())
+
+
+def time_discovery(finder: Callable[[Path], Iterator[Path]], root: Path) -> tuple[float, int]:
+    """
+    Time the discovery of the fonts of a tree: finding the files, and reading their header.
+
+    :param finder: The function that finds the files
+    :type finder: Callable[[Path], Iterator[Path]]
+    :param root: The root of the tree
+    :type root: Path
+    :return: The time in seconds and the number of fonts found
+    :rtype: tuple[float, int]
+    """
+    start_time = time.perf_counter()
+    num_fonts = sum(1 for file in finder(root) if sniff_font(file) is not None)
+    return time.perf_counter() - start_time, num_fonts
+
+
+@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.option(
+    "--depth", type=click.IntRange(min=0), default=4, show_default=True, help="The tree depth."
+)
+@click.option(
+    "--fanout",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="The number of subdirectories of each directory.",
+)
+@click.option(
+    "--files",
+    "files_per_dir",
+    type=click.IntRange(min=0),
+    default=20,
+    show_default=True,
+    help="The number of files in each directory.",
+)
+@click.option(
+    "-n",
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="The number of runs. The median time is shown.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="The number of threads of the parallel walker. Defaults to min(32, CPUs + 4).",
+)
+@click.option(
+    "--tree-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Generate the tree in this directory instead of a temporary one.",
+)
+def cli(
+    depth: int,
+    fanout: int,
+    files_per_dir: int,
+    repeat: int,
+    workers: int | None,
+    tree_dir: Path | None,
+) -> None:
+    """
+    Time the discovery of the fonts of a generated tree with ``Path.rglob`` and with the parallel
+    walker.
+    """
+    console = Console()
+    with tempfile.TemporaryDirectory(dir=tree_dir) as temp_dir:
+        root = Path(temp_dir)
+        num_fonts = build_tree(root, depth=depth, fanout=fanout, files_per_dir=files_per_dir)
+        num_dirs = sum(fanout**level for level in range(depth + 1))
+        console.print(
+            f"Tree: {num_dirs} directories, {num_dirs * files_per_dir} files, {num_fonts} fonts"
+        )
+
+        finders: dict[str, Callable[[Path], Iterator[Path]]] = {
+            "rglob": rglob_fonts,
+            "parallel walker": lambda path: walk_fonts(path, recursive=True, max_workers=workers),
+        }
+        table = Table("Walker", "Median time (ms)", "Fonts found", "Speedup", title="Discovery")
+        baseline = None
+        for name, finder in finders.items():
+            results = [time_discovery(finder, root) for _ in range(repeat)]
+            median_time = statistics.median(result[0] for result in results)
+            baseline = baseline or median_time
+            table.add_row(
+                name,
+                f"{median_time * 1000:.1f}",
+                str(results[0][1]),
+                f"{baseline / median_time:.2f}x",
+            )
+        console.print(table)
+
+
+if __name__ == "__main__":
+    cli()  # pylint: disable=no-value-for-parameter
@@ -31,6 +31,7 @@ setup(
         "loguru>=0.7.3",
         "pathvalidate>=3.3.1",
         "rich>=14.3.3",
+        "tomli>=2.0.1; python_version < '3.11'",
         "ufolib2>=0.18.1",
         "win32-setctime>=1.2.0; sys_platform == 'win32'",
     ],
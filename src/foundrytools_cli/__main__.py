@@ -1,40 +1,87 @@
+from pathlib import Path
+from typing import Any
+
 import click
 
-from foundrytools_cli.commands.cff import cli as cff
-from foundrytools_cli.commands.cmap import cli as cmap
-from foundrytools_cli.commands.converter import cli as converter
-from foundrytools_cli.commands.fix import cli as fix
-from foundrytools_cli.commands.font import cli as font
-from foundrytools_cli.commands.gsub import cli as gsub
-from foundrytools_cli.commands.hhea import cli as hhea
-from foundrytools_cli.commands.name import cli as name
-from foundrytools_cli.commands.os_2 import cli as os_2
-from foundrytools_cli.commands.otf import cli as otf
-from foundrytools_cli.commands.post import cli as post
-from foundrytools_cli.commands.print import cli as print_
-from foundrytools_cli.commands.ttf import cli as ttf
-from foundrytools_cli.commands.utils import cli as utils
+from foundrytools_cli import VERSION
+from foundrytools_cli.utils.lazy_group import LazyGroup
+
+# The subcommands are imported only when invoked, to keep the startup fast. ``ftcli --help`` imports
+# them all, to show their help texts.
+COMMANDS = {
+    "cff": "foundrytools_cli.commands.cff:cli",
+    "chain": "foundrytools_cli.commands.chain:cli",
+    "cmap": "foundrytools_cli.commands.cmap:cli",
+    "converter": "foundrytools_cli.commands.converter:cli",
+    "fix": "foundrytools_cli.commands.fix:cli",
+    "font": "foundrytools_cli.commands.font:cli",
+    "gsub": "foundrytools_cli.commands.gsub:cli",
+    "hhea": "foundrytools_cli.commands.hhea:cli",
+    "index": "foundrytools_cli.commands.index:cli",
+    "name": "foundrytools_cli.commands.name:cli",
+    "os2": "foundrytools_cli.commands.os_2:cli",
+    "otf": "foundrytools_cli.commands.otf:cli",
+    "post": "foundrytools_cli.commands.post:cli",
+    "print": "foundrytools_cli.commands.print:cli",
+    "run": "foundrytools_cli.commands.run:cli",
+    "serve": "foundrytools_cli.commands.serve:cli",
+    "ttf": "foundrytools_cli.commands.ttf:cli",
+    "utils": "foundrytools_cli.commands.utils:cli",
+}
+
+
+class CliGroup(LazyGroup):
+    """
+    The ``ftcli`` group. With ``--client``, the command is sent to a running ``ftcli serve`` instead
+    of being run in this process.
+    """
+
+    def resolve_command(
+        self, ctx: click.Context, args: list[str]
+    ) -> tuple[str | None, click.Command | None, list[str]]:
+        # This runs before the subcommand is imported
+        if ctx.params.get("client"):
+            # pylint: disable=import-outside-toplevel
+            from foundrytools_cli.utils.daemon import connect, get_default_socket_path, run_client
+
+            socket_path = ctx.params.get("socket_path") or get_default_socket_path()
+            if "-" in args:
+                # The server can't read the standard input of the client
+                click.echo("Reading the standard input, running locally", err=True)
+                return super().resolve_command(ctx, args)
+            sock = connect(socket_path)
+            if sock is not None:
+                ctx.exit(run_client(sock, args))
+            click.echo(f"No server is listening on {socket_path}, running locally", err=True)
+        return super().resolve_command(ctx, args)
 
 
 @click.group(
+    cls=CliGroup,
     help="A collection of command line tools for working with font files.",
-    commands={
-        "cff": cff,
-        "cmap": cmap,
-        "converter": converter,
-        "fix": fix,
-        "font": font,
-        "gsub": gsub,
-        "hhea": hhea,
-        "name": name,
-        "os2": os_2,
-        "otf": otf,
-        "post": post,
-        "print": print_,
-        "ttf": ttf,
-        "utils": utils,
-    },
+    lazy_commands=COMMANDS,
+)
+@click.option(
+    "--client",
+    is_flag=True,
+    help="""
+    Send the command to a server started with ``ftcli serve``, to avoid the startup time. If no
+    server is running, the command is run locally.
+    """,
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="""
+    The socket of the server used by ``--client``. Defaults to the ``FTCLI_SOCKET`` environment
+    variable, or to a per-user socket in the runtime directory.
+    """,
 )
-@click.version_option()
-def cli() -> None:  # pylint: disable=missing-function-docstring
+@click.version_option(VERSION)
+def cli(**_: Any) -> None:  # pylint: disable=missing-function-docstring
     pass
+
+
+if __name__ == "__main__":
+    cli()
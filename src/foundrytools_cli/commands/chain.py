@@ -0,0 +1,109 @@
+import shlex
+from pathlib import Path
+from typing import Any
+
+import click
+from click.core import ParameterSource
+
+from foundrytools_cli.utils import BaseCommand
+from foundrytools_cli.utils.task_chain import ChainStep, TaskChain
+from foundrytools_cli.utils.task_runner import TaskRunner
+
+
+def _get_step(
+    ctx: click.Context, command_line: str, input_path: Path, options: dict[str, Any]
+) -> ChainStep:
+    """
+    Resolve a command line like ``"os2 recalc-avg-width"`` to a chain step.
+
+    The command is invoked with the input path and the shared options of the chain, and the
+    TaskRunner it creates is collected instead of being run.
+    """
+    args = shlex.split(command_line)
+    command: click.Command = ctx.find_root().command
+    names: list[str] = []
+
+    while isinstance(command, click.Group):
+        if not args:
+            raise click.BadParameter(
+                f"Missing subcommand in '{command_line}'", ctx=ctx, param_hint="--command"
+            )
+        names.append(args.pop(0))
+        subcommand = command.get_command(ctx, names[-1])
+        if subcommand is None:
+            raise click.BadParameter(
+                f"No such command: '{' '.join(names)}'", ctx=ctx, param_hint="--command"
+            )
+        command = subcommand
+
+    name = " ".join(names)
+    if not isinstance(command, BaseCommand) or not command.chainable:
+        raise click.BadParameter(
+            f"The '{name}' command can't be chained", ctx=ctx, param_hint="--command"
+        )
+
+    with command.make_context(name, [str(input_path), *args], parent=ctx) as sub_ctx:
+        # The shared options apply to the whole chain, so a step can't set them on its own
+        conflicts = [
+            param.get_error_hint(sub_ctx)
+            for param in command.params
+            if param.name in options
+            and sub_ctx.get_parameter_source(param.name) == ParameterSource.COMMANDLINE
+        ]
+        if conflicts:
+            raise click.UsageError(
+                f"{', '.join(conflicts)} can't be passed to '{name}', pass "
+                f"{'them' if len(conflicts) > 1 else 'it'} to the chain command instead",
+                ctx=ctx,
+            )
+        sub_ctx.params.update({k: v for k, v in options.items() if k in sub_ctx.params})
+        with TaskRunner.collect() as runners:
+            command.invoke(sub_ctx)
+
+    if len(runners) != 1:
+        raise click.BadParameter(
+            f"The '{name}' command can't be chained", ctx=ctx, param_hint="--command"
+        )
+
+    return ChainStep(name=name, runner=runners.pop())
+
+
+@click.command(cls=BaseCommand, chainable=False)
+@click.option(
+    "-c",
+    "--command",
+    "commands",
+    multiple=True,
+    required=True,
+    help="""
+    A command to run, with its options, as it would be written after ``ftcli``. Can be repeated.
+
+    Example: ``-c "os2 recalc-avg-width" -c "name del-names -n 3"``.
+
+    The shared options (``--output-dir``, ``--recursive``, etc.) must be passed to the ``chain``
+    command and are applied to all the chained commands. Passing them to a chained command is an
+    error.
+    """,
+)
+def cli(input_path: Path, commands: tuple[str, ...], **options: dict[str, Any]) -> None:
+    """
+    Run several commands on the same fonts, loading and saving each font only once.
+
+    The commands are applied to each font in the given order, and the font is saved if any of them
+    modified it. Only the last command can be one that saves the fonts by itself, like the
+    converters.
+
+    Commands that run external tools on the font file read the file as it is on disk, without the
+    changes made by the previous commands.
+    """
+    ctx = click.get_current_context()
+    steps = [_get_step(ctx, command, input_path, options) for command in commands]
+
+    for step in steps[:-1]:
+        if not step.runner.save_if_modified:
+            raise click.UsageError(
+                f"The '{step.name}' command saves the fonts by itself, it can only be the last one"
+            )
+
+    runner = TaskChain(input_path=input_path, steps=steps, **options)
+    runner.run()
@@ -26,11 +26,11 @@ def rebuild_cmap(input_path: Path, **options: dict[str, Any]) -> None:
     def task(font: Font, remap_all: bool = False) -> bool:
         remapped_glyphs, _ = font.t_cmap.rebuild_character_map(remap_all=remap_all)
         if remapped_glyphs:
-            logger.info("Remapped glyphs:")
-            for r in remapped_glyphs:
-                logger.opt(colors=True).info(
-                    f" {r[1]} -> <lc>{hex(r[0])[:2]}{hex(r[0])[2:].upper().zfill(6)}</lc>"
-                )
+            logger.info(f"Remapped {len(remapped_glyphs)} glyphs")
+            logger.opt(lazy=True).debug(
+                "Remapped glyphs: {}",
+                lambda: ", ".join(f"{r[1]} -> 0x{r[0]:06X}" for r in remapped_glyphs),
+            )
             return True
 
         return False
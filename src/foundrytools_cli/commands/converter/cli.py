@@ -1,8 +1,10 @@
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Literal, cast
 
 import click
 from fontTools.misc.cliTools import makeOutputFileName
+from fontTools.ttLib import TTCollection
 from fontTools.ttLib.tables._f_v_a_r import Axis, NamedInstance
 from foundrytools import Font, FontFinder
 from foundrytools.app.var2static import (
@@ -15,8 +17,11 @@ from foundrytools.app.var2static import run as var2static
 from foundrytools.constants import WOFF2_FLAVOR, WOFF_FLAVOR
 from pathvalidate import sanitize_filename
 
+from foundrytools_cli.commands.converter.otf_to_ttf import otf2ttf
 from foundrytools_cli.commands.converter.ttf_to_otf import ttf2otf, ttf2otf_with_tx
 from foundrytools_cli.utils import BaseCommand, choice_to_int_callback
+from foundrytools_cli.utils.file_list import get_input_paths
+from foundrytools_cli.utils.journal import save_font_atomic
 from foundrytools_cli.utils.logger import logger
 from foundrytools_cli.utils.task_runner import TaskRunner
 from foundrytools_cli.utils.timer import Timer
@@ -71,33 +76,7 @@ def otf_to_ttf(input_path: Path, **options: dict[str, Any]) -> None:
     Convert PostScript flavored fonts to TrueType flavored fonts.
     """
 
-    def task(
-        font: Font,
-        tolerance: float = 1.0,
-        target_upm: int | None = None,
-        output_dir: Path | None = None,
-        overwrite: bool = True,
-    ) -> None:
-        flavor = font.ttfont.flavor
-        suffix = ".ttf" if flavor is not None else ""
-        extension = font.get_file_ext() if flavor is not None else ".ttf"
-        out_file = font.get_file_path(
-            output_dir=output_dir, overwrite=overwrite, extension=extension, suffix=suffix
-        )
-
-        tolerance = tolerance / 1000 * font.t_head.units_per_em
-
-        logger.info("Converting to TTF...")
-        font.to_ttf(max_err=tolerance, reverse_direction=True)
-
-        if target_upm:
-            logger.info(f"Scaling UPM to {target_upm}...")
-            font.scale_upm(target_upm=target_upm)
-
-        font.save(out_file)
-        logger.success(f"File saved to {out_file}")
-
-    runner = TaskRunner(input_path=input_path, task=task, **options)
+    runner = TaskRunner(input_path=input_path, task=otf2ttf, **options)
     runner.save_if_modified = False
     runner.filter.filter_out_tt = True
     runner.filter.filter_out_variable = True
@@ -168,6 +147,22 @@ def otf_to_ttf(input_path: Path, **options: dict[str, Any]) -> None:
     show_default=True,
     help="Subroutinize the font with ``cffsubr`` after conversion.",
 )
+@click.option(
+    "-oc",
+    "--outline-cache",
+    is_flag=True,
+    default=False,
+    help="""
+    Reuse the conversions of the glyph outlines already converted with the same tolerance and
+    contour correction, in this or in a previous run, and store the new ones.
+
+    Glyphs are matched by their outline and advance width, not by name, so the glyphs shared by
+    the fonts of a family are converted only once. The cache is stored in the user cache directory,
+    or in the directory set in the ``FTCLI_CACHE_DIR`` environment variable.
+
+    This option is only used in the ``qu2cu`` mode.
+    """,
+)
 def ttf_to_otf(input_path: Path, **options: dict[str, Any]) -> None:
     """
     Convert TrueType flavored fonts to PostScript flavored fonts.
@@ -175,12 +170,15 @@ def ttf_to_otf(input_path: Path, **options: dict[str, Any]) -> None:
 
     if options["mode"] == "tx":
         options.pop("tolerance")
+        options.pop("outline_cache")
         task = ttf2otf_with_tx
     else:
         task = ttf2otf  # type: ignore
 
     runner = TaskRunner(input_path=input_path, task=task, **options)
     runner.save_if_modified = False
+    # tx converts the font file
+    runner.depends_on_file_name = options["mode"] == "tx"
     runner.filter.filter_out_ps = True
     runner.filter.filter_out_variable = True
     runner.run()
@@ -240,24 +238,29 @@ def sfnt_to_web(input_path: Path, **options: dict[str, Any]) -> None:
         out_format: Literal["woff", "woff2"] | None = None,
         overwrite: bool = True,
         reorder_tables: bool = False,
-    ) -> None:
+    ) -> list[Path]:
         suffix = font.get_file_ext()
 
         out_formats = [WOFF_FLAVOR, WOFF2_FLAVOR] if out_format is None else [out_format]
+        out_files = []
 
         if WOFF_FLAVOR in out_formats:
             logger.info("Converting to WOFF")
             font.to_woff()
             out_file = font.get_file_path(output_dir=output_dir, overwrite=overwrite, suffix=suffix)
-            font.save(out_file, reorder_tables=reorder_tables)
+            save_font_atomic(font, out_file, reorder_tables=reorder_tables)
             logger.success(f"File saved to {out_file}")
+            out_files.append(out_file)
 
         if WOFF2_FLAVOR in out_formats:
             logger.info("Converting to WOFF2")
             font.to_woff2()
             out_file = font.get_file_path(output_dir=output_dir, overwrite=overwrite, suffix=suffix)
-            font.save(out_file, reorder_tables=reorder_tables)
+            save_font_atomic(font, out_file, reorder_tables=reorder_tables)
             logger.success(f"File saved to {out_file}")
+            out_files.append(out_file)
+
+        return out_files
 
     runner = TaskRunner(input_path=input_path, task=task, **options)
     runner.filter.filter_out_woff = True
@@ -304,7 +307,7 @@ def variable_to_static(input_path: Path, **options: dict[str, Any]) -> None:
         overlap: int = 1,
         output_dir: Path | None = None,
         overwrite: bool = True,
-    ) -> None:
+    ) -> list[Path]:
         if select_instance:
             axes = var_font.t_fvar.table.axes
             selected_instance = _select_instance_coordinates(axes)
@@ -327,6 +330,7 @@ def variable_to_static(input_path: Path, **options: dict[str, Any]) -> None:
             logger.warning(f"The name table cannot be updated: {e}")
             update_font_names = False
 
+        out_files = []
         for i, instance in enumerate(requested_instances, start=1):
             logger.info(f"Exporting instance {i} of {len(requested_instances)}")
             try:
@@ -338,18 +342,27 @@ def variable_to_static(input_path: Path, **options: dict[str, Any]) -> None:
             out_file = makeOutputFileName(
                 sanitize_filename(file_name), output_dir, overWrite=overwrite
             )
-            static_font.save(out_file)
+            save_font_atomic(static_font, out_file)
             static_font.close()
             logger.success(f"Static instance saved to {out_file}\n")
+            out_files.append(Path(out_file))
+
+        return out_files
 
     runner = TaskRunner(input_path=input_path, task=task, **options)
     runner.filter.filter_out_static = True
     runner.filter.filter_out_ps = True
     runner.save_if_modified = False
+    # The instance coordinates are prompted for each font, so worker processes and the progress
+    # display can't be used
+    if options.get("select_instance"):
+        runner.config.runner_options.jobs = 1
+        runner.config.runner_options.timeout = None
+        runner.config.runner_options.verbose = True
     runner.run()
 
 
-@cli.command("ttc2sfnt", cls=BaseCommand)
+@cli.command("ttc2sfnt", cls=BaseCommand, uses_runner=False)
 def ttc_to_sfnt(input_path: Path, **options: dict[str, Any]) -> None:
     """
     Extract fonts from a TTCollection file.
@@ -361,10 +374,15 @@ def ttc_to_sfnt(input_path: Path, **options: dict[str, Any]) -> None:
     recalc_timestamp = bool(options.get("recalc_timestamp", False))
     reorder_tables = bool(options.get("reorder_tables", False))
 
-    finder = FontFinder(input_path)
-    finder.options.recursive = recursive
+    input_files = cast(list[Path] | None, options.get("input_files"))
+
+    def generate_collections() -> Iterator[TTCollection]:
+        for path in get_input_paths(input_path, input_files):
+            finder = FontFinder(path)
+            finder.options.recursive = recursive
+            yield from finder.generate_collections()
 
-    tt_collections = finder.generate_collections()
+    tt_collections = generate_collections()
 
     timer_1 = Timer(
         logger=logger.opt(colors=True).info, text="Elapsed time <cyan>{:0.4f} seconds</>"
@@ -396,7 +414,7 @@ def ttc_to_sfnt(input_path: Path, **options: dict[str, Any]) -> None:
                 overWrite=overwrite,
                 extension=file_ext,
             )
-            font_wrapper.save(out_file, reorder_tables=reorder_tables)
+            save_font_atomic(font_wrapper, out_file, reorder_tables=reorder_tables)
 
             logger.success(f"File saved to {out_file}")
 
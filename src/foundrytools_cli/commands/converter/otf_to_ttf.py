@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from foundrytools import Font
+
+from foundrytools_cli.utils.journal import save_font_atomic
+from foundrytools_cli.utils.logger import logger
+
+
+def otf2ttf(
+    font: Font,
+    tolerance: float = 1.0,
+    target_upm: int | None = None,
+    output_dir: Path | None = None,
+    overwrite: bool = True,
+) -> list[Path]:
+    """
+    Convert PostScript flavored fonts to TrueType flavored fonts.
+
+    :param font: The font to convert
+    :type font: Font
+    :param tolerance: The conversion tolerance (0.0-3.0, default 1.0). Low tolerance adds more
+        points but keeps shapes. High tolerance adds few points but may change shape. Defaults to
+        1.0.
+    :type tolerance: float
+    :param target_upm: The target UPM value for the converted font. Scaling is applied to the font
+        after conversion to TrueType, to avoid scaling a PostScript font (which in some cases can
+        lead to corrupted outlines). Defaults to ``None``.
+    :type target_upm: Optional[int], optional
+    :param output_dir: The output directory. If ``None``, the output file will be saved in the same
+        directory as the input file. Defaults to ``None``.
+    :type output_dir: Optional[Path], optional
+    :param overwrite: Whether to overwrite the output file if it already exists. Defaults to
+        ``True``.
+    :type overwrite: bool
+    :return: The list of the files written
+    :rtype: list[Path]
+    """
+    flavor = font.ttfont.flavor
+    suffix = ".ttf" if flavor is not None else ""
+    extension = font.get_file_ext() if flavor is not None else ".ttf"
+    out_file = font.get_file_path(
+        output_dir=output_dir, overwrite=overwrite, extension=extension, suffix=suffix
+    )
+
+    tolerance = tolerance / 1000 * font.t_head.units_per_em
+
+    logger.info("Converting to TTF...")
+    font.to_ttf(max_err=tolerance, reverse_direction=True)
+
+    if target_upm:
+        logger.info(f"Scaling UPM to {target_upm}...")
+        font.scale_upm(target_upm=target_upm)
+
+    save_font_atomic(font, out_file)
+    logger.success(f"File saved to {out_file}")
+    return [out_file]
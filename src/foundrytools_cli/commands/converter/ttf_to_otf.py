@@ -1,12 +1,27 @@
 from pathlib import Path
 
+import foundrytools
+import pathops
 from afdko.fdkutils import run_shell_command
+from fontTools import version as fonttools_version
+from fontTools.cffLib import PrivateDict
+from fontTools.misc.psCharStrings import T2CharString
+from fontTools.pens.cu2quPen import Cu2QuPen
+from fontTools.pens.qu2cuPen import Qu2CuPen
+from fontTools.pens.recordingPen import RecordingPen
+from fontTools.pens.t2CharStringPen import T2CharStringPen
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.ttGlyphSet import _TTGlyph
 from foundrytools import Font
 from foundrytools.app.otf_check_outlines import run as otf_check_outlines
 from foundrytools.lib.otf_builder import build_otf
+from foundrytools.lib.pathops import simplify_path
 from foundrytools.lib.qu2cu import quadratics_to_cubics_2
 
+from foundrytools_cli.utils.journal import save_font_atomic
 from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.outline_cache import OutlineCache
 
 
 def _build_out_file_name(font: Font, output_dir: Path | None, overwrite: bool = True) -> Path:
@@ -35,6 +50,120 @@ def _build_out_file_name(font: Font, output_dir: Path | None, overwrite: bool =
     )
 
 
+def _convert_glyph(
+    glyph_name: str, glyph: _TTGlyph, tolerance: float, correct_contours: bool
+) -> T2CharString:
+    """
+    Convert a decomposed TrueType glyph to a charstring, like ``quadratics_to_cubics`` of
+    ``foundrytools.lib.qu2cu`` does.
+    """
+    width = glyph.width
+    try:
+        t2_pen = T2CharStringPen(width=width, glyphSet={glyph_name: glyph})
+        qu2cu_pen = Qu2CuPen(t2_pen, max_err=tolerance, all_cubic=True, reverse_direction=True)
+        glyph.draw(qu2cu_pen)
+    except NotImplementedError:
+        temp_t2_pen = T2CharStringPen(width=width, glyphSet=None)
+        glyph.draw(temp_t2_pen)
+        t2_charstring = temp_t2_pen.getCharString()
+        t2_charstring.private = PrivateDict()
+
+        tt_pen = TTGlyphPen(glyphSet=None)
+        cu2qu_pen = Cu2QuPen(other_pen=tt_pen, max_err=tolerance, reverse_direction=False)
+        t2_charstring.draw(cu2qu_pen)
+        tt_glyph = tt_pen.glyph()
+
+        t2_pen = T2CharStringPen(width=width, glyphSet=None)
+        qu2cu_pen = Qu2CuPen(t2_pen, max_err=tolerance, all_cubic=True, reverse_direction=True)
+        tt_glyph.draw(pen=qu2cu_pen, glyfTable=None)
+
+    charstring = t2_pen.getCharString()
+    if not correct_contours:
+        return charstring
+
+    charstring.private = PrivateDict()
+    path = pathops.Path()
+    charstring.draw(path.getPen(glyphSet=None))
+    path = simplify_path(path, glyph_name=glyph_name, clockwise=False)
+    t2_pen = T2CharStringPen(width=width, glyphSet=None)
+    path.draw(t2_pen)
+    return t2_pen.getCharString()
+
+
+def quadratics_to_cubics_cached(
+    font: TTFont, cache: OutlineCache, tolerance: float = 1.0, correct_contours: bool = True
+) -> dict[str, T2CharString]:
+    """
+    Convert the quadratic outlines of a decomposed TrueType font to charstrings, reusing the
+    conversions stored in an outline cache.
+
+    Each glyph is keyed by its advance width and by the commands that draw it, so the glyphs with
+    the same outline are converted once, whatever their name and font. Only the glyphs missing from
+    the cache are converted, and their charstrings are added to it. The charstrings are the same as
+    the ones of ``quadratics_to_cubics`` of ``foundrytools.lib.qu2cu``.
+
+    :param font: The TrueType font, with no composite glyphs
+    :type font: TTFont
+    :param cache: The outline cache. Its identity must include the tolerance and whether the
+        contours are corrected (see ``get_outline_cache``).
+    :type cache: OutlineCache
+    :param tolerance: The maximum error of the conversion, in font units. Defaults to 1.0.
+    :type tolerance: float
+    :param correct_contours: Whether to remove the overlaps and correct the direction of the
+        contours with pathops. Defaults to ``True``.
+    :type correct_contours: bool
+    :return: The charstrings, by glyph name
+    :rtype: dict[str, T2CharString]
+    """
+    glyph_set = font.getGlyphSet()
+    keys: dict[str, str] = {}
+    for glyph_name, glyph in glyph_set.items():
+        recording_pen = RecordingPen()
+        glyph.draw(recording_pen)
+        keys[glyph_name] = cache.get_key(repr((glyph.width, recording_pen.value)))
+
+    programs = cache.get(keys.values())
+    converted: dict[str, list] = {}
+    for glyph_name, key in keys.items():
+        if key not in programs and key not in converted:
+            charstring = _convert_glyph(
+                glyph_name, glyph_set[glyph_name], tolerance, correct_contours
+            )
+            converted[key] = charstring.program
+    cache.store(converted)
+    programs.update(converted)
+
+    # A new charstring for each glyph, since ``build_otf`` sets their private dict
+    return {
+        glyph_name: T2CharString(program=list(programs[key])) for glyph_name, key in keys.items()
+    }
+
+
+def get_outline_cache(tolerance: float, correct_contours: bool) -> OutlineCache:
+    """
+    Open the outline cache of the ``qu2cu`` conversion. Its identity includes the options and the
+    versions of the libraries that convert the outlines, so that a change of any of them doesn't
+    reuse the stale charstrings.
+
+    :param tolerance: The maximum error of the conversion, in font units
+    :type tolerance: float
+    :param correct_contours: Whether the contours are corrected with pathops
+    :type correct_contours: bool
+    :return: The outline cache
+    :rtype: OutlineCache
+    """
+    return OutlineCache(
+        identity={
+            "conversion": "qu2cu",
+            "tolerance": tolerance,
+            "correct_contours": correct_contours,
+            "fonttools": fonttools_version,
+            "foundrytools": foundrytools.__version__,
+            "skia-pathops": pathops.__version__,
+        }
+    )
+
+
 def ttf2otf(
     font: Font,
     tolerance: float = 1.0,
@@ -42,9 +171,10 @@ def ttf2otf(
     correct_contours: bool = True,
     check_outlines: bool = False,
     subroutinize: bool = True,
+    outline_cache: bool = False,
     output_dir: Path | None = None,
     overwrite: bool = True,
-) -> None:
+) -> list[Path]:
     """
     Convert PostScript flavored fonts to TrueType flavored fonts.
 
@@ -67,11 +197,16 @@ def ttf2otf(
     :param subroutinize: Subroutinize the font with ``cffsubr`` after conversion. Defaults to
         ``True``.
     :type subroutinize: bool
+    :param outline_cache: Reuse the charstrings of the outlines already converted with the same
+        options, stored in the outline cache, and add the new ones to it. Defaults to ``False``.
+    :type outline_cache: bool
     :param output_dir: The output directory. If ``None``, the output file will be saved in the same
         directory as the input file. Defaults to ``None``.
     :type output_dir: Optional[Path], optional
     :param overwrite: Whether to overwrite the output file if it already exists. Defaults to
         ``True``.
+    :return: The list of the files written
+    :rtype: list[Path]
     """
     out_file = _build_out_file_name(font=font, output_dir=output_dir, overwrite=overwrite)
 
@@ -86,7 +221,20 @@ def ttf2otf(
     tolerance = tolerance / 1000 * font.t_head.units_per_em
 
     logger.info("Converting to OTF...")
-    font.to_otf(tolerance=tolerance, correct_contours=correct_contours)
+    if outline_cache:
+        cache = get_outline_cache(tolerance=tolerance, correct_contours=correct_contours)
+        try:
+            font.t_glyf.decompose_all()
+            charstrings = quadratics_to_cubics_cached(
+                font.ttfont, cache, tolerance=tolerance, correct_contours=correct_contours
+            )
+        finally:
+            cache.close()
+        logger.info(f"Outline cache: {cache.hits} hits, {cache.misses} misses")
+        build_otf(font=font.ttfont, charstrings_dict=charstrings)
+        font.t_os_2.recalc_avg_char_width()
+    else:
+        font.to_otf(tolerance=tolerance, correct_contours=correct_contours)
 
     if check_outlines:
         logger.info("Checking outlines...")
@@ -97,8 +245,9 @@ def ttf2otf(
         font.subroutinize()
 
     font.ttfont.flavor = flavor
-    font.save(out_file, reorder_tables=True)
+    save_font_atomic(font, out_file, reorder_tables=True)
     logger.success(f"File saved to {out_file}")
+    return [out_file]
 
 
 def ttf2otf_with_tx(
@@ -110,7 +259,7 @@ def ttf2otf_with_tx(
     output_dir: Path | None = None,
     recalc_timestamp: bool = False,
     overwrite: bool = True,
-) -> None:
+) -> list[Path]:
     """
     Convert PostScript flavored fonts to TrueType flavored fonts using tx.
 
@@ -137,6 +286,8 @@ def ttf2otf_with_tx(
     :param overwrite: Whether to overwrite the output file if it already exists. Defaults to
         ``True``
     :type overwrite: bool
+    :return: The list of the files written
+    :rtype: list[Path]
     """
     out_file = _build_out_file_name(font=font, output_dir=output_dir, overwrite=overwrite)
     cff_file = font.get_file_path(extension=".cff", output_dir=output_dir, overwrite=overwrite)
@@ -144,13 +295,13 @@ def ttf2otf_with_tx(
     flavor = font.ttfont.flavor
     if flavor is not None:
         font.ttfont.flavor = None
-        font.save(out_file, reorder_tables=None)
+        save_font_atomic(font, out_file, reorder_tables=None)
         font = Font(out_file, recalc_timestamp=recalc_timestamp)
 
     if target_upm:
         logger.info(f"Scaling UPM to {target_upm}...")
         font.scale_upm(target_upm=target_upm)
-        font.ttfont.save(out_file, reorderTables=None)
+        save_font_atomic(font, out_file, reorder_tables=None)
         font = Font(out_file, recalc_timestamp=recalc_timestamp)
         tx_command = ["tx", "-cff", "-S", "+V", "+b", str(out_file), str(cff_file)]
         run_shell_command(tx_command, suppress_output=True)
@@ -162,7 +313,7 @@ def ttf2otf_with_tx(
     logger.info("Building OTF...")
     charstrings_dict = quadratics_to_cubics_2(font=font.ttfont)
     build_otf(font=font.ttfont, charstrings_dict=charstrings_dict)
-    font.save(out_file, reorder_tables=None)
+    save_font_atomic(font, out_file, reorder_tables=None)
     sfntedit_command = ["sfntedit", "-a", "CFF=" + str(cff_file), str(out_file)]
     run_shell_command(sfntedit_command, suppress_output=True)
 
@@ -183,6 +334,7 @@ def ttf2otf_with_tx(
 
     font.ttfont.flavor = flavor
 
-    font.save(out_file, reorder_tables=None)
+    save_font_atomic(font, out_file, reorder_tables=None)
     cff_file.unlink(missing_ok=True)
     logger.success(f"File saved to {out_file}")
+    return [out_file]
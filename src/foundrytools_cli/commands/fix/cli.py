@@ -7,6 +7,7 @@ from fontTools.misc.roundTools import otRound
 from foundrytools import Font
 
 from foundrytools_cli.utils import BaseCommand
+from foundrytools_cli.utils.file_list import get_input_paths
 from foundrytools_cli.utils.logger import logger
 from foundrytools_cli.utils.task_runner import TaskRunner
 
@@ -38,8 +39,9 @@ def fix_duplicate_components(input_path: Path, **options: dict[str, Any]) -> Non
         decomposed_glyphs = font.t_glyf.remove_duplicate_components()
 
         if decomposed_glyphs:
-            logger.opt(colors=True).info(
-                f"Decomposed glyphs: <lc>{', '.join(decomposed_glyphs)}</lc>"
+            logger.info(f"Decomposed {len(decomposed_glyphs)} glyphs")
+            logger.opt(lazy=True).debug(
+                "Decomposed glyphs: {}", lambda: ", ".join(decomposed_glyphs)
             )
             return True
 
@@ -478,13 +480,18 @@ def fix_vertical_metrics(input_path: Path, **options: dict[str, Any]) -> None:
     """
     from foundrytools import FontFinder
 
-    fonts = FontFinder(input_path).find_fonts()
-    if not fonts:
-        raise click.ClickException("No fonts found.")
-
+    # The metrics are calculated on all the fonts of the family, also the ones in other shards
     metrics = []
-    for font in fonts:
-        metrics.append((font.t_head.y_min, font.t_head.y_max))
+    input_files = cast(list[Path] | None, options.get("input_files"))
+    for path in get_input_paths(input_path, input_files):
+        finder = FontFinder(path)
+        finder.options.recursive = bool(options.get("recursive", False))
+        for font in finder.generate_fonts():
+            with font:
+                metrics.append((font.t_head.y_min, font.t_head.y_max))
+
+    if not metrics:
+        raise click.ClickException("No fonts found.")
 
     # Calculate the minimum y_min and maximum y_max values
     safe_bottom = otRound(min(m[0] for m in metrics))
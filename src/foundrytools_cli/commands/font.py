@@ -234,9 +234,11 @@ def set_production_names(input_path: Path, **options: dict[str, Any]) -> None:
         renamed_glyphs = font.set_production_names()
 
         if renamed_glyphs:
-            logger.info("Renamed glyphs:")
-            for old_name, new_name in renamed_glyphs:
-                logger.opt(colors=True).info(f"  {old_name} -> <lc>{new_name}</lc>")
+            logger.info(f"Renamed {len(renamed_glyphs)} glyphs")
+            logger.opt(lazy=True).debug(
+                "Renamed glyphs: {}",
+                lambda: ", ".join(f"{old} -> {new}" for old, new in renamed_glyphs),
+            )
             return True
 
         return False
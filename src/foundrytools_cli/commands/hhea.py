@@ -74,4 +74,6 @@ def recalc_caret_offset(input_path: Path, **options: dict[str, Any]) -> None:
         return font.t_hhea.is_modified
 
     runner = TaskRunner(input_path=input_path, task=task, **options)
+    # The caret offset is calculated from the font file
+    runner.depends_on_file_name = True
     runner.run()
@@ -0,0 +1,174 @@
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from foundrytools_cli.utils import make_options
+from foundrytools_cli.utils.font_index import COLUMNS, FontIndex, FontIndexError
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.timer import Timer
+from foundrytools_cli.utils.walker import walk_fonts
+
+WHERE_HELP = f"""
+An SQL expression that the fonts must match, like ``is_variable AND outlines = 'CFF2' AND
+us_weight_class >= 700``. The columns are: {", ".join(COLUMNS)}. ``tables`` is a JSON list,
+``names`` is a JSON object by name ID and ``axes`` is a JSON object with the minimum, default and
+maximum value of each axis, like ``json_extract(axes, '$.wght[2]') >= 700``.
+"""
+
+
+def index_options() -> Callable:
+    """
+    Add the options shared by the ``index`` commands to a click command.
+
+    :return: A decorator that adds the options to a click command
+    :rtype: Callable
+    """
+    _index_options = [
+        click.argument(
+            "input_path", type=click.Path(exists=True, resolve_path=True, path_type=Path)
+        ),
+        click.option(
+            "--index",
+            "index_file",
+            type=click.Path(dir_okay=False, resolve_path=True, path_type=Path),
+            required=True,
+            help="The SQLite database file of the index.",
+        ),
+        click.option(
+            "-r",
+            "--recursive",
+            is_flag=True,
+            default=False,
+            help="Recursively find font files both in input directory and its subdirectories.",
+        ),
+    ]
+    return make_options(_index_options)
+
+
+def jobs_option() -> Callable:
+    """
+    Add the ``--jobs`` option to a click command.
+
+    :return: A decorator that adds the ``--jobs`` option to a click command
+    :rtype: Callable
+    """
+    return click.option(
+        "-j",
+        "--jobs",
+        type=click.IntRange(min=0),
+        default=1,
+        help="""
+        The number of processes reading the fonts in parallel. Use ``0`` to start one process per
+        CPU.
+        """,
+    )
+
+
+cli = click.Group(help="Build and query an index of the fonts' metadata.")
+
+
+def _update_index(
+    input_path: Path, index_file: Path, recursive: bool, jobs: int, force: bool
+) -> None:
+    timer = Timer(logger=logger.opt(colors=True).info, text="Elapsed time <cyan>{:0.4f} seconds</>")
+    timer.start()
+    try:
+        index = FontIndex(index_file)
+    except FontIndexError as e:
+        raise click.ClickException(str(e)) from e
+    try:
+        result = index.update(
+            walk_fonts(input_path, recursive=recursive),
+            root=input_path,
+            recursive=recursive,
+            jobs=jobs or os.cpu_count() or 1,
+            force=force,
+        )
+    finally:
+        index.close()
+    logger.opt(colors=True).info(
+        f"Index {index_file} updated: <cyan>{result.added}</> added, "
+        f"<cyan>{result.updated}</> updated, <cyan>{result.unchanged}</> unchanged, "
+        f"<cyan>{result.removed}</> removed"
+    )
+    if result.failed:
+        logger.warning(f"{result.failed} fonts couldn't be read")
+    timer.stop()
+
+
+@cli.command("build", no_args_is_help=True)
+@index_options()
+@jobs_option()
+def build(input_path: Path, index_file: Path, recursive: bool, jobs: int) -> None:
+    """
+    Read the metadata of all the fonts in INPUT_PATH and store it in the index.
+
+    The index is created if it doesn't exist. The records of other directories are kept.
+    """
+    _update_index(input_path, index_file, recursive=recursive, jobs=jobs, force=True)
+
+
+@cli.command("update", no_args_is_help=True)
+@index_options()
+@jobs_option()
+def update(input_path: Path, index_file: Path, recursive: bool, jobs: int) -> None:
+    """
+    Update the index with the fonts in INPUT_PATH that were added or changed since the last update.
+
+    Only the files whose size or modification time has changed are read. The records of the files
+    that no longer exist are removed.
+    """
+    _update_index(input_path, index_file, recursive=recursive, jobs=jobs, force=False)
+
+
+@cli.command("query", no_args_is_help=True)
+@index_options()
+@click.option("--where", help=WHERE_HELP)
+def query(input_path: Path, index_file: Path, recursive: bool, where: str | None) -> None:
+    """
+    Print a table of the indexed fonts in INPUT_PATH, without opening them.
+    """
+    try:
+        index = FontIndex(index_file, read_only=True)
+        try:
+            rows = list(index.query(input_path, recursive=recursive, where=where))
+        finally:
+            index.close()
+    except FontIndexError as e:
+        raise click.ClickException(str(e)) from e
+
+    table = Table(title=f"\nftCLI - Font Index ({len(rows)} fonts)", title_style="bold green")
+    for header in (
+        "File",
+        "Flavor",
+        "Outlines",
+        "Glyphs",
+        "Family name",
+        "Subfamily name",
+        "Weight",
+        "Width",
+        "Axes",
+    ):
+        table.add_column(header, style="bold cyan" if header == "File" else None)
+    base_dir = input_path if input_path.is_dir() else input_path.parent
+    for row in rows:
+        table.add_row(
+            str(Path(row["path"]).relative_to(base_dir)),
+            row["flavor"],
+            row["outlines"],
+            str(row["num_glyphs"]),
+            row["family_name"],
+            row["subfamily_name"],
+            str(row["us_weight_class"]),
+            str(row["us_width_class"]),
+            ", ".join(
+                f"{tag} {minimum:g}-{maximum:g}"
+                for tag, (minimum, _, maximum) in json.loads(row["axes"]).items()
+            ),
+        )
+    Console().print(table)
@@ -325,6 +325,8 @@ def recalc_stems(input_path: Path, **options: dict[str, Any]) -> None:
         return True
 
     runner = TaskRunner(input_path=input_path, task=task, **options)
+    # The stems are read from the font file
+    runner.depends_on_file_name = True
     runner.filter.filter_out_tt = True
     runner.filter.filter_out_variable = True
     runner.run()
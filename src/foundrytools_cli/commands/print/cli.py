@@ -1,15 +1,34 @@
+from collections.abc import Iterator
 from pathlib import Path
 
 import click
-from foundrytools import FontFinder
+from foundrytools import Font, FontFinder
 
 from foundrytools_cli.commands.print.font_info import main as print_font_info
 from foundrytools_cli.commands.print.font_names import main as print_names
 from foundrytools_cli.commands.print.vf_instances import main as print_vf_instances
+from foundrytools_cli.utils.archives import ArchiveError, is_archive, read_fonts
 
 cli = click.Group(help="Prints various font's information.")
 
 
+def _generate_fonts(input_path: Path, filter_out_static: bool = False) -> Iterator[Font]:
+    """
+    Generate the fonts of a file, a directory, or a zip or tar archive, which is read in memory.
+    """
+    if not is_archive(input_path):
+        finder = FontFinder(input_path)
+        finder.filter.filter_out_static = filter_out_static
+        yield from finder.generate_fonts()
+        return
+    try:
+        for font in read_fonts(input_path):
+            if not (filter_out_static and font.is_static):
+                yield font
+    except ArchiveError as e:
+        raise click.ClickException(str(e)) from e
+
+
 @cli.command("instances")
 @click.argument("input_path", type=click.Path(exists=True, resolve_path=True, path_type=Path))
 def instances(input_path: Path) -> None:
@@ -17,9 +36,7 @@ def instances(input_path: Path) -> None:
     Prints a table with the variable font instances.
     """
 
-    finder = FontFinder(input_path)
-    finder.filter.filter_out_static = True
-    for font in finder.generate_fonts():
+    for font in _generate_fonts(input_path, filter_out_static=True):
         print_vf_instances(font)
 
 
@@ -31,8 +48,7 @@ def font_info(input_path: Path) -> None:
     features.
     """
 
-    finder = FontFinder(input_path)
-    for font in finder.generate_fonts():
+    for font in _generate_fonts(input_path):
         print_font_info(font)
 
 
@@ -57,6 +73,5 @@ def font_names(input_path: Path, max_lines: int | None = None, minimal: bool = F
     Prints the name table.
     """
 
-    finder = FontFinder(input_path)
-    for font in finder.generate_fonts():
+    for font in _generate_fonts(input_path):
         print_names(font, max_lines=max_lines, minimal=minimal)
@@ -0,0 +1,219 @@
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import click
+
+from foundrytools_cli.utils.batch_runner import BatchError, BatchJob, BatchRunner
+from foundrytools_cli.utils.logger import configure_logging, logger
+from foundrytools_cli.utils.task_runner import TaskRunner
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+# The options that are set for the whole batch, and can't be set for a single job
+BATCH_OPTIONS = ("jobs", "timeout", "log_format", "log_file", "log_level")
+
+
+def _get_option_args(
+    command: click.Command, options: dict[str, Any], base_dir: Path, job_name: str
+) -> list[str]:
+    """
+    Convert the options of a job, given by parameter name (``output_dir = "out"``), to command
+    line arguments (``["--output-dir", "out"]``). Relative paths are resolved from the directory of
+    the jobs file.
+    """
+    params = {param.name: param for param in command.params if isinstance(param, click.Option)}
+    args: list[str] = []
+    for name, value in options.items():
+        param = params.get(name)
+        if param is None or name in BATCH_OPTIONS:
+            raise click.UsageError(f"Job '{job_name}': invalid option '{name}'")
+        if param.is_flag:
+            if value:
+                args.append(param.opts[-1])
+            elif param.secondary_opts:
+                args.append(param.secondary_opts[-1])
+            continue
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(param.type, click.Path):
+                item = base_dir / item
+            args.extend([param.opts[-1], str(item)])
+    return args
+
+
+def _get_job(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    ctx: click.Context,
+    chain_command: click.Command,
+    index: int,
+    job: dict[str, Any],
+    defaults: dict[str, Any],
+    workers: int,
+    timeout: float | None,
+) -> BatchJob:
+    """
+    Create the TaskRunner of a job by invoking ``ftcli chain`` with the commands of the job.
+    """
+    name = str(job.get("name", f"job-{index}"))
+    if "input" not in job or not job.get("commands"):
+        raise click.UsageError(f"Job '{name}': 'input' and 'commands' are required")
+
+    base_dir: Path = ctx.params["jobs_file"].parent
+    args = [str(base_dir / job["input"])]
+    for command in job["commands"]:
+        args.extend(["--command", command])
+    args.extend(
+        _get_option_args(chain_command, {**defaults, **job.get("options", {})}, base_dir, name)
+    )
+    args.extend(["--jobs", str(workers)])
+    if timeout is not None:
+        args.extend(["--timeout", str(timeout)])
+
+    try:
+        with chain_command.make_context("chain", args, parent=ctx) as sub_ctx:  # noqa: SIM117
+            with TaskRunner.collect() as runners:
+                chain_command.invoke(sub_ctx)
+    except click.ClickException as e:
+        raise click.UsageError(f"Job '{name}': {e.format_message()}") from e
+
+    return BatchJob(
+        name=name,
+        runner=runners.pop(),
+        commands=list(job["commands"]),
+        depends_on=list(job.get("depends_on", [])),
+    )
+
+
+@click.command("run", context_settings={"help_option_names": ["-h", "--help"]})
+@click.argument(
+    "jobs_file", type=click.Path(exists=True, dir_okay=False, resolve_path=True, path_type=Path)
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    help="""
+    The number of fonts to process in parallel, across all the jobs. Use ``0`` to start one worker
+    per CPU.
+
+    By default, fonts are processed one at a time.
+    """,
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="""
+    The maximum time to process each font, in seconds. The fonts that run out of time are reported
+    as timed out, and their jobs as failed.
+    """,
+)
+@click.option(
+    "--log-format",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    show_default=True,
+    help="The format of the log messages, like the ``--log-format`` option of the commands.",
+)
+@click.option(
+    "--log-file",
+    type=click.Path(path_type=Path, dir_okay=False, resolve_path=True),
+    help="Append the log messages of all the jobs to a file.",
+)
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+    default="INFO",
+    show_default=True,
+    help="The minimum level of the log messages.",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Print the stages of the schedule and exit, without running the jobs.",
+)
+def cli(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    jobs_file: Path,
+    jobs: int,
+    timeout: float | None,
+    log_format: str,
+    log_file: Path | None,
+    log_level: str,
+    dry_run: bool,
+) -> None:
+    """
+    Run the jobs described in a TOML file.
+
+    Each job applies an ordered list of commands to an input path, loading and saving each font only
+    once, like ``ftcli chain``:
+
+    \b
+    [options]  # Applied to all the jobs
+    recalc_timestamp = true
+    [[jobs]]
+    name = "latin"
+    input = "fonts/latin"
+    commands = ["os2 recalc-avg-width", "name del-names -n 3"]
+    options = { output_dir = "out/latin", recursive = true }
+    [[jobs]]
+    name = "latin-web"
+    input = "out/latin"
+    commands = ["converter ft2wf -f woff2"]
+    depends_on = ["latin"]
+
+    The options are the shared options of the commands, by parameter name. Relative paths are
+    resolved from the directory of the jobs file.
+
+    The jobs are run in stages: a job runs after the jobs it depends on, and after the jobs declared
+    before it that write where it reads or read where it writes. The jobs of a stage run at the same
+    time, with a single pool of workers. The jobs that depend on a failed job are skipped.
+    """
+    with configure_logging(log_format=log_format, log_file=log_file, log_level=log_level):
+        _run_batch(jobs_file, jobs, timeout, dry_run)
+
+
+def _run_batch(jobs_file: Path, jobs: int, timeout: float | None, dry_run: bool) -> None:
+    ctx = click.get_current_context()
+    root = ctx.find_root().command
+    chain_command = root.get_command(ctx, "chain") if isinstance(root, click.Group) else None
+    if chain_command is None:
+        raise click.UsageError("The jobs must be run with 'ftcli run'")
+
+    workers = jobs or os.cpu_count() or 1
+    try:
+        with jobs_file.open("rb") as f:
+            batch = tomllib.load(f)
+    except tomllib.TOMLDecodeError as e:
+        raise click.BadParameter(str(e), ctx=ctx, param_hint="JOBS_FILE") from e
+
+    if not batch.get("jobs"):
+        raise click.BadParameter("No jobs found", ctx=ctx, param_hint="JOBS_FILE")
+
+    defaults = batch.get("options", {})
+    batch_jobs = [
+        _get_job(ctx, chain_command, index, job, defaults, workers, timeout)
+        for index, job in enumerate(batch["jobs"], start=1)
+    ]
+    if len({job.name for job in batch_jobs}) != len(batch_jobs):
+        raise click.BadParameter("The job names must be unique", ctx=ctx, param_hint="JOBS_FILE")
+
+    try:
+        runner = BatchRunner(batch_jobs, workers=workers, timeout=timeout)
+    except BatchError as e:
+        raise click.UsageError(str(e)) from e
+
+    if dry_run:
+        for index, stage in enumerate(runner.stages, start=1):
+            logger.info(f"Stage {index}/{len(runner.stages)}")
+            for job in stage:
+                steps = ", ".join(job.commands)
+                depends_on = f" (after {', '.join(job.depends_on)})" if job.depends_on else ""
+                logger.info(f"  {job.name}: {steps}{depends_on}")
+        return
+
+    if not runner.run():
+        ctx.exit(1)
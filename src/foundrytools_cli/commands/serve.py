@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+
+import click
+
+from foundrytools_cli.utils.daemon import (
+    SERVE_AVAILABLE,
+    JobServer,
+    connect,
+    get_default_socket_path,
+)
+from foundrytools_cli.utils.logger import logger
+
+
+@click.command("serve")
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=Path),
+    help="""
+    The path of the socket to listen on. Defaults to the ``FTCLI_SOCKET`` environment variable, or
+    to a per-user socket in the runtime directory.
+    """,
+)
+@click.option(
+    "-j",
+    "--max-jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default="the number of CPUs",
+    help="The maximum number of jobs running at the same time.",
+)
+def cli(socket_path: Path | None, max_jobs: int) -> None:
+    """
+    Start a server that runs ftcli commands sent with ``ftcli --client``.
+
+    The server imports all the commands once, and runs each job in a process forked from it, so the
+    jobs don't pay for the interpreter startup and for the imports of the font libraries. Existing
+    scripts can use the server by adding ``--client`` after ``ftcli``.
+
+    The jobs can also be sent by other programs, as JSON objects on a single line like
+    ``{"args": ["name", "del-names", "fonts", "-n", "3"], "cwd": "/path/to/dir"}``, or
+    ``{"command": "name del-names", "options": {"-n": 3}, "paths": ["fonts"]}``. The output of the
+    job is sent back as JSON lines like ``{"stream": "stderr", "data": "..."}``, followed by
+    ``{"exit_code": 0}``.
+    """
+    if not SERVE_AVAILABLE:
+        raise click.UsageError("The server is not supported on this platform")
+
+    root = click.get_current_context().find_root()
+    if not isinstance(root.command, click.Group):
+        raise click.UsageError("The server must be started with 'ftcli serve'")
+    socket_path = socket_path or get_default_socket_path()
+
+    existing = connect(socket_path)
+    if existing is not None:
+        existing.close()
+        raise click.UsageError(f"A server is already listening on {socket_path}")
+    socket_path.unlink(missing_ok=True)
+
+    # Import all the commands now, so that the jobs don't have to
+    for name in root.command.list_commands(root):
+        root.command.get_command(root, name)
+
+    with JobServer(socket_path, root.command, max_jobs=max_jobs) as server:
+        logger.info(f"Listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
@@ -121,3 +121,34 @@ def align_timestamps(input_path: Path, recursive: bool = False) -> None:
     from foundrytools_cli.commands.utils.sync_timestamps import main as task
 
     task(input_path, recursive=recursive)
+
+
+@cli.command("find-duplicates", no_args_is_help=True)
+@click.argument(
+    "input_path", type=click.Path(exists=True, file_okay=False, resolve_path=True, path_type=Path)
+)
+@recursive_flag()
+@click.option(
+    "-l",
+    "--hard-link",
+    is_flag=True,
+    default=False,
+    help="""
+    Replace the duplicates of each font with hard links to the first file, sorted by path, to save
+    disk space.
+    """,
+)
+def find_duplicates(input_path: Path, recursive: bool = False, hard_link: bool = False) -> None:
+    """
+    Finds the fonts that have the same tables, like copies of the same font under different names.
+
+    The fonts are compared by the checksums and the lengths of their tables, read from the table
+    directory, and the tables of the fonts that match are compared by their hash. The fonts are
+    never decompiled.
+
+    Use the ``--dedupe`` option of the other commands to process only one font of each group.
+    """
+
+    from foundrytools_cli.commands.utils.find_duplicates import main as task
+
+    task(input_path, recursive=recursive, hard_link=hard_link)
@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+
+from foundrytools_cli.utils.duplicates import find_duplicates
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.walker import walk_fonts
+
+__all__ = ["main"]
+
+
+def _hard_link(source: Path, target: Path) -> bool:
+    """
+    Replace a file with a hard link to another file. The link is created with a temporary name and
+    renamed, so that the file is never missing.
+    """
+    if os.path.samefile(source, target):
+        return False
+    temp_file = target.with_name(f".{target.name}.ftcli-link")
+    os.link(source, temp_file)
+    try:
+        os.replace(temp_file, target)
+    except OSError:
+        temp_file.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def main(input_path: Path, recursive: bool = False, hard_link: bool = False) -> None:
+    """
+    Find the fonts with the same tables in a directory, and optionally replace the duplicates with
+    hard links to the first file of each group.
+
+    :param input_path: The directory to search
+    :type input_path: Path
+    :param recursive: Whether to search the subdirectories
+    :type recursive: bool
+    :param hard_link: Whether to replace the duplicates with hard links
+    :type hard_link: bool
+    """
+    groups = find_duplicates(walk_fonts(input_path, recursive=recursive))
+    if not groups:
+        logger.info("No duplicates found")
+        return
+
+    duplicates = 0
+    wasted_bytes = 0
+    linked = 0
+    for representative, *twins in groups:
+        logger.opt(colors=True).info(f"<cyan>{representative}</> has {len(twins)} duplicates:")
+        for twin in twins:
+            logger.info(f"  {twin}")
+            duplicates += 1
+            wasted_bytes += twin.stat().st_size
+            if not hard_link:
+                continue
+            try:
+                if _hard_link(representative, twin):
+                    linked += 1
+            except OSError as e:
+                logger.error(f"Can't link {twin} to {representative}: {e}")
+
+    logger.opt(colors=True).info(
+        f"<cyan>{duplicates}</> duplicates of <cyan>{len(groups)}</> fonts "
+        f"(<cyan>{wasted_bytes / 1_000_000:.1f} MB</>)"
+    )
+    if hard_link:
+        logger.success(f"{linked} duplicates replaced with hard links")
@@ -39,13 +39,14 @@ def _is_relative_to(path: Path, other: Path) -> bool:
 def _get_file_timestamps(input_path: Path, recursive: bool = True) -> dict[Path, tuple[int, int]]:
     finder = FontFinder(input_path)
     finder.options.recursive = recursive
-    fonts = finder.find_fonts()
-
-    font_timestamps = {
-        font.file: (font.ttfont[T_HEAD].created, font.ttfont[T_HEAD].modified)
-        for font in fonts
-        if font.file
-    }
+    font_timestamps = {}
+    for font in finder.generate_fonts():
+        with font:
+            if font.file:
+                font_timestamps[font.file] = (
+                    font.ttfont[T_HEAD].created,
+                    font.ttfont[T_HEAD].modified,
+                )
 
     return font_timestamps
 
@@ -6,17 +6,53 @@ from typing import Any
 
 import click
 
+from foundrytools_cli.utils.sharding import SHARD_BY_HASH, SHARD_BY_SIZE
+
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+# The shared options that only a TaskRunner applies
+RUNNER_OPTIONS = frozenset(
+    {
+        "fast_save",
+        "jobs",
+        "incremental",
+        "metrics_out",
+        "profile_dir",
+        "profile_stacks",
+        "longest_first",
+        "timings_from",
+        "max_memory",
+        "timeout",
+        "resume",
+        "shard",
+        "shard_by",
+        "verbose",
+        "index",
+        "where",
+        "dedupe",
+    }
+)
+
 
 class BaseCommand(click.Command):
     """
     Base command for all commands in the CLI.
+
+    Commands that don't process the fonts with a ``TaskRunner`` must be created with
+    ``uses_runner=False``: they don't get the options that only a ``TaskRunner`` applies (see
+    ``RUNNER_OPTIONS``), and they are not accepted by ``ftcli chain``. Commands that use a
+    ``TaskRunner`` but can't be chained are created with ``chainable=False``.
     """
 
-    def __init__(self, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+    def __init__(  # type: ignore[no-untyped-def]
+        self, *args, chainable: bool = True, uses_runner: bool = True, **kwargs
+    ) -> None:
+        self.chainable = chainable and uses_runner
         shared_options = [
             click.Argument(
                 ["input_path"],
-                type=click.Path(exists=True, resolve_path=True, path_type=Path),
+                type=click.Path(exists=True, resolve_path=True, allow_dash=True, path_type=Path),
+                required=False,
             ),
             click.Option(
                 ["-r", "--recursive"],
@@ -77,6 +113,22 @@ class BaseCommand(click.Command):
                 OpenType specification).
                 """,
             ),
+            click.Option(
+                ["--fast-save"],
+                is_flag=True,
+                default=False,
+                help="""
+                Compile only the modified tables on save.
+
+                The tables that were not modified are copied byte for byte from the input file,
+                with their original checksums, instead of being compiled again. This makes small
+                edits on large fonts much faster, and gives the same output as a regular save for
+                fonts with valid table checksums.
+
+                Web fonts, and fonts whose ``glyf``, ``CFF `` or ``CFF2`` table was loaded, are
+                saved normally.
+                """,
+            ),
             click.Option(
                 ["-rts", "--recalc-timestamp"],
                 is_flag=True,
@@ -87,12 +139,293 @@ class BaseCommand(click.Command):
                 By default, the original ``modified`` timestamp is kept.
                 """,
             ),
+            click.Option(
+                ["-j", "--jobs"],
+                type=click.IntRange(min=0),
+                default=1,
+                help="""
+                The number of fonts to process in parallel.
+
+                Each font is opened, processed and saved in a separate worker process, and the log
+                messages are printed in the same order as the fonts are found. Use ``0`` to start
+                one worker per CPU.
+
+                By default, fonts are processed one at a time.
+                """,
+            ),
+            click.Option(
+                ["--incremental"],
+                is_flag=True,
+                default=False,
+                help="""
+                Skip the fonts that were already processed with the same command and options.
+
+                The hash of each input file, the command, its options and the hashes of the output
+                files are stored in a cache after each successful run. Fonts whose input and outputs
+                haven't changed since then are skipped without being opened.
+
+                The cache is stored in the user cache directory, or in the directory set in the
+                ``FTCLI_CACHE_DIR`` environment variable.
+                """,
+            ),
+            click.Option(
+                ["--metrics-out"],
+                type=click.Path(path_type=Path, dir_okay=False, writable=True),
+                help="""
+                Write the metrics of each processed font to a file.
+
+                For each font, the file records the input and output sizes in bytes, the CPU time
+                and the wall time of the ``discovery``, ``load``, ``task``, ``compile`` and
+                ``write`` phases, in seconds. Tables that are loaded lazily are decompiled during
+                the ``task`` phase, and commands that save the fonts by themselves compile and write
+                them during the ``task`` phase too.
+
+                Files with the ``.csv`` extension are written as CSV, other files as JSON lines.
+                """,
+            ),
+            click.Option(
+                ["--profile", "profile_dir"],
+                type=click.Path(path_type=Path, file_okay=False, writable=True),
+                help="""
+                Profile the task and the saving of each font, and save the profiles to a directory.
+
+                One ``pstats`` file is saved for each font, and the ``run.prof`` file aggregates the
+                profiles of all the fonts. The files can be inspected with ``python -m pstats`` or
+                with tools like snakeviz.
+                """,
+            ),
+            click.Option(
+                ["--profile-stacks"],
+                is_flag=True,
+                default=False,
+                help="""
+                Also save the profiles as collapsed stacks (``.collapsed`` files), that can be
+                rendered as flame graphs by ``flamegraph.pl``, speedscope and similar tools.
+
+                Only applicable if ``--profile`` is used.
+                """,
+            ),
+            click.Option(
+                ["--longest-first"],
+                is_flag=True,
+                default=False,
+                help="""
+                Process the largest fonts first, so that a large font found last doesn't keep one
+                worker busy while the others are idle.
+
+                All the fonts are found before the first one is processed. Only applicable if
+                ``--jobs`` is greater than 1.
+                """,
+            ),
+            click.Option(
+                ["--timings-from"],
+                type=click.Path(path_type=Path, exists=True, dir_okay=False),
+                help="""
+                Process the slowest fonts first, reading the processing time of each font from a
+                metrics file written by ``--metrics-out`` in a previous run. Implies
+                ``--longest-first``.
+
+                The processing time of the fonts that are not in the file is estimated from their
+                size.
+                """,
+            ),
+            click.Option(
+                ["--max-memory"],
+                callback=byte_size_callback,
+                help="""
+                Don't start processing a font while the estimated memory used by the fonts being
+                processed would exceed this size. The size is given in bytes, or with a ``K``,
+                ``M`` or ``G`` suffix (e.g. ``4G``).
+
+                The memory used by a font is estimated from its file size and format. A font is
+                always processed when no other font is, even if it exceeds the limit. Only
+                applicable if ``--jobs`` is greater than 1.
+                """,
+            ),
+            click.Option(
+                ["--timeout"],
+                type=click.FloatRange(min=0, min_open=True),
+                help="""
+                The maximum time to process each font, in seconds.
+
+                Each font is processed in a separate worker process, also when ``--jobs`` is 1. When
+                the time runs out, the worker and the external tools it started are killed, the
+                font is reported as timed out and the next fonts are processed.
+                """,
+            ),
+            click.Option(
+                ["--resume", "resume"],
+                type=click.Path(path_type=Path, dir_okay=False, writable=True),
+                metavar="JOURNAL",
+                help="""
+                Record the outcome of each font in a journal file, and skip the fonts that the
+                journal records as completed.
+
+                Rerun an interrupted command with the same ``--resume`` file to process only the
+                fonts that were not completed: the ones that failed, and the ones that were being
+                processed when the run was interrupted. A font is processed again if it, the
+                command options or its output files have changed since it was completed.
+                """,
+            ),
+            click.Option(
+                ["--shard"],
+                callback=shard_callback,
+                metavar="INDEX/COUNT",
+                help="""
+                Process only one of ``COUNT`` shards of the input files, numbered from 1 (e.g.
+                ``--shard 2/4``).
+
+                The files are split deterministically, so running the command once for each shard,
+                also on different machines, processes every file exactly once.
+                """,
+            ),
+            click.Option(
+                ["--shard-by"],
+                type=click.Choice([SHARD_BY_HASH, SHARD_BY_SIZE]),
+                default=SHARD_BY_HASH,
+                show_default=True,
+                help="""
+                How the files are split by ``--shard``.
+
+                ``hash`` splits them by a stable hash of their path relative to ``INPUT_PATH``.
+                ``size`` splits them in shards of roughly the same total size, so that the shards
+                take about the same time. The sizes are read from the ``--index``, which is
+                required, so that the fonts overwritten by a shard don't move the others between
+                shards. All the shards must use the same index.
+                """,
+            ),
+            click.Option(
+                ["--verbose"],
+                is_flag=True,
+                default=False,
+                help="""
+                Print the messages of each font.
+
+                By default, when processing a directory, a progress bar with the throughput, the
+                failed and skipped fonts and the estimated time remaining is displayed instead, and
+                only the warnings and the errors are printed.
+                """,
+            ),
+            click.Option(
+                ["--log-format"],
+                type=click.Choice(["text", "json"]),
+                default="text",
+                show_default=True,
+                help="""
+                The format of the log messages. ``json`` writes one JSON object per line, with the
+                time, the level, the message and the font file being processed.
+                """,
+            ),
+            click.Option(
+                ["--log-file"],
+                type=click.Path(path_type=Path, dir_okay=False, resolve_path=True),
+                help="""
+                Append the log messages to a file, in the format set by ``--log-format``. The
+                messages are still printed to the console as text.
+
+                The file is written by a background thread, so logging doesn't slow down the
+                processing of the fonts.
+                """,
+            ),
+            click.Option(
+                ["--log-level"],
+                type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+                default="INFO",
+                show_default=True,
+                help="""
+                The minimum level of the log messages. The details of each glyph (like the glyphs
+                renamed by ``font set-production-names``) are logged at the ``DEBUG`` level.
+                """,
+            ),
+            click.Option(
+                ["--index"],
+                type=click.Path(exists=True, dir_okay=False, resolve_path=True, path_type=Path),
+                metavar="INDEX",
+                help="""
+                Get the fonts in ``INPUT_PATH`` from an index built with ``ftcli index build``,
+                instead of searching the file system.
+                """,
+            ),
+            click.Option(
+                ["--where"],
+                help="""
+                Process only the indexed fonts that match an SQL expression on their metadata, like
+                ``is_variable AND outlines = 'CFF2' AND us_weight_class >= 700`` (see ``ftcli index
+                query --help``). Requires ``--index``.
+                """,
+            ),
+            click.Option(
+                ["--dedupe"],
+                is_flag=True,
+                default=False,
+                help="""
+                Process only one font of each group of fonts with the same tables (see ``ftcli utils
+                find-duplicates``), and copy its output files to the other fonts of the group.
+
+                All the files are checked before the first font is processed.
+                """,
+            ),
+            click.Option(
+                ["--from-list"],
+                type=click.Path(exists=True, dir_okay=False, allow_dash=True, path_type=Path),
+                metavar="FILE",
+                help="""
+                Process the files listed in a file, or in the standard input with ``-``, instead of
+                searching ``INPUT_PATH``. The files are separated by newlines or by NUL characters,
+                like the output of ``find -print0`` or ``git diff --name-only -z``.
+
+                Passing ``-`` as ``INPUT_PATH`` is the same as ``--from-list -``. Otherwise, the
+                relative paths are relative to ``INPUT_PATH``, if given, or to the current
+                directory. The filter options still apply.
+                """,
+            ),
         ]
+        if not uses_runner:
+            shared_options = [param for param in shared_options if param.name not in RUNNER_OPTIONS]
         kwargs.setdefault("params", []).extend(shared_options)
         kwargs.setdefault("no_args_is_help", True)
         kwargs.setdefault("context_settings", {"help_option_names": ["-h", "--help"]})
         super().__init__(*args, **kwargs)
 
+    def invoke(self, ctx: click.Context) -> Any:
+        """
+        Invoke the command with the logger configured by the ``--log-*`` options. The options are
+        removed from the parameters, so they are not passed to the command.
+
+        With ``--from-list`` (or ``-`` as ``INPUT_PATH``), the list of files is read and passed to
+        the command as ``input_files``, and ``INPUT_PATH`` is set to the directory of the relative
+        paths.
+        """
+        # pylint: disable=import-outside-toplevel
+        from foundrytools_cli.utils.file_list import STDIN, read_file_list
+        from foundrytools_cli.utils.logger import configure_logging
+
+        if ctx.params.get("where") and not ctx.params.get("index"):
+            raise click.UsageError("--where requires --index", ctx=ctx)
+        if ctx.params.get("shard_by") == SHARD_BY_SIZE and not ctx.params.get("index"):
+            raise click.UsageError("--shard-by size requires --index", ctx=ctx)
+
+        input_path: Path | None = ctx.params.get("input_path")
+        from_list: Path | None = ctx.params.pop("from_list", None)
+        if input_path is not None and str(input_path) == STDIN:
+            if from_list is not None:
+                raise click.UsageError("Can't use '-' as INPUT_PATH with --from-list", ctx=ctx)
+            from_list, input_path = input_path, None
+        if from_list is not None:
+            if input_path is not None and not input_path.is_dir():
+                raise click.UsageError("INPUT_PATH must be a directory with --from-list", ctx=ctx)
+            ctx.params["input_path"] = input_path = input_path or Path.cwd()
+            ctx.params["input_files"] = read_file_list(from_list, base_dir=input_path)
+        elif input_path is None:
+            raise click.UsageError("Missing argument 'INPUT_PATH'", ctx=ctx)
+
+        with configure_logging(
+            log_format=ctx.params.pop("log_format", "text"),
+            log_file=ctx.params.pop("log_file", None),
+            log_level=ctx.params.pop("log_level", "INFO"),
+        ):
+            return super().invoke(ctx)
+
 
 def make_options(options: list[Callable]) -> Callable:
     """
@@ -170,6 +503,72 @@ def tuple_to_set_callback(
     return set(value)
 
 
+def byte_size_callback(ctx: click.Context, param: click.Parameter, value: str | None) -> int | None:
+    """
+    Callback for options that accept a size in bytes, like ``--max-memory``.
+
+    Converts a size like ``512M`` or ``4G`` to a number of bytes. The ``K``, ``M`` and ``G``
+    suffixes are powers of 1024, and can be followed by ``B``.
+
+    :param ctx: click Context
+    :type ctx: click.Context
+    :param param: click Parameter
+    :type param: click.Parameter
+    :param value: The value to convert
+    :type value: Optional[str]
+    :return: The size in bytes
+    :rtype: Optional[int]
+    :raises click.BadParameter: If the value is not a valid size
+    """
+    if not value or ctx.resilient_parsing:
+        return None
+    size = value.strip().upper().removesuffix("B")
+    multiplier = 1
+    if size and size[-1] in SIZE_UNITS:
+        multiplier = SIZE_UNITS[size[-1]]
+        size = size[:-1]
+    try:
+        result = int(float(size) * multiplier)
+    except ValueError as e:
+        raise click.BadParameter(f"Invalid size: {value}", ctx=ctx, param=param) from e
+    if result <= 0:
+        raise click.BadParameter(f"The size must be greater than 0: {value}", ctx=ctx, param=param)
+    return result
+
+
+def shard_callback(
+    ctx: click.Context, param: click.Parameter, value: str | None
+) -> tuple[int, int] | None:
+    """
+    Callback for the ``--shard`` option.
+
+    Converts a value like ``2/4`` to a tuple of the 1-based shard index and the number of shards.
+
+    :param ctx: click Context
+    :type ctx: click.Context
+    :param param: click Parameter
+    :type param: click.Parameter
+    :param value: The value to convert
+    :type value: Optional[str]
+    :return: The shard index and the number of shards
+    :rtype: Optional[tuple[int, int]]
+    :raises click.BadParameter: If the value is not a valid shard
+    """
+    if not value or ctx.resilient_parsing:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError as e:
+        raise click.BadParameter(
+            f"Expected INDEX/COUNT, got '{value}'", ctx=ctx, param=param
+        ) from e
+    if not 1 <= index <= count:
+        raise click.BadParameter(
+            f"The index must be between 1 and {count}, got {index}", ctx=ctx, param=param
+        )
+    return index, count
+
+
 def output_dir_callback(ctx: click.Context, _: click.Parameter, value: Path | None) -> Path | None:
     """
     Callback for ``--output-dir option``.
@@ -219,6 +618,24 @@ def ensure_at_least_one_param(ctx: click.Context) -> None:
         "reorder_tables",
         "recalc_bboxes",
         "overwrite",
+        "fast_save",
+        "jobs",
+        "incremental",
+        "metrics_out",
+        "profile_dir",
+        "profile_stacks",
+        "longest_first",
+        "timings_from",
+        "max_memory",
+        "timeout",
+        "resume",
+        "shard",
+        "shard_by",
+        "verbose",
+        "index",
+        "where",
+        "dedupe",
+        "input_files",
     ]
 
     if all(value is None for key, value in ctx.params.items() if key not in ignored):
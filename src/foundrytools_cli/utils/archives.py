@@ -0,0 +1,372 @@
+import copy
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+from io import BufferedReader, BytesIO
+from pathlib import Path, PurePosixPath
+from typing import IO, BinaryIO, cast
+
+from fontTools.ttLib import TTLibError
+from foundrytools import Font
+
+from foundrytools_cli.utils.walker import MAGIC_SIZE, has_font_extension, is_font_magic
+
+# The suffixes of the supported archives, and the mode to write them with ``tarfile``
+TAR_SUFFIXES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tbz2": "w:bz2",
+    ".tar.xz": "w:xz",
+    ".txz": "w:xz",
+}
+ZIP_SUFFIXES = (".zip",)
+
+
+class ArchiveError(Exception):
+    """Raised when an archive can't be read or written"""
+
+
+def get_archive_suffix(file: Path) -> str | None:
+    """
+    Get the archive suffix of a file name, like ``.zip`` or ``.tar.gz``.
+
+    :param file: The file
+    :type file: Path
+    :return: The suffix, or ``None`` if the file is not a supported archive
+    :rtype: str | None
+    """
+    name = file.name.lower()
+    return next((s for s in (*ZIP_SUFFIXES, *TAR_SUFFIXES) if name.endswith(s)), None)
+
+
+def is_archive(file: Path) -> bool:
+    """
+    Check if a file is a zip or tar archive, by its suffix.
+
+    :param file: The file
+    :type file: Path
+    :return: ``True`` if the file is an archive, ``False`` otherwise
+    :rtype: bool
+    """
+    return get_archive_suffix(file) is not None and file.is_file()
+
+
+@dataclass
+class ArchiveMember:
+    """
+    A member of an archive. ``info`` is the ``ZipInfo`` or the ``TarInfo`` of the member.
+    """
+
+    name: str
+    size: int
+    is_file: bool
+    info: zipfile.ZipInfo | tarfile.TarInfo
+    # The first bytes of the data, to recognize the fonts without reading the whole member
+    head: bytes = b""
+
+    @property
+    def is_safe(self) -> bool:
+        """``False`` if the member would be extracted outside of the target directory."""
+        path = PurePosixPath(self.name)
+        return not path.is_absolute() and ".." not in path.parts
+
+
+def read_members(archive: Path) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+    """
+    Read the members of a zip or tar archive in order, without extracting them. Tar archives are
+    read as a stream.
+
+    Each member must be read before the next one is requested.
+
+    :param archive: The archive
+    :type archive: Path
+    :return: The members, with a stream of their data, or ``None`` for the members that are not
+        files
+    :rtype: Iterator[tuple[ArchiveMember, BinaryIO | None]]
+    :raises ArchiveError: If the archive can't be read
+    """
+    try:
+        if get_archive_suffix(archive) in ZIP_SUFFIXES:
+            yield from _read_zip(archive)
+        else:
+            yield from _read_tar(archive)
+    except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+        raise ArchiveError(f"Can't read {archive}: {e}") from e
+
+
+def read_fonts(archive: Path) -> Iterator[Font]:
+    """
+    Open the fonts of a zip or tar archive in memory, one at a time. The file of each font is its
+    path inside the archive, like ``fonts.zip/fonts/Font-Regular.ttf``, which doesn't exist on disk.
+
+    :param archive: The archive
+    :type archive: Path
+    :return: The fonts
+    :rtype: Iterator[Font]
+    :raises ArchiveError: If the archive can't be read
+    """
+    for member, stream in read_members(archive):
+        if stream is None or not is_font_member(member):
+            continue
+        try:
+            font = Font(BytesIO(stream.read()))
+        except (TTLibError, PermissionError):
+            continue
+        font.file = archive.joinpath(*PurePosixPath(member.name).parts)
+        yield font
+
+
+def is_font_member(member: "ArchiveMember") -> bool:
+    """
+    Check if a member of an archive may be a font, by its name or its first bytes.
+
+    :param member: The member
+    :type member: ArchiveMember
+    :return: ``True`` if the member may be a font, ``False`` otherwise
+    :rtype: bool
+    """
+    return member.is_file and (has_font_extension(member.name) or is_font_magic(member.head))
+
+
+def _read_zip(file: Path) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+    with zipfile.ZipFile(file) as archive:
+        for info in archive.infolist():
+            member = ArchiveMember(
+                name=info.filename,
+                size=info.file_size,
+                is_file=not info.is_dir(),
+                info=info,
+            )
+            if not member.is_file:
+                yield member, None
+                continue
+            with cast(zipfile.ZipExtFile, archive.open(info)) as stream:
+                member.head = stream.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+                yield member, stream  # type: ignore[misc]
+
+
+def _read_tar(file: Path) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+    # Stream mode: the archive is read once, and decompressed on the fly
+    with tarfile.open(file, "r|*") as archive:
+        for info in archive:
+            member = ArchiveMember(name=info.name, size=info.size, is_file=info.isreg(), info=info)
+            if not member.is_file:
+                yield member, None
+                continue
+            # The members of a tar archive are buffered readers
+            stream = cast(BufferedReader, archive.extractfile(info))
+            member.head = stream.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+            yield member, stream
+
+
+def _get_unused_file(file: Path, suffix: str) -> Path:
+    """
+    Number a file name like ``makeOutputFileName`` does (``#1``, ``#2``, etc.), keeping a suffix
+    with more than one extension, like ``.tar.gz``, at the end.
+    """
+    stem = file.name[: -len(suffix)]
+    number = 1
+    out_file = file
+    while out_file.exists():
+        out_file = file.with_name(f"{stem}#{number}{file.name[len(stem) :]}")
+        number += 1
+    return out_file
+
+
+class ArchiveSession:  # pylint: disable=too-many-instance-attributes
+    """
+    Read the members of a zip or tar archive one at a time, without extracting them, and collect the
+    output files of the processed fonts in a directory or in a new archive.
+
+    The fonts are processed as if they were in a staging directory, which is the output directory
+    if any, and a temporary directory otherwise. When writing a new archive, the output files are
+    moved from the staging directory to the archive as soon as each font is processed, and the
+    members that are not processed are copied to the archive as they are. The new archive is only
+    written if all the members were read and some font was saved.
+    """
+
+    def __init__(self, archive: Path, output_dir: Path | None, overwrite: bool) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            archive (Path): The archive to read.
+            output_dir (Path, optional): The directory to write the output files to. If ``None``,
+                the output files are written to a new archive next to the input one.
+            overwrite (bool): Whether to replace the input archive. If ``False``, the new archive
+                is named with a number suffix (``#1``, ``#2``, etc.).
+        """
+        self.archive = archive
+        self.saved = 0
+        self._suffix = get_archive_suffix(archive) or ""
+        self._complete = False
+        self._writer: zipfile.ZipFile | tarfile.TarFile | None = None
+        self._temp_file: Path | None = None
+        self.out_archive: Path | None = None
+
+        if output_dir is not None:
+            self.staging_dir = output_dir
+            self._temp_dir: Path | None = None
+        else:
+            self._temp_dir = self.staging_dir = Path(tempfile.mkdtemp(prefix="ftcli-archive-"))
+            self.out_archive = archive if overwrite else _get_unused_file(archive, self._suffix)
+
+    def count_files(self) -> int | None:
+        """
+        Count the files in the archive.
+
+        :return: The number of files, or ``None`` for tar archives, which would have to be read
+            twice, and for the archives that can't be read
+        :rtype: int | None
+        """
+        if self._suffix not in ZIP_SUFFIXES:
+            return None
+        try:
+            with zipfile.ZipFile(self.archive) as archive:
+                return sum(1 for info in archive.infolist() if not info.is_dir())
+        except (OSError, zipfile.BadZipFile):
+            # The error is raised when the members are read
+            return None
+
+    def members(self) -> Iterator[tuple[ArchiveMember, BinaryIO | None]]:
+        """
+        Read the members of the archive in order (see ``read_members``). Each member must be read
+        or copied before the next one is requested.
+
+        :return: The members, with a stream of their data, or ``None`` for the members that are
+            not files
+        :rtype: Iterator[tuple[ArchiveMember, BinaryIO | None]]
+        :raises ArchiveError: If the archive can't be read
+        """
+        yield from read_members(self.archive)
+        self._complete = True
+
+    def get_member_path(self, member: ArchiveMember) -> Path:
+        """
+        Get the path of a member in the staging directory, where the fonts are processed, and
+        create its parent directories.
+
+        :param member: The member
+        :type member: ArchiveMember
+        :return: The path of the member
+        :rtype: Path
+        """
+        path = self.staging_dir.joinpath(*PurePosixPath(member.name).parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def copy_member(self, member: ArchiveMember, stream: IO[bytes] | None) -> None:
+        """
+        Copy a member that is not processed to the new archive, if any.
+
+        :param member: The member
+        :type member: ArchiveMember
+        :param stream: The data of the member, or ``None`` if the member is not a file
+        :type stream: IO[bytes] | None
+        """
+        self._add(member.name, stream, member.size, template=member.info)
+
+    def add_outputs(self, member: ArchiveMember, data: bytes, out_files: list[Path]) -> None:
+        """
+        Move the output files of a processed font to the new archive, if any. The font is copied
+        as it is if it was not overwritten.
+
+        :param member: The member of the processed font
+        :type member: ArchiveMember
+        :param data: The original data of the font
+        :type data: bytes
+        :param out_files: The files written while processing the font
+        :type out_files: list[Path]
+        """
+        self.saved += len(out_files)
+        if self.out_archive is None:
+            return
+
+        member_path = self.get_member_path(member)
+        if member_path not in out_files:
+            with BytesIO(data) as stream:
+                self._add(member.name, stream, len(data), template=member.info)
+        for out_file in out_files:
+            if out_file == member_path:
+                name = member.name
+            elif out_file.is_relative_to(self.staging_dir):
+                name = out_file.relative_to(self.staging_dir).as_posix()
+            else:
+                continue
+            with open(out_file, "rb") as stream:
+                size = out_file.stat().st_size
+                self._add(name, stream, size, template=member.info, modified=True)
+            out_file.unlink()
+
+    def close(self) -> Path | None:
+        """
+        Finish the new archive, if any, and remove the temporary staging directory.
+
+        :return: The new archive, or ``None`` if it was not written, because not all the members
+            were read or no font was saved
+        :rtype: Path | None
+        """
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+        if self._writer is None or self._temp_file is None or self.out_archive is None:
+            return None
+        self._writer.close()
+        if self._complete and self.saved:
+            os.replace(self._temp_file, self.out_archive)
+            return self.out_archive
+        self._temp_file.unlink(missing_ok=True)
+        return None
+
+    def _open_writer(self, out_archive: Path) -> zipfile.ZipFile | tarfile.TarFile:
+        # The new archive is written to a temporary file, closed and renamed in ``close``
+        if self._writer is not None:
+            return self._writer
+        self._temp_file = out_archive.with_name(f".{out_archive.name}.ftcli-tmp")
+        # pylint: disable=consider-using-with
+        if self._suffix in ZIP_SUFFIXES:
+            self._writer = zipfile.ZipFile(self._temp_file, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            mode = TAR_SUFFIXES[self._suffix]
+            self._writer = tarfile.open(self._temp_file, mode)  # type: ignore  # noqa: SIM115
+        return self._writer
+
+    def _add(
+        self,
+        name: str,
+        stream: IO[bytes] | None,
+        size: int,
+        template: zipfile.ZipInfo | tarfile.TarInfo,
+        modified: bool = False,
+    ) -> None:
+        """
+        Add a member to the new archive, with the attributes of the member it replaces or it was
+        converted from. Modified members get the current time.
+        """
+        if self.out_archive is None:
+            return
+        writer = self._open_writer(self.out_archive)
+        if isinstance(writer, zipfile.ZipFile) and isinstance(template, zipfile.ZipInfo):
+            info = copy.copy(template)
+            info.filename = name
+            info.file_size = size
+            if modified:
+                info.date_time = time.localtime()[:6]
+            if stream is None:
+                writer.writestr(info, b"")
+                return
+            with writer.open(info, "w") as target:
+                shutil.copyfileobj(stream, target)
+        elif isinstance(writer, tarfile.TarFile) and isinstance(template, tarfile.TarInfo):
+            tar_info = copy.copy(template)
+            tar_info.name = name
+            tar_info.size = size if stream is not None else 0
+            if modified:
+                tar_info.mtime = int(time.time())
+            writer.addfile(tar_info, stream)
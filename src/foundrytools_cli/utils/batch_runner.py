@@ -0,0 +1,268 @@
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TypeVar
+
+from foundrytools.lib.font_finder import FinderError
+
+from foundrytools_cli.utils.archives import ArchiveError
+from foundrytools_cli.utils.font_index import FontIndexError
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.process_pool import ProcessPool, ProcessPoolError
+from foundrytools_cli.utils.progress import RunProgress
+from foundrytools_cli.utils.task_runner import FontResult, NoFontsFoundError, TaskRunner
+from foundrytools_cli.utils.timer import Timer
+
+_T = TypeVar("_T")
+
+
+class BatchError(Exception):
+    """Raised when the jobs of a batch can't be scheduled"""
+
+
+@dataclass
+class BatchJob:  # pylint: disable=too-many-instance-attributes
+    """
+    A job of a batch: a TaskRunner, the commands it runs, the jobs it depends on and the paths it
+    reads and writes.
+    """
+
+    name: str
+    runner: TaskRunner
+    commands: list[str] = field(default_factory=list)
+    depends_on: list[str] = field(default_factory=list)
+    failed: bool = False
+    skipped: bool = False
+    processed: int = 0
+    timed_out: int = 0
+
+    @property
+    def reads(self) -> Path:
+        """
+        The path where the job reads the fonts.
+        """
+        return self.runner.input_path
+
+    @property
+    def writes(self) -> Path:
+        """
+        The directory where the job writes the fonts.
+        """
+        output_dir = self.runner.config.save_options.output_dir
+        if output_dir is not None:
+            return output_dir
+        return self.reads if self.reads.is_dir() else self.reads.parent
+
+
+def _overlap(path_1: Path, path_2: Path) -> bool:
+    return path_1 == path_2 or path_1 in path_2.parents or path_2 in path_1.parents
+
+
+def get_schedule(jobs: list[BatchJob]) -> list[list[BatchJob]]:
+    """
+    Group the jobs in stages that run one after the other. The jobs of a stage don't depend on each
+    other, and run at the same time.
+
+    A job depends on the jobs listed in its ``depends_on`` attribute, and on the jobs that come
+    before it whose output directory overlaps with its input path, or whose input path overlaps with
+    its output directory. These implicit dependencies are added to ``depends_on``.
+
+    :param jobs: The jobs to schedule, in the order they are declared
+    :type jobs: list[BatchJob]
+    :return: The stages, in the order they must be run
+    :rtype: list[list[BatchJob]]
+    :raises BatchError: If a job depends on an unknown job, or if the dependencies are circular
+    """
+    names = {job.name for job in jobs}
+    for index, job in enumerate(jobs):
+        unknown = set(job.depends_on) - names
+        if unknown:
+            raise BatchError(
+                f"Job '{job.name}' depends on unknown jobs: {', '.join(sorted(unknown))}"
+            )
+        for previous in jobs[:index]:
+            if previous.name in job.depends_on:
+                continue
+            if _overlap(previous.writes, job.reads) or _overlap(previous.reads, job.writes):
+                job.depends_on.append(previous.name)
+
+    stages: list[list[BatchJob]] = []
+    scheduled: set[str] = set()
+    pending = list(jobs)
+    while pending:
+        stage = [job for job in pending if set(job.depends_on) <= scheduled]
+        if not stage:
+            raise BatchError(
+                f"Circular dependencies between jobs: {', '.join(job.name for job in pending)}"
+            )
+        stages.append(stage)
+        scheduled.update(job.name for job in stage)
+        pending = [job for job in pending if job.name not in scheduled]
+    return stages
+
+
+class BatchRunner:  # pylint: disable=too-few-public-methods
+    """
+    Run the jobs of a batch with a single pool of worker processes.
+
+    The jobs are run in stages (see ``get_schedule``). The fonts of all the jobs of a stage are
+    interleaved and processed by the same pool, so that independent jobs run at the same time
+    instead of one after the other. The jobs that depend on a failed job are skipped.
+    """
+
+    def __init__(self, jobs: list[BatchJob], workers: int, timeout: float | None = None) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            jobs (list[BatchJob]): The jobs to run, in the order they are declared.
+            workers (int): The number of fonts to process in parallel.
+            timeout (float, optional): The maximum time to process each font, in seconds.
+        """
+        self.jobs = jobs
+        self.stages = get_schedule(jobs)
+        self.workers = workers
+        self.timeout = timeout
+
+    def run(self) -> bool:
+        """
+        Run the jobs.
+
+        :return: ``True`` if all the jobs succeeded, ``False`` otherwise
+        :rtype: bool
+        """
+        timer = Timer(logger=None)
+        timer.start()
+        failed: set[str] = set()
+        for index, stage in enumerate(self.stages, start=1):
+            runnable = []
+            for job in stage:
+                failed_dependencies = [name for name in job.depends_on if name in failed]
+                if failed_dependencies:
+                    logger.error(
+                        f"Skipping job '{job.name}': job '{failed_dependencies[0]}' failed"
+                    )
+                    job.failed = job.skipped = True
+                else:
+                    runnable.append(job)
+            if not runnable:
+                continue
+
+            logger.opt(colors=True).info(
+                f"Stage {index}/{len(self.stages)}: <cyan>{', '.join(j.name for j in runnable)}</>"
+            )
+            print()
+            self._run_stage(runnable)
+            failed.update(job.name for job in stage if job.failed)
+
+        for job in self.jobs:
+            if job.skipped:
+                logger.skip(f"Job '{job.name}' skipped")  # type: ignore
+            else:
+                status = "failed" if job.failed else "completed"
+                timed_out = f", {job.timed_out} timed out" if job.timed_out else ""
+                logger.info(
+                    f"Job '{job.name}' {status}: {job.processed} fonts processed{timed_out}"
+                )
+        logger.opt(colors=True).info(f"Elapsed time <cyan>{timer.stop():0.4f} seconds</>")
+        return not failed
+
+    def _run_stage(self, jobs: list[BatchJob]) -> None:
+        progress = self._start_progress(jobs)
+        for job in jobs:
+            job.runner.start_run(progress=progress, description=job.name)
+        try:
+            # Jobs that must process the fonts in the main process, and that can't be parallelized.
+            # Decided after the runs are started, since starting a run opens its archive, if any.
+            serial_jobs = [job for job in jobs if not job.runner.uses_workers()]
+            pooled_jobs = [job for job in jobs if job not in serial_jobs]
+
+            for job in serial_jobs:
+                fonts = self._find(job, job.runner.find_fonts)
+                if fonts is not None:
+                    for result in job.runner.process_fonts(fonts):
+                        self._handle_result(job, result)
+
+            # The fonts of the pooled jobs are opened by the workers only
+            files = []
+            for job in pooled_jobs:
+                job_files = self._find(job, job.runner.find_files)
+                if job_files is not None:
+                    files.append((self.jobs.index(job), job_files))
+
+            if not files:
+                return
+            pool = ProcessPool(
+                self._process_file,
+                jobs=self.workers,
+                error_handler=self._handle_worker_error,
+                look_ahead=max(job.runner.look_ahead for job in pooled_jobs),
+                timeout=self.timeout,
+            )
+            for index, result in pool.imap(self._interleave(files)):
+                self._handle_result(self.jobs[index], result)
+        finally:
+            self._finish_stage(jobs, progress)
+
+    @staticmethod
+    def _start_progress(jobs: list[BatchJob]) -> RunProgress | None:
+        """
+        The jobs of a stage share a single progress display, or print the messages of each font if
+        any of them is verbose.
+        """
+        if all(job.runner.shows_progress() for job in jobs):
+            progress = RunProgress()
+            progress.start()
+            return progress
+        for job in jobs:
+            job.runner.config.runner_options.verbose = True
+        return None
+
+    @staticmethod
+    def _finish_stage(jobs: list[BatchJob], progress: RunProgress | None) -> None:
+        # Stop the display first, so that the summaries of the jobs are printed
+        if progress is not None:
+            progress.stop()
+        for job in jobs:
+            job.runner.finish_run()
+
+    @staticmethod
+    def _find(job: BatchJob, finder: Callable[[], Iterator[_T]]) -> Iterator[_T] | None:
+        try:
+            return finder()
+        except (FinderError, NoFontsFoundError, FontIndexError, ArchiveError) as e:
+            logger.error(f"Job '{job.name}': {e}")
+            job.failed = True
+            return None
+
+    @staticmethod
+    def _interleave(files: list[tuple[int, Iterator[Path]]]) -> Iterator[tuple[int, Path]]:
+        """
+        Take the files of the jobs in turn, so that all the jobs make progress at the same time.
+        The files are paired with the index of their job, since the jobs can't be pickled.
+        """
+        pending = deque(files)
+        while pending:
+            index, job_files = pending.popleft()
+            file = next(job_files, None)
+            if file is not None:
+                yield index, file
+                pending.append((index, job_files))
+
+    def _process_file(self, item: tuple[int, Path]) -> tuple[int, FontResult]:
+        index, file = item
+        return index, self.jobs[index].runner.process_file(file)
+
+    def _handle_worker_error(
+        self, item: tuple[int, Path], error: ProcessPoolError
+    ) -> tuple[int, FontResult]:
+        index, file = item
+        return index, self.jobs[index].runner.handle_worker_error(file, error)
+
+    @staticmethod
+    def _handle_result(job: BatchJob, result: FontResult) -> None:
+        job.runner.handle_result(result)
+        job.processed += 1
+        job.timed_out += result.timed_out
+        job.failed = job.failed or result.failed
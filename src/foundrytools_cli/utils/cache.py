@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any
+
+CHUNK_SIZE = 1 << 20
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory where the caches are stored.
+
+    The directory is read from the ``FTCLI_CACHE_DIR`` environment variable. If the variable is not
+    set, the user cache directory of the platform is used.
+
+    :return: The cache directory
+    :rtype: Path
+    """
+    if env_dir := os.environ.get("FTCLI_CACHE_DIR"):
+        return Path(env_dir)
+    if sys.platform == "win32":
+        base_dir = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base_dir = Path.home() / "Library" / "Caches"
+    else:
+        base_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base_dir / "foundrytools-cli"
+
+
+def hash_file(file: Path) -> str:
+    """
+    Get the SHA-256 hash of a file, reading it in chunks.
+
+    :param file: The file to hash
+    :type file: Path
+    :return: The hexadecimal digest of the file
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    with open(file, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def to_json(value: Any) -> Any:
+    """
+    Convert the values that are not JSON serializable, like sets and paths. To be used as the
+    ``default`` argument of ``json.dumps``.
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+class IncrementalCache:
+    """
+    An on-disk record of the fonts successfully processed by a command.
+
+    Each record is keyed by the input file path and hash, and by an identity describing the command
+    and its resolved options. It stores the hash of each output file, so that a font can be skipped
+    only if none of the input, the command, the options and the outputs has changed.
+    """
+
+    def __init__(self, identity: dict[str, Any], cache_file: Path | None = None) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            identity (dict[str, Any]): The command name and options. Must be JSON serializable,
+                sets and paths are allowed.
+            cache_file (Path, optional): The SQLite database file. Defaults to
+                ``incremental.sqlite3`` in the cache directory.
+        """
+        if cache_file is None:
+            cache_file = get_cache_dir() / "incremental.sqlite3"
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self._identity = json.dumps(identity, sort_keys=True, default=to_json)
+        self._keys: dict[Path, str] = {}
+        self._connection = sqlite3.connect(cache_file, timeout=30)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs (key TEXT PRIMARY KEY, outputs TEXT NOT NULL)"
+        )
+
+    def is_up_to_date(self, file: Path) -> bool:
+        """
+        Check if a file was successfully processed with the same command and options, and if its
+        outputs still exist unchanged.
+
+        :param file: The input file
+        :type file: Path
+        :return: ``True`` if the file can be skipped, ``False`` otherwise
+        :rtype: bool
+        """
+        key = self._get_key(file)
+        row = self._connection.execute("SELECT outputs FROM runs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+
+        for out_file, out_hash in json.loads(row[0]):
+            if not Path(out_file).is_file() or hash_file(Path(out_file)) != out_hash:
+                return False
+
+        self.hits += 1
+        return True
+
+    def store(self, file: Path, out_files: list[Path]) -> None:
+        """
+        Record a successful run.
+
+        The key is computed from the input file as it was when ``is_up_to_date`` was called. When
+        the font was overwritten in place, the run is also recorded with the hash of the new file,
+        so that the next run finds it up to date.
+
+        :param file: The input file
+        :type file: Path
+        :param out_files: The files written while processing the font
+        :type out_files: list[Path]
+        """
+        outputs = [(str(out_file), hash_file(out_file)) for out_file in out_files]
+        keys = [self._keys.pop(file, None) or self._make_key(file, hash_file(file))]
+        keys.extend(
+            self._make_key(file, out_hash)
+            for out_file, out_hash in outputs
+            if Path(out_file).resolve() == file.resolve()
+        )
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO runs (key, outputs) VALUES (?, ?)",
+                ((key, json.dumps(outputs)) for key in keys),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def _get_key(self, file: Path) -> str:
+        key = self._make_key(file, hash_file(file))
+        self._keys[file] = key
+        return key
+
+    def _make_key(self, file: Path, file_hash: str) -> str:
+        digest = hashlib.sha256()
+        for part in (str(file), file_hash, self._identity):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
@@ -0,0 +1,246 @@
+import codecs
+import getpass
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+from collections.abc import Callable, Generator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import click
+
+# This module is imported by ``ftcli --client``, so it must import only click and modules of the
+# standard library, to keep the startup of the client fast.
+
+SERVE_AVAILABLE = hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+CHUNK_SIZE = 1 << 16
+
+
+class DaemonError(Exception):
+    """Raised when a job can't be sent to the server, or the server doesn't complete it"""
+
+
+def get_default_socket_path() -> Path:
+    """
+    Get the default path of the socket of ``ftcli serve``.
+
+    The path is read from the ``FTCLI_SOCKET`` environment variable. If the variable is not set, a
+    per-user socket in the runtime directory (or in the temporary directory) is used.
+
+    :return: The path of the socket
+    :rtype: Path
+    """
+    if env_path := os.environ.get("FTCLI_SOCKET"):
+        return Path(env_path)
+    base_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base_dir) / f"ftcli-{getpass.getuser()}.sock"
+
+
+def get_job_args(job: dict[str, Any]) -> list[str]:
+    """
+    Get the command line arguments of a job.
+
+    A job is either given as the arguments that would be written after ``ftcli``:
+
+    ``{"args": ["name", "del-names", "fonts", "-n", "3"]}``
+
+    or as a command name, a mapping of options and a list of paths:
+
+    ``{"command": "name del-names", "options": {"-n": 3, "--overwrite": true}, "paths": ["fonts"]}``
+
+    Flags are passed when their value is ``true``, and options with a list value are repeated.
+
+    :param job: The job description
+    :type job: dict[str, Any]
+    :return: The command line arguments
+    :rtype: list[str]
+    """
+    if "args" in job:
+        return [str(arg) for arg in job["args"]]
+
+    command = job.get("command")
+    if not command:
+        raise DaemonError("The job has neither 'args' nor 'command'")
+    args = command.split() if isinstance(command, str) else [str(name) for name in command]
+    args.extend(str(path) for path in job.get("paths", []))
+    for option, value in job.get("options", {}).items():
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            if item is True:
+                args.append(option)
+            elif item is not False and item is not None:
+                args.extend([option, str(item)])
+    return args
+
+
+def connect(socket_path: Path) -> socket.socket | None:
+    """
+    Connect to a running ``ftcli serve``.
+
+    :param socket_path: The path of the socket of the server
+    :type socket_path: Path
+    :return: The connected socket, or ``None`` if no server is listening on the socket
+    :rtype: socket.socket | None
+    """
+    if not SERVE_AVAILABLE:
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except (FileNotFoundError, ConnectionRefusedError):
+        sock.close()
+        return None
+    return sock
+
+
+def run_client(sock: socket.socket, args: list[str]) -> int:
+    """
+    Send a job to a running ``ftcli serve`` and wait for it to complete.
+
+    The output of the job is written to the standard output and the standard error as it is
+    received.
+
+    :param sock: A socket connected to the server with ``connect``
+    :type sock: socket.socket
+    :param args: The arguments that would be written after ``ftcli``
+    :type args: list[str]
+    :return: The exit code of the job
+    :rtype: int
+    """
+    streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps({"args": args, "cwd": os.getcwd()}).encode() + b"\n")
+        f.flush()
+        for line in f:
+            message = json.loads(line)
+            if "exit_code" in message:
+                return int(message["exit_code"])
+            stream = streams[message["stream"]]
+            stream.write(message["data"])
+            stream.flush()
+    raise DaemonError("The server closed the connection before the job was completed")
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    """
+    Run a job received by ``ftcli serve``.
+
+    The handler runs in a child process forked by the server, so the job inherits the modules
+    imported by the server, and any change it makes to the global state (the working directory,
+    the logger sinks, etc.) is discarded when it completes.
+
+    The job is a JSON object on a single line (see ``get_job_args``), with an optional ``cwd`` key.
+    The output of the job is sent back as JSON lines like ``{"stream": "stdout", "data": "..."}``,
+    followed by ``{"exit_code": 0}``.
+    """
+
+    server: "JobServer"
+
+    def handle(self) -> None:
+        lock = threading.Lock()
+
+        def _send(message: dict[str, Any]) -> None:
+            with lock:
+                self.wfile.write(json.dumps(message).encode() + b"\n")
+                self.wfile.flush()
+
+        try:
+            job = json.loads(self.rfile.readline())
+            args = get_job_args(job)
+            if job.get("cwd"):
+                os.chdir(job["cwd"])
+        except (ValueError, OSError, DaemonError) as e:
+            _send({"stream": "stderr", "data": f"Invalid job: {e}\n"})
+            _send({"exit_code": 2})
+            return
+
+        with _redirect_output(_send):
+            exit_code = _run_command(self.server.command, args)
+        _send({"exit_code": exit_code})
+
+
+class JobServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """
+    A Unix socket server that runs each job in a child process forked from the server.
+
+    Since the server imports all the subcommands before serving, the children start warm: they
+    don't pay for the interpreter startup, nor for the imports of fontTools and of the other
+    dependencies.
+    """
+
+    def __init__(self, socket_path: Path, command: click.Command, max_jobs: int) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            socket_path (Path): The path of the socket to listen on.
+            command (click.Command): The ``ftcli`` click group, invoked with the arguments of each
+                job.
+            max_jobs (int): The maximum number of jobs running at the same time. Further
+                connections wait until a job completes.
+        """
+        self.command = command
+        self.max_children = max_jobs
+        super().__init__(str(socket_path), JobHandler)
+
+
+def _run_command(command: click.Command, args: list[str]) -> int:
+    try:
+        command.main(args=args, prog_name="ftcli")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:  # pylint: disable=broad-except
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+@contextmanager
+def _redirect_output(send: Callable[[dict[str, Any]], None]) -> Generator[None, None, None]:
+    """
+    Redirect the standard output and the standard error to pipes, and send what is written to them
+    with the given callable.
+
+    The redirection is done at the file descriptor level, so that it also applies to the sinks that
+    hold a reference to the original streams (like the loguru ones) and to the worker processes.
+    """
+
+    def _forward(name: str, pipe: BinaryIO) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        with pipe:
+            while chunk := os.read(pipe.fileno(), CHUNK_SIZE):
+                send({"stream": name, "data": decoder.decode(chunk)})
+        if rest := decoder.decode(b"", final=True):
+            send({"stream": name, "data": rest})
+
+    threads: list[threading.Thread] = []
+    for name, fd in (("stdout", 1), ("stderr", 2)):
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, fd)
+        os.close(write_fd)
+        thread = threading.Thread(target=_forward, args=(name, os.fdopen(read_fd, "rb")))
+        thread.start()
+        threads.append(thread)
+
+    try:
+        yield
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            with suppress(OSError, ValueError):
+                stream.flush()
+        # Replacing the write ends of the pipes makes the forwarding threads reach the end of file
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        os.close(devnull)
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,275 @@
+import hashlib
+import shutil
+import struct
+from collections import defaultdict
+from collections.abc import Hashable, Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from fontTools.misc.cliTools import makeOutputFileName
+
+from foundrytools_cli.utils.cache import CHUNK_SIZE
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.sniffing import (
+    SFNT_ENTRY_SIZE,
+    SFNT_HEADER_SIZE,
+    SFNT_NUM_TABLES_OFFSET,
+    WOFF_ENTRY_SIZE,
+    WOFF_HEADER_SIZE,
+    WOFF_NUM_TABLES_OFFSET,
+    WOFF_SIGNATURE,
+)
+
+# The offset of ``checkSumAdjustment`` in the ``head`` table. It depends on the whole file, so it
+# differs between fonts with the same tables in a different order.
+HEAD_CHECKSUM_ADJUSTMENT_OFFSET = 8
+
+# A table record: the tag, the checksum, the length, the offset and the stored length of the data
+TableRecord = tuple[str, int, int, int, int]
+
+
+def read_table_records(file: Path) -> tuple[bytes, list[TableRecord]] | None:
+    """
+    Read the table directory of an SFNT or WOFF font, without reading the tables.
+
+    :param file: The font file
+    :type file: Path
+    :return: The signature of the file and the records of the tables sorted by tag, or ``None`` if
+        the file is not an SFNT or WOFF font (WOFF2 fonts have no table checksums)
+    :rtype: tuple[bytes, list[TableRecord]] | None
+    """
+    try:
+        with open(file, "rb") as f:
+            header = f.read(WOFF_HEADER_SIZE)
+            signature = header[:4]
+            if signature == WOFF_SIGNATURE:
+                num_tables = struct.unpack_from(">H", header, WOFF_NUM_TABLES_OFFSET)[0]
+                f.seek(WOFF_HEADER_SIZE)
+                directory = f.read(num_tables * WOFF_ENTRY_SIZE)
+                entries = struct.iter_unpack(">4sLLLL", directory)
+                # tag, offset, compressed length, original length, original checksum
+                records = [
+                    (tag.decode("latin-1"), checksum, length, offset, stored)
+                    for tag, offset, stored, length, checksum in entries
+                ]
+            elif signature in (b"\0\1\0\0", b"OTTO", b"true"):
+                num_tables = struct.unpack_from(">H", header, SFNT_NUM_TABLES_OFFSET)[0]
+                f.seek(SFNT_HEADER_SIZE)
+                directory = f.read(num_tables * SFNT_ENTRY_SIZE)
+                entries = struct.iter_unpack(">4sLLL", directory)
+                records = [
+                    (tag.decode("latin-1"), checksum, length, offset, length)
+                    for tag, checksum, offset, length in entries
+                ]
+            else:
+                return None
+    except (OSError, struct.error):
+        return None
+    if len(records) != num_tables:
+        return None
+    return signature, sorted(records)
+
+
+def get_table_key(file: Path) -> Hashable:
+    """
+    Get a key that is the same for the fonts that may have the same tables: the signature and the
+    tag, checksum and length of each table, read from the table directory.
+
+    The key of the other files, like WOFF2 fonts and collections, is their size.
+
+    :param file: The font file
+    :type file: Path
+    :return: The key of the file
+    :rtype: Hashable
+    """
+    directory = read_table_records(file)
+    if directory is None:
+        return file.stat().st_size
+    signature, records = directory
+    return signature, tuple(record[:3] for record in records)
+
+
+def hash_tables(file: Path) -> str:
+    """
+    Get the SHA-256 hash of the tables of a font, in tag order, reading them in chunks. The
+    ``checkSumAdjustment`` of the ``head`` table is ignored, so that the fonts with the same tables
+    in a different order have the same hash.
+
+    The other files are hashed as a whole.
+
+    :param file: The font file
+    :type file: Path
+    :return: The hexadecimal digest of the tables
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    directory = read_table_records(file)
+    with open(file, "rb") as f:
+        if directory is None:
+            _update_digest(digest, f, size=None)
+            return digest.hexdigest()
+
+        signature, records = directory
+        digest.update(signature)
+        for tag, _, length, offset, stored in records:
+            digest.update(struct.pack(">4sL", tag.encode("latin-1"), length))
+            f.seek(offset)
+            if tag == "head" and stored == length:
+                head = bytearray(f.read(stored))
+                adjustment = HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+                head[adjustment : adjustment + 4] = bytes(4)
+                digest.update(head)
+            else:
+                _update_digest(digest, f, size=stored)
+    return digest.hexdigest()
+
+
+def _update_digest(digest: "hashlib._Hash", f: BinaryIO, size: int | None) -> None:
+    remaining = size
+    while remaining is None or remaining > 0:
+        chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
+
+
+def find_duplicates(files: Iterable[Path]) -> list[list[Path]]:
+    """
+    Find the fonts that have the same tables, like copies of the same font under different names.
+
+    The files are grouped by the checksums and the lengths in their table directory, without
+    reading the tables. Only the files of the groups with more than one file are read, to confirm
+    that their tables are the same with ``hash_tables``.
+
+    :param files: The files to check
+    :type files: Iterable[Path]
+    :return: The groups of duplicates, with the files of each group sorted by path. The groups are
+        sorted by their first file.
+    :rtype: list[list[Path]]
+    """
+    candidates: defaultdict[Hashable, list[Path]] = defaultdict(list)
+    for file in files:
+        try:
+            candidates[get_table_key(file)].append(file)
+        except OSError:
+            continue
+
+    groups: list[list[Path]] = []
+    for candidate_files in candidates.values():
+        if len(candidate_files) < 2:
+            continue
+        by_hash: defaultdict[str, list[Path]] = defaultdict(list)
+        for file in candidate_files:
+            try:
+                by_hash[hash_tables(file)].append(file)
+            except OSError:
+                continue
+        groups.extend(sorted(group) for group in by_hash.values() if len(group) > 1)
+    return sorted(groups)
+
+
+class DuplicateSkipper:
+    """
+    Skip the duplicate fonts of a run, and copy the output files of the font processed in their
+    place to them.
+    """
+
+    def __init__(self, depends_on_file_name: bool = False, overwrite: bool = False) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            depends_on_file_name (bool): Whether the task depends on the file name. If ``True``,
+                only the fonts with the same tables and the same file name are duplicates.
+            overwrite (bool): Whether the copies of the output files overwrite the existing files.
+        """
+        self.depends_on_file_name = depends_on_file_name
+        self.overwrite = overwrite
+        # The duplicates of each font processed in their place
+        self._twins: dict[Path, list[Path]] = {}
+        self._files: list[Path] | None = None
+
+    def skip(self, files: Iterable[Path]) -> Iterator[Path]:
+        """
+        Keep only the first file of each group of duplicates. The duplicates are found once, the
+        first time the files are generated.
+
+        :param files: The files of the run
+        :type files: Iterable[Path]
+        :return: The files to process, in the same order as ``files``
+        :rtype: Iterator[Path]
+        """
+        if self._files is None:
+            files = list(files)
+            twins: set[Path] = set()
+            for group in find_duplicates(files):
+                subgroups: dict[str, list[Path]] = {}
+                for file in group:
+                    key = file.name if self.depends_on_file_name else ""
+                    subgroups.setdefault(key, []).append(file)
+                for representative, *others in subgroups.values():
+                    if others:
+                        self._twins[representative] = others
+                        twins.update(others)
+            if twins:
+                logger.skip(f"{len(twins)} duplicate fonts skipped")  # type: ignore
+            self._files = [file for file in files if file not in twins]
+        return iter(self._files)
+
+    def copy_outputs(
+        self, file: Path, out_files: list[Path], failed: bool
+    ) -> tuple[list[Path], bool]:
+        """
+        Copy the output files of a processed font to its duplicates, named after them.
+
+        :param file: The processed font
+        :type file: Path
+        :param out_files: The output files of the font
+        :type out_files: list[Path]
+        :param failed: Whether the font failed. The output files of a failed font are not copied.
+        :type failed: bool
+        :return: The copies, and whether a copy failed
+        :rtype: tuple[list[Path], bool]
+        """
+        twins = self._twins.pop(file, None)
+        if not twins:
+            return [], False
+        if failed or not out_files:
+            logger.skip(f"{len(twins)} duplicates of {file} not processed")  # type: ignore
+            return [], False
+
+        copies: list[Path] = []
+        copy_failed = False
+        for twin in twins:
+            for out_file in out_files:
+                twin_out_file = self._get_twin_out_file(file, twin, out_file)
+                if twin_out_file is None:
+                    logger.warning(f"Can't name the copy of {out_file} for {twin}")
+                    continue
+                try:
+                    if not (twin_out_file.exists() and twin_out_file.samefile(out_file)):
+                        shutil.copyfile(out_file, twin_out_file)
+                except OSError as e:
+                    logger.error(f"Can't copy {out_file} to {twin_out_file}: {e}")
+                    copy_failed = True
+                    continue
+                logger.success(f"File copied to {twin_out_file}")
+                copies.append(twin_out_file)
+        return copies, copy_failed
+
+    def _get_twin_out_file(self, file: Path, twin: Path, out_file: Path) -> Path | None:
+        """
+        Get the output file of a duplicate font, replacing the name of the processed font with the
+        name of the duplicate in the name of an output file. The output files of the processed font
+        that are not named after it can't be copied.
+        """
+        if not out_file.name.startswith(file.stem):
+            return None
+        out_dir = twin.parent if out_file.parent == file.parent else out_file.parent
+        name = twin.stem + out_file.name[len(file.stem) :]
+        if name == twin.name:
+            # The font was overwritten
+            return out_dir / name
+        return Path(makeOutputFileName(str(out_dir / name), overWrite=self.overwrite))
@@ -0,0 +1,170 @@
+import struct
+from typing import BinaryIO
+
+from fontTools.misc.textTools import tobytes
+from fontTools.ttLib import TTFont, getTableClass
+from fontTools.ttLib.sfnt import calcChecksum
+from fontTools.ttLib.ttFont import getSearchRange, sortedTagList
+from foundrytools import Font
+
+# When these tables are loaded, compiling the font recalculates the bounding boxes stored in other
+# tables, so the font is saved normally
+OUTLINE_TABLES = ("glyf", "CFF ", "CFF2")
+
+SFNT_HEADER_FORMAT = ">4sHHHH"
+SFNT_ENTRY_FORMAT = ">4sLLL"
+CHECKSUM_MAGIC = 0xB1B0AFBA
+
+
+def can_fast_save(font: Font) -> bool:
+    """
+    Check if a font can be saved with ``fast_save``.
+
+    The font must have been read from an SFNT file and must be saved as an SFNT file, and its
+    outline tables must not have been loaded.
+
+    :param font: The font to check
+    :type font: Font
+    :return: ``True`` if the font can be saved with ``fast_save``, ``False`` otherwise
+    :rtype: bool
+    """
+    ttfont = font.ttfont
+    reader = ttfont.reader
+    return (
+        reader is not None
+        and getattr(reader, "flavor", None) is None
+        and ttfont.flavor is None
+        and not any(ttfont.isLoaded(tag) for tag in OUTLINE_TABLES)
+    )
+
+
+def fast_save(font: Font, file: BinaryIO, reorder_tables: bool | None = True) -> list[str]:
+    """
+    Save a font compiling only the modified tables.
+
+    Tables that were not loaded are copied byte for byte from the input file, with their original
+    checksums. Tables that were loaded are compiled, and copied from the input file too if they
+    haven't changed. Only the offsets, the checksums of the modified tables and
+    ``head.checkSumAdjustment`` are recalculated.
+    The tables are laid out like ``Font.save`` does, so the output is the same as a regular save
+    when the tables that were loaded compile to the same data as in the input file.
+
+    The font must be checked with ``can_fast_save`` first.
+
+    :param font: The font to save
+    :type font: Font
+    :param file: A binary stream to write the font to
+    :type file: BinaryIO
+    :param reorder_tables: If ``True``, sort the tables by tag. If ``False``, retain the original
+        order. If ``None``, sort the tables by dependency.
+    :type reorder_tables: bool | None
+    :return: The tags of the tables that were modified
+    :rtype: list[str]
+    """
+    ttfont = font.ttfont
+    reader = ttfont.reader
+    if ttfont.recalcTimestamp and "head" in ttfont:
+        # Load the head table, so that the timestamp is updated like TTFont.save does
+        ttfont["head"]  # pylint: disable=pointless-statement
+
+    tables: dict[str, tuple[bytes, int]] = {}
+    compiled_tags: list[str] = []
+    # Compile the tables in the same order as TTFont.save, since compiling a table may update
+    # other tables (e.g. hmtx updates hhea.numberOfHMetrics)
+    dependency_order = _get_dependency_order(ttfont)
+    for tag in dependency_order:
+        # SFNTReader has no get() method
+        original_data = reader[tag] if tag in reader.tables else None
+        if original_data is not None and not ttfont.isLoaded(tag):
+            tables[tag] = (original_data, reader.tables[tag].checkSum)
+            continue
+
+        # The is_modified property of the foundrytools table wrappers compiles the table twice,
+        # comparing the compiled data with the original data is cheaper
+        data = ttfont.getTableData(tag)
+        if data == original_data:
+            tables[tag] = (data, reader.tables[tag].checkSum)
+        else:
+            tables[tag] = (data, calcChecksum(data))
+            compiled_tags.append(tag)
+
+    if reorder_tables is None:
+        write_order = dependency_order
+    elif reorder_tables:
+        write_order = sortedTagList(list(tables))
+    else:
+        write_order = sortedTagList(list(tables), list(reader.keys()))
+
+    _write_sfnt(file, tobytes(ttfont.sfntVersion, encoding="latin1"), tables, write_order)
+    return compiled_tags
+
+
+def _get_dependency_order(ttfont: TTFont) -> list[str]:
+    # TTFont is not iterable, keys() returns the tags of the loaded and of the unloaded tables
+    tags = [tag for tag in ttfont.keys() if tag != "GlyphOrder"]  # noqa: SIM118
+    done: list[str] = []
+
+    def _visit(tag: str) -> None:
+        if tag in done:
+            return
+        for master_tag in getTableClass(tag).dependencies:
+            if master_tag not in done:
+                if master_tag in ttfont:
+                    _visit(master_tag)
+                else:
+                    done.append(master_tag)
+        done.append(tag)
+
+    for tag in tags:
+        _visit(tag)
+    return [tag for tag in done if tag in tags]
+
+
+def _write_sfnt(
+    file: BinaryIO,
+    sfnt_version: bytes,
+    tables: dict[str, tuple[bytes, int]],
+    write_order: list[str],
+) -> None:
+    num_tables = len(tables)
+    search_range, entry_selector, range_shift = getSearchRange(num_tables, 16)
+    header = struct.pack(
+        SFNT_HEADER_FORMAT, sfnt_version, num_tables, search_range, entry_selector, range_shift
+    )
+
+    # The head checksum is calculated with checkSumAdjustment set to zero
+    if "head" in tables:
+        head_data = tables["head"][0]
+        head_data = head_data[:8] + b"\0\0\0\0" + head_data[12:]
+        tables["head"] = (head_data, calcChecksum(head_data))
+
+    offsets: dict[str, int] = {}
+    offset = struct.calcsize(SFNT_HEADER_FORMAT) + num_tables * struct.calcsize(SFNT_ENTRY_FORMAT)
+    for tag in write_order:
+        offsets[tag] = offset
+        offset += _padded_length(len(tables[tag][0]))
+
+    directory = b"".join(
+        struct.pack(
+            SFNT_ENTRY_FORMAT, tobytes(tag, encoding="latin1"), checksum, offsets[tag], len(data)
+        )
+        for tag, (data, checksum) in sorted(tables.items())
+    )
+
+    if "head" in tables:
+        checksums = [checksum for _, checksum in tables.values()]
+        checksums.append(calcChecksum(header + directory))
+        adjustment = (CHECKSUM_MAGIC - sum(checksums)) & 0xFFFFFFFF
+        head_data = tables["head"][0]
+        tables["head"] = (head_data[:8] + struct.pack(">L", adjustment) + head_data[12:], 0)
+
+    file.write(header)
+    file.write(directory)
+    for tag in write_order:
+        data = tables[tag][0]
+        file.write(data)
+        file.write(b"\0" * (_padded_length(len(data)) - len(data)))
+
+
+def _padded_length(length: int) -> int:
+    return (length + 3) & ~3
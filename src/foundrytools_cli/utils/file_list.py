@@ -0,0 +1,51 @@
+import os
+import sys
+from pathlib import Path
+
+# The value of ``INPUT_PATH`` and ``--from-list`` that reads the paths from the standard input
+STDIN = "-"
+
+
+def read_file_list(source: Path, base_dir: Path) -> list[Path]:
+    """
+    Read a list of files, one per line or separated by NUL characters, like the output of
+    ``find -print0`` or ``git diff --name-only -z``.
+
+    The list is NUL separated if it contains any NUL character. Empty entries and repeated files are
+    skipped.
+
+    :param source: The file to read the list from, or ``-`` to read it from the standard input
+    :type source: Path
+    :param base_dir: The directory the relative paths are relative to
+    :type base_dir: Path
+    :return: The absolute paths of the files, in the order of the list
+    :rtype: list[Path]
+    """
+    data = sys.stdin.buffer.read() if str(source) == STDIN else source.read_bytes()
+
+    entries = data.split(b"\0") if b"\0" in data else data.splitlines()
+    files: dict[Path, None] = {}
+    for entry in entries:
+        if not entry:
+            continue
+        # Decoded like the paths returned by the OS, so that undecodable names round trip
+        files.setdefault(base_dir.joinpath(os.fsdecode(entry)).resolve(), None)
+    return list(files)
+
+
+def get_input_paths(input_path: Path, input_files: list[Path] | None) -> list[Path]:
+    """
+    Get the paths to search for fonts, for the commands that don't process the fonts with a
+    ``TaskRunner``.
+
+    :param input_path: The ``INPUT_PATH`` of the command
+    :type input_path: Path
+    :param input_files: The files read with ``--from-list``, if any. The ones that don't exist are
+        skipped, like ``TaskRunner`` does.
+    :type input_files: list[Path] | None
+    :return: The listed files, or ``INPUT_PATH``
+    :rtype: list[Path]
+    """
+    if input_files is not None:
+        return [file for file in input_files if file.is_file()]
+    return [input_path]
@@ -0,0 +1,358 @@
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from fontTools.ttLib import TTLibError
+from foundrytools import Font
+
+from foundrytools_cli.utils.cache import hash_file
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.process_pool import FORK_AVAILABLE, ProcessPool, ProcessPoolError
+from foundrytools_cli.utils.sniffing import sniff_font
+
+# Increase when the columns change, to rebuild the existing indexes
+SCHEMA_VERSION = 1
+
+# The columns of the fonts table. Lists and mappings are stored as JSON.
+COLUMNS = {
+    "path": "TEXT PRIMARY KEY",
+    "size": "INTEGER NOT NULL",
+    "mtime_ns": "INTEGER NOT NULL",
+    "hash": "TEXT NOT NULL",
+    "flavor": "TEXT NOT NULL",
+    "outlines": "TEXT",
+    "is_variable": "INTEGER NOT NULL",
+    "tables": "TEXT NOT NULL",
+    "num_glyphs": "INTEGER",
+    "family_name": "TEXT",
+    "subfamily_name": "TEXT",
+    "full_name": "TEXT",
+    "postscript_name": "TEXT",
+    "names": "TEXT NOT NULL",
+    "vendor_id": "TEXT",
+    "font_revision": "REAL",
+    "us_weight_class": "INTEGER",
+    "us_width_class": "INTEGER",
+    "fs_selection": "INTEGER",
+    "axes": "TEXT NOT NULL",
+}
+
+# The number of files read by each worker process
+CHUNK_SIZE = 64
+
+
+class FontIndexError(Exception):
+    """Raised when the index can't be opened or queried"""
+
+
+@dataclass
+class IndexUpdate:
+    """
+    The number of files added, updated, unchanged, removed and that couldn't be read by an update of
+    the index.
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+
+
+def read_font_record(file: Path) -> dict[str, Any] | None:
+    """
+    Read the metadata of a font file to store in the index.
+
+    :param file: The font file
+    :type file: Path
+    :return: The values of the columns, or ``None`` if the file is not a font
+    :rtype: dict[str, Any] | None
+    """
+    signature = sniff_font(file)
+    if signature is None:
+        return None
+
+    stat = file.stat()
+    with Font(file, lazy=True) as font:
+        ttfont = font.ttfont
+        name = ttfont.get("name")
+        os_2 = ttfont.get("OS/2")
+        outlines = next((tag for tag in ("glyf", "CFF ", "CFF2") if tag in signature.tags), None)
+        return {
+            "path": str(file),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": hash_file(file),
+            "flavor": signature.flavor or "sfnt",
+            "outlines": outlines.strip() if outlines else None,
+            "is_variable": signature.is_variable,
+            "tables": json.dumps(sorted(signature.tags)),
+            "num_glyphs": ttfont["maxp"].numGlyphs if "maxp" in ttfont else None,
+            "family_name": name.getBestFamilyName() if name else None,
+            "subfamily_name": name.getBestSubFamilyName() if name else None,
+            "full_name": name.getDebugName(4) if name else None,
+            "postscript_name": name.getDebugName(6) if name else None,
+            "names": json.dumps(_get_names(name)),
+            "vendor_id": os_2.achVendID if os_2 else None,
+            "font_revision": round(ttfont["head"].fontRevision, 3) if "head" in ttfont else None,
+            "us_weight_class": os_2.usWeightClass if os_2 else None,
+            "us_width_class": os_2.usWidthClass if os_2 else None,
+            "fs_selection": os_2.fsSelection if os_2 else None,
+            "axes": json.dumps(
+                {
+                    axis.axisTag: [axis.minValue, axis.defaultValue, axis.maxValue]
+                    for axis in ttfont["fvar"].axes
+                }
+                if signature.is_variable
+                else {}
+            ),
+        }
+
+
+def _get_names(name: Any) -> dict[int, str]:
+    if name is None:
+        return {}
+    name_ids = sorted({record.nameID for record in name.names})
+    return {name_id: name.getDebugName(name_id) for name_id in name_ids}
+
+
+def _read_font_records(files: list[Path]) -> list[dict[str, Any] | None | Exception]:
+    """
+    Read the records of a chunk of files. This is the entry point of the worker processes.
+    """
+    records: list[dict[str, Any] | None | Exception] = []
+    for file in files:
+        try:
+            records.append(read_font_record(file))
+        except (TTLibError, OSError, KeyError, ValueError, AttributeError) as e:
+            records.append(e)
+    return records
+
+
+def _handle_worker_error(
+    files: list[Path], error: ProcessPoolError
+) -> list[dict[str, Any] | None | Exception]:
+    return [error] * len(files)
+
+
+def _is_under(path: Path, root: Path, recursive: bool) -> bool:
+    if path == root:
+        return True
+    return root in path.parents if recursive else path.parent == root
+
+
+class FontIndex:
+    """
+    An SQLite database of the metadata of the fonts of a corpus: the hash, the flavor, the tables,
+    the number of glyphs, the names, the ``OS/2`` classes and the ``fvar`` axes of each font file.
+
+    The index is updated incrementally: only the files whose size or modification time has changed
+    are read again. It can be queried with SQL expressions on the columns (see ``COLUMNS``) to
+    select fonts without opening them.
+    """
+
+    def __init__(self, index_file: Path, read_only: bool = False) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            index_file (Path): The SQLite database file. It is created if it doesn't exist, unless
+                ``read_only`` is set.
+            read_only (bool): Open the database in read-only mode. Defaults to False.
+        """
+        self.index_file = index_file
+        try:
+            if read_only:
+                self._connection = sqlite3.connect(
+                    f"{index_file.absolute().as_uri()}?mode=ro", uri=True, timeout=30
+                )
+                self._check_schema()
+            else:
+                index_file.parent.mkdir(parents=True, exist_ok=True)
+                self._connection = sqlite3.connect(index_file, timeout=30)
+                self._create_schema()
+        except sqlite3.Error as e:
+            raise FontIndexError(f"Can't open the index {index_file}: {e}") from e
+
+    def update(
+        self, files: Iterable[Path], root: Path, recursive: bool, jobs: int = 1, force: bool = False
+    ) -> IndexUpdate:
+        """
+        Update the records of the files found in a directory.
+
+        The records of the files that no longer exist, or that are no longer fonts, are removed.
+
+        :param files: The files found in ``root``
+        :type files: Iterable[Path]
+        :param root: The directory (or the file) that was searched
+        :type root: Path
+        :param recursive: Whether the subdirectories of ``root`` were searched
+        :type recursive: bool
+        :param jobs: The number of worker processes reading the fonts
+        :type jobs: int
+        :param force: Read all the files again, even if they haven't changed
+        :type force: bool
+        :return: The number of records added, updated, unchanged and removed
+        :rtype: IndexUpdate
+        """
+        result = IndexUpdate()
+        known = self._get_known_files(root, recursive)
+        changed: list[Path] = []
+        for file in files:
+            stat = file.stat()
+            if not force and known.get(str(file)) == (stat.st_size, stat.st_mtime_ns):
+                del known[str(file)]
+                result.unchanged += 1
+            else:
+                changed.append(file)
+
+        chunks = _split(changed, CHUNK_SIZE)
+        if jobs > 1 and FORK_AVAILABLE:
+            pool = ProcessPool(_read_font_records, jobs=jobs, error_handler=_handle_worker_error)
+            chunk_records = pool.imap(chunks)
+        else:
+            chunk_records = map(_read_font_records, chunks)
+
+        with self._connection:
+            for file, record in zip(changed, _flatten(chunk_records)):
+                if isinstance(record, Exception):
+                    # Keep the previous record, if any
+                    logger.error(f"Can't read {file}: {record}")
+                    result.failed += 1
+                elif record is not None:
+                    if str(file) in known:
+                        result.updated += 1
+                    else:
+                        result.added += 1
+                    self._store(record)
+                else:
+                    # Not a font, its previous record is removed with the missing files
+                    continue
+                known.pop(str(file), None)
+            # The files that are missing, or that are no longer fonts
+            result.removed = len(known)
+            self._connection.executemany(
+                "DELETE FROM fonts WHERE path = ?", [(path,) for path in known]
+            )
+        return result
+
+    def select(self, root: Path, recursive: bool, where: str | None = None) -> list[Path]:
+        """
+        Get the indexed fonts of a directory.
+
+        :param root: The directory (or the file) to get the fonts of
+        :type root: Path
+        :param recursive: Whether to include the fonts of the subdirectories of ``root``
+        :type recursive: bool
+        :param where: An SQL expression on the columns that the fonts must match, like
+            ``is_variable AND outlines = 'CFF2' AND us_weight_class >= 700``
+        :type where: str | None
+        :return: The files of the fonts, sorted by path
+        :rtype: list[Path]
+        :raises FontIndexError: If the expression is not valid
+        """
+        return [Path(row["path"]) for row in self.query(root, recursive, where, columns=["path"])]
+
+    def get_sizes(self, root: Path, recursive: bool, where: str | None = None) -> dict[Path, int]:
+        """
+        Get the sizes of the indexed fonts of a directory, as they were when the index was updated.
+
+        :param root: The directory (or the file) to get the fonts of
+        :type root: Path
+        :param recursive: Whether to include the fonts of the subdirectories of ``root``
+        :type recursive: bool
+        :param where: An SQL expression on the columns that the fonts must match
+        :type where: str | None
+        :return: The size of each file, in bytes
+        :rtype: dict[Path, int]
+        :raises FontIndexError: If the expression is not valid
+        """
+        rows = self.query(root, recursive, where, columns=["path", "size"])
+        return {Path(row["path"]): row["size"] for row in rows}
+
+    def query(
+        self,
+        root: Path,
+        recursive: bool,
+        where: str | None = None,
+        columns: list[str] | None = None,
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Get the records of the indexed fonts of a directory.
+
+        :param root: The directory (or the file) to get the fonts of
+        :type root: Path
+        :param recursive: Whether to include the fonts of the subdirectories of ``root``
+        :type recursive: bool
+        :param where: An SQL expression on the columns that the fonts must match
+        :type where: str | None
+        :param columns: The columns to get. Defaults to all the columns.
+        :type columns: list[str] | None
+        :return: The records, sorted by path
+        :rtype: Iterator[sqlite3.Row]
+        :raises FontIndexError: If the expression is not valid
+        """
+        prefix = str(root).rstrip(os.sep) + os.sep
+        sql = (
+            f"SELECT {', '.join(columns or COLUMNS)} FROM fonts "
+            "WHERE (path = ? OR substr(path, 1, ?) = ?)"
+        )
+        if where:
+            sql += f" AND ({where})"
+        sql += " ORDER BY path"
+        self._connection.row_factory = sqlite3.Row
+        try:
+            rows = self._connection.execute(sql, (str(root), len(prefix), prefix)).fetchall()
+        except sqlite3.Error as e:
+            raise FontIndexError(f"Invalid query '{where}': {e}") from e
+        return (row for row in rows if _is_under(Path(row["path"]), root, recursive))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def _create_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS fonts")
+        columns = ", ".join(f"{name} {kind}" for name, kind in COLUMNS.items())
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS fonts ({columns})")
+        self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection.commit()
+
+    def _check_schema(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            raise FontIndexError(
+                f"The index {self.index_file} was built by another version, run 'ftcli index "
+                "build' to rebuild it"
+            )
+
+    def _get_known_files(self, root: Path, recursive: bool) -> dict[str, tuple[int, int]]:
+        return {
+            row["path"]: (row["size"], row["mtime_ns"])
+            for row in self.query(root, recursive, columns=["path", "size", "mtime_ns"])
+        }
+
+    def _store(self, record: dict[str, Any]) -> None:
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO fonts ({', '.join(record)}) "
+            f"VALUES ({', '.join('?' * len(record))})",
+            list(record.values()),
+        )
+
+
+def _split(items: list[Path], size: int) -> Iterator[list[Path]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _flatten(chunks: Iterable[list[Any]]) -> Iterator[Any]:
+    for chunk in chunks:
+        yield from chunk
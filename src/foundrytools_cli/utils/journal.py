@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from foundrytools_cli.utils.cache import hash_file, to_json
+
+if TYPE_CHECKING:
+    from fontTools.ttLib import TTFont
+    from foundrytools import Font
+
+COMPLETED = "completed"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+
+def write_atomic(file: Path, data: bytes | memoryview) -> None:
+    """
+    Write a file atomically: the data is written to a temporary file in the same directory, which
+    then replaces the file. If the process is killed while writing, the file is either missing or
+    left as it was, and never half-written.
+
+    While a ``ResumeJournal`` is open, the data is also synced to disk before the file is replaced,
+    so that the files recorded as completed survive a power loss. Otherwise, syncing every font
+    would only slow down the large batches.
+
+    A symbolic link is written through, to its target. A hard link is replaced: the other names of
+    the file keep the previous data, like the twins linked by ``utils find-duplicates
+    --hard-link``, which are processed on their own.
+
+    :param file: The file to write
+    :type file: Path
+    :param data: The data to write
+    :type data: bytes | memoryview
+    """
+    if file.is_symlink():
+        file = file.resolve()
+    fd, temp_name = tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.", suffix=".tmp")
+    try:
+        # mkstemp creates the file readable only by the user, keep the usual permissions instead
+        os.chmod(temp_name, _get_file_mode(file))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if ResumeJournal.open_journals:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_name, file)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def save_font_atomic(
+    font: "Font | TTFont", file: Path | str, reorder_tables: bool | None = True
+) -> None:
+    """
+    Compile a font in memory and write it atomically with ``write_atomic``, for the commands that
+    save the fonts by themselves.
+
+    :param font: The font to save
+    :type font: Font | TTFont
+    :param file: The file to write
+    :type file: Path | str
+    :param reorder_tables: How to reorder the tables, like in ``Font.save``. Defaults to ``True``.
+    :type reorder_tables: bool | None
+    """
+    buffer = BytesIO()
+    ttfont: TTFont = getattr(font, "ttfont", font)
+    ttfont.save(buffer, reorderTables=reorder_tables)
+    write_atomic(Path(file), buffer.getbuffer())
+
+
+def _get_file_mode(file: Path) -> int:
+    if file.exists():
+        return stat.S_IMODE(file.stat().st_mode)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _ends_with_newline(file: Path) -> bool:
+    with open(file, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class ResumeJournal:
+    """
+    An append-only record of the fonts processed by a run, used to resume the run after it was
+    interrupted.
+
+    Each line is a JSON object with the input file and its hash before processing, the identity of
+    the command and its options, the status of the font and the hashes of the output files. Lines
+    are synced to disk as soon as they are written, and a truncated last line is ignored.
+
+    A font is skipped if its last entry with the same identity is completed, the input file hasn't
+    changed since (or was overwritten by the output), and the output files still exist unchanged.
+    The fonts that failed, or that were being processed when the run was interrupted, are processed
+    again.
+    """
+
+    # The number of journals open in this process, to sync the files written by ``write_atomic``
+    open_journals: ClassVar[int] = 0
+
+    def __init__(self, file: Path, identity: dict[str, Any]) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            file (Path): The journal file. It is created if it doesn't exist.
+            identity (dict[str, Any]): The command name and options. Must be JSON serializable,
+                sets and paths are allowed.
+        """
+        file.parent.mkdir(parents=True, exist_ok=True)
+        self.file = file
+        self.hits = 0
+        self._identity = hashlib.sha256(
+            json.dumps(identity, sort_keys=True, default=to_json).encode("utf-8")
+        ).hexdigest()
+        self._completed = self._load(file)
+        self._hashes: dict[Path, str] = {}
+        # The file is closed by the close method
+        self._stream = open(  # noqa: SIM115 # pylint: disable=consider-using-with
+            file, "a", encoding="utf-8"
+        )
+        if self._stream.tell() > 0 and not _ends_with_newline(file):
+            # Terminate the line truncated by the interruption
+            self._stream.write("\n")
+        ResumeJournal.open_journals += 1
+
+    def is_completed(self, file: Path) -> bool:
+        """
+        Check if a font was completed in a previous run.
+
+        :param file: The input file
+        :type file: Path
+        :return: ``True`` if the font can be skipped, ``False`` otherwise
+        :rtype: bool
+        """
+        # Record the hash before the font is processed, since the file may be overwritten
+        file_hash = hash_file(file)
+        self._hashes[file] = file_hash
+        entry = self._completed.get(str(file))
+        if entry is None:
+            return False
+
+        outputs: dict[str, str] = entry["out_files"]
+        if file_hash not in (entry["hash"], outputs.get(str(file))):
+            return False
+        for out_file, out_hash in outputs.items():
+            if not Path(out_file).is_file() or hash_file(Path(out_file)) != out_hash:
+                return False
+
+        del self._hashes[file]
+        self.hits += 1
+        return True
+
+    def record(self, file: Path, status: str, out_files: list[Path]) -> None:
+        """
+        Append the outcome of a font to the journal.
+
+        :param file: The input file
+        :type file: Path
+        :param status: The status of the font: ``completed``, ``failed`` or ``timed_out``
+        :type status: str
+        :param out_files: The files written while processing the font
+        :type out_files: list[Path]
+        """
+        entry = {
+            "file": str(file),
+            "hash": self._hashes.pop(file, None),
+            "identity": self._identity,
+            "status": status,
+            "out_files": {str(f): hash_file(f) for f in out_files if f.is_file()},
+        }
+        self._stream.write(json.dumps(entry) + "\n")
+        self._stream.flush()
+        os.fsync(self._stream.fileno())
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if not self._stream.closed:
+            ResumeJournal.open_journals -= 1
+        self._stream.close()
+
+    def _load(self, file: Path) -> dict[str, dict[str, Any]]:
+        completed: dict[str, dict[str, Any]] = {}
+        if not file.is_file():
+            return completed
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The run was interrupted while writing the line
+                    continue
+                if entry.get("identity") != self._identity:
+                    continue
+                if entry.get("status") == COMPLETED:
+                    completed[entry["file"]] = entry
+                else:
+                    completed.pop(entry["file"], None)
+        return completed
@@ -0,0 +1,46 @@
+import importlib
+from typing import Any
+
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    A click Group that imports its subcommands only when they are invoked.
+
+    The subcommands are given as a mapping of the command names to an import path in the
+    ``module:attribute`` form. The help of the group imports all the subcommands, to show their
+    own help texts.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            lazy_commands (dict[str, str], optional): A dictionary mapping the names of the
+                subcommands to their import path.
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        import_path = self.lazy_commands[cmd_name]
+        module_name, attribute = import_path.split(":")
+        command = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{import_path} is not a click command")
+        return command
@@ -1,21 +1,229 @@
+import json
 import sys
+import traceback
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from functools import partialmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
 
 from loguru import logger
 
-# Remove the default logger
-logger.remove()
+if TYPE_CHECKING:
+    from loguru import Message
+
+LOG_FORMAT = "[ <level>{level: <8}</level> ] {message}"
+TEXT_FORMAT = "text"
+JSON_FORMAT = "json"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+LOG_FILE_BUFFER_SIZE = 1 << 16
+
+# The handler id and the level number of the sinks, by name
+_handlers: dict[str, tuple[int, int]] = {}
+# The format and the level of the console sink, set by ``configure_logging``
+_console = {"format": TEXT_FORMAT, "level": "INFO"}
+
+
+class JsonSink:
+    """
+    A sink that writes each message as a JSON object on a single line, with the time, the level,
+    the message, the font file being processed and the traceback of the exception, if any.
+
+    The stream is not flushed after each message, so the sink should be added with ``enqueue=True``
+    to write the messages in a background thread.
+    """
+
+    def __init__(self, stream: TextIO, close: bool = False) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            stream (TextIO): The stream to write the messages to.
+            close (bool): Whether to close the stream when the sink is removed. Defaults to False.
+        """
+        self.stream = stream
+        self.close = close
+
+    def write(self, message: "Message") -> None:
+        """
+        Write a message.
+
+        :param message: The message to write
+        :type message: Message
+        """
+        record = message.record
+        entry: dict[str, Any] = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+        }
+        if "file" in record["extra"]:
+            entry["file"] = record["extra"]["file"]
+        if record["exception"] is not None:
+            entry["exception"] = "".join(traceback.format_exception(*record["exception"])).rstrip()
+        self.stream.write(json.dumps(entry) + "\n")
+
+    def stop(self) -> None:
+        """Flush the stream, and close it if requested. Called when the sink is removed."""
+        self.stream.flush()
+        if self.close:
+            self.stream.close()
+
+
+def _add_sink(name: str, sink: Any, level: str, **kwargs: Any) -> None:
+    _remove_sink(name)
+    handler_id = logger.add(sink, level=level, **kwargs)
+    _handlers[name] = (handler_id, logger.level(level).no)
+
+
+def _remove_sink(name: str) -> None:
+    if name in _handlers:
+        logger.remove(_handlers.pop(name)[0])
+
+
+def add_console_sink(
+    sink: TextIO | Callable[["Message"], None] | None = None, level: str | None = None
+) -> None:
+    """
+    Replace the sink that prints the messages to the console.
+
+    :param sink: The stream or the callable to write the formatted messages to. Defaults to the
+        standard error, in the format set by ``configure_logging``.
+    :type sink: TextIO | Callable[[Message], None] | None
+    :param level: The minimum level of the messages to print. Defaults to the level set by
+        ``configure_logging``.
+    :type level: str | None
+    """
+    level = level or _console["level"]
+    if sink is None and _console["format"] == JSON_FORMAT:
+        _add_sink("console", JsonSink(sys.stderr), level, format="{message}", enqueue=True)
+        return
+    _add_sink(
+        "console",
+        sink or sys.stderr,
+        level,
+        backtrace=False,
+        colorize=True,
+        format=LOG_FORMAT,
+    )
+
+
+def get_console_level() -> str:
+    """
+    Get the minimum level of the messages printed to the console, set by ``configure_logging``.
+    """
+    return _console["level"]
 
-# Add a sink to the logger to print to stdout
-logger.add(
-    sys.stderr,
-    backtrace=False,
-    colorize=True,
-    format="[ <level>{level: <8}</level> ] {message}",
-    level="INFO",
-)
+
+def is_console_structured() -> bool:
+    """
+    Check if the messages are printed to the console as JSON lines.
+    """
+    return _console["format"] == JSON_FORMAT
+
+
+def get_min_level() -> int:
+    """
+    Get the number of the lowest level accepted by any sink. Messages below this level are not
+    emitted anywhere.
+    """
+    return min((level_no for _, level_no in _handlers.values()), default=0)
+
+
+@contextmanager
+def configure_logging(
+    log_format: str = TEXT_FORMAT, log_file: Path | None = None, log_level: str = "INFO"
+) -> Generator[None, None, None]:
+    """
+    Configure the logger for the duration of a command.
+
+    With a log file, the messages are written to the file in the given format, and also printed to
+    the console as text. Without a log file, the messages are printed to the console in the given
+    format. Files and JSON lines are written by a background thread, and buffered.
+
+    :param log_format: ``text`` or ``json``
+    :type log_format: str
+    :param log_file: The file to append the messages to
+    :type log_file: Path | None
+    :param log_level: The minimum level of the messages
+    :type log_level: str
+    """
+    if (log_format, log_file, log_level) == (TEXT_FORMAT, None, "INFO"):
+        yield
+        return
+
+    _console["format"] = log_format if log_file is None else TEXT_FORMAT
+    _console["level"] = log_level
+    add_console_sink()
+    if log_file is not None:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        if log_format == JSON_FORMAT:
+            # The file is closed by JsonSink.stop
+            stream = open(  # noqa: SIM115 # pylint: disable=consider-using-with
+                log_file, "a", encoding="utf-8", buffering=LOG_FILE_BUFFER_SIZE
+            )
+            sink = JsonSink(stream, close=True)
+            _add_sink("file", sink, log_level, format="{message}", enqueue=True)
+        else:
+            _add_sink(
+                "file",
+                log_file,
+                log_level,
+                format=LOG_FORMAT,
+                colorize=False,
+                enqueue=True,
+                buffering=LOG_FILE_BUFFER_SIZE,
+            )
+    try:
+        yield
+    finally:
+        # Removing the sinks waits for the enqueued messages to be written
+        _remove_sink("file")
+        _console.update(format=TEXT_FORMAT, level="INFO")
+        add_console_sink()
+
+
+# Replace the default sink
+logger.remove()
+add_console_sink()
 
 # Add a custom level to the logger
 logger.level("SKIP", no=27, color="<light-black><bold>", icon="⏭️")
 logger.__class__.skip = partialmethod(logger.__class__.log, "SKIP")  # type: ignore
 logger.opt(colors=True)
+
+
+@contextmanager
+def capture_logs(level: str | int = 0) -> Generator[list[tuple[str, str]], None, None]:
+    """
+    Collect the log messages in a list of ``(level, message)`` tuples instead of emitting them.
+
+    This is meant to be used in worker processes: all the existing sinks are removed, so that the
+    messages can be sent back to the main process and emitted there with ``replay_logs``.
+
+    :param level: The minimum level of the messages to collect
+    :type level: str | int
+    """
+    records: list[tuple[str, str]] = []
+
+    def _sink(message: "Message") -> None:
+        record = message.record
+        text = record["message"]
+        if record["exception"] is not None:
+            text += "\n" + "".join(traceback.format_exception(*record["exception"])).rstrip()
+        records.append((record["level"].name, text))
+
+    logger.remove()
+    handler_id = logger.add(_sink, level=level, format="{message}")
+    try:
+        yield records
+    finally:
+        logger.remove(handler_id)
+
+
+def replay_logs(records: list[tuple[str, str]]) -> None:
+    """
+    Emit the log messages collected by ``capture_logs``.
+    """
+    for level, message in records:
+        logger.log(level, message)
@@ -0,0 +1,90 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, TextIO
+
+# The phases timed for each font, in the order they run
+PHASES = ("discovery", "load", "task", "compile", "write")
+
+METRICS_FIELDS = (
+    "file",
+    "failed",
+    "timed_out",
+    "size_in",
+    "size_out",
+    *PHASES,
+    "cpu_time",
+    "out_files",
+)
+
+
+class MetricsWriter:
+    """
+    Write one metrics record per processed font to a CSV or JSON lines file.
+
+    The format is chosen from the file extension: ``.csv`` files are written as CSV, any other
+    extension as JSON lines. Records are flushed as soon as they are written, so that the file can
+    be inspected while a long batch is still running.
+    """
+
+    def __init__(self, file: Path) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            file (Path): The output file. It is overwritten if it already exists.
+        """
+        file.parent.mkdir(parents=True, exist_ok=True)
+        self.file = file
+        # The file is closed by the close method
+        self._stream: TextIO = open(  # noqa: SIM115 # pylint: disable=consider-using-with
+            file, "w", encoding="utf-8", newline=""
+        )
+        self._csv_writer: csv.DictWriter | None = None
+        if file.suffix.lower() == ".csv":
+            self._csv_writer = csv.DictWriter(self._stream, fieldnames=METRICS_FIELDS)
+            self._csv_writer.writeheader()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """
+        Write a metrics record.
+
+        :param record: The record to write. The keys must be in ``METRICS_FIELDS``.
+        :type record: dict[str, Any]
+        """
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(
+                {
+                    key: ";".join(value) if isinstance(value, list) else value
+                    for key, value in record.items()
+                }
+            )
+        else:
+            self._stream.write(json.dumps(record) + "\n")
+        self._stream.flush()
+
+    def close(self) -> None:
+        """Close the output file."""
+        self._stream.close()
+
+
+def read_metrics(file: Path) -> list[dict[str, Any]]:
+    """
+    Read the records of a metrics file written by ``MetricsWriter``.
+
+    The values of the phases are returned as floats, also when they are read from a CSV file.
+
+    :param file: The metrics file
+    :type file: Path
+    :return: The metrics records
+    :rtype: list[dict[str, Any]]
+    """
+    with open(file, encoding="utf-8", newline="") as f:
+        if file.suffix.lower() == ".csv":
+            records: list[dict[str, Any]] = list(csv.DictReader(f))
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+    for record in records:
+        for phase in PHASES:
+            record[phase] = float(record.get(phase) or 0.0)
+    return records
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from foundrytools_cli.utils.cache import get_cache_dir, to_json
+
+# The maximum number of parameters of an SQLite query
+MAX_QUERY_KEYS = 500
+
+
+class OutlineCache:
+    """
+    An on-disk cache of the conversions of glyph outlines, shared by all the fonts.
+
+    Each record is keyed by the hash of an outline and of an identity describing the conversion,
+    like its options and the versions of the libraries that do it. It stores the result of the
+    conversion as JSON, so that the glyphs with the same outline, in the same font, in other fonts
+    of a family or in a later run, are converted only once.
+    """
+
+    def __init__(self, identity: dict[str, Any], cache_file: Path | None = None) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            identity (dict[str, Any]): The conversion options and the versions of the libraries.
+                Must be JSON serializable, sets and paths are allowed.
+            cache_file (Path, optional): The SQLite database file. Defaults to
+                ``outlines.sqlite3`` in the cache directory.
+        """
+        if cache_file is None:
+            cache_file = get_cache_dir() / "outlines.sqlite3"
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._identity = json.dumps(identity, sort_keys=True, default=to_json).encode("utf-8")
+        self._connection = sqlite3.connect(cache_file, timeout=30)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outlines (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def get_key(self, outline: str) -> str:
+        """
+        Get the key of an outline.
+
+        :param outline: A description of the outline, like the ``repr`` of the commands that draw
+            it, that is the same for the outlines converted the same way
+        :type outline: str
+        :return: The hexadecimal digest of the outline and of the identity
+        :rtype: str
+        """
+        digest = hashlib.sha256(self._identity)
+        digest.update(b"\0")
+        digest.update(outline.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Get the cached conversions of some outlines.
+
+        :param keys: The keys of the outlines (see ``get_key``)
+        :type keys: Iterable[str]
+        :return: The conversions found, by key. The missing keys are counted in ``misses``.
+        :rtype: dict[str, Any]
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: dict[str, Any] = {}
+        for start in range(0, len(unique_keys), MAX_QUERY_KEYS):
+            batch = unique_keys[start : start + MAX_QUERY_KEYS]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self._connection.execute(
+                f"SELECT key, value FROM outlines WHERE key IN ({placeholders})", batch
+            )
+            found.update((key, json.loads(value)) for key, value in rows)
+        self.hits += len(found)
+        self.misses += len(unique_keys) - len(found)
+        return found
+
+    def store(self, values: dict[str, Any]) -> None:
+        """
+        Store the conversions of some outlines, in a single transaction.
+
+        :param values: The conversions by key (see ``get_key``). Must be JSON serializable.
+        :type values: dict[str, Any]
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO outlines (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value)) for key, value in values.items()),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
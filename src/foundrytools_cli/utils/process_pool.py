@@ -0,0 +1,260 @@
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import Any, cast
+
+FORK_AVAILABLE = "fork" in multiprocessing.get_all_start_methods()
+
+
+class ProcessPoolError(Exception):
+    """Raised when a worker process fails to return a result"""
+
+
+class ProcessPoolTimeoutError(ProcessPoolError):
+    """Raised when a worker process is killed because it ran out of time"""
+
+
+class ProcessPool:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    Run a callable on a sequence of items in worker processes.
+
+    Each item is processed in its own child process, forked from the main process. Since nothing is
+    pickled on the way in, the callable can be a closure defined inside a command, or a bound
+    method of an object that holds one. Only the return values are sent back to the main process,
+    so they must be picklable.
+
+    At most ``jobs`` children run at the same time, and the results are yielded in the same order as
+    the items, regardless of which child finishes first. While the children are busy, up to
+    ``look_ahead`` items are read in advance from the input iterable, so that slow producers (like a
+    directory walk) run concurrently with the workers.
+
+    When ``max_weight`` is set, a new child is not started while the total ``weight`` of the items
+    being processed would exceed it. An item is always started when no other child is running, even
+    if its weight alone exceeds the limit.
+
+    When ``timeout`` is set, the children that run longer are killed, together with the processes
+    they started, and the item fails with a ``ProcessPoolTimeoutError``.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[Any], Any],
+        jobs: int,
+        error_handler: Callable[[Any, ProcessPoolError], Any] | None = None,
+        look_ahead: int = 0,
+        weight: Callable[[Any], int] | None = None,
+        max_weight: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            func (Callable): The callable to run in the worker processes.
+            jobs (int): The maximum number of worker processes running at the same time.
+            error_handler (Callable, optional): A callable that receives the item and the error when
+                a worker process fails, and returns the value to yield in place of the result. If
+                not provided, the error is raised.
+            look_ahead (int, optional): The maximum number of items to read in advance while the
+                worker processes are busy. Defaults to 0.
+            weight (Callable, optional): A callable that returns the weight of an item, like its
+                estimated memory usage. Required if ``max_weight`` is set.
+            max_weight (int, optional): The maximum total weight of the items processed at the
+                same time. If not provided, only the number of jobs is limited.
+            timeout (float, optional): The maximum time to process an item, in seconds. If not
+                provided, the items can run for any time.
+        """
+        if not FORK_AVAILABLE:
+            raise ProcessPoolError("Worker processes are not supported on this platform")
+
+        self.func = func
+        self.jobs = max(1, jobs)
+        self.error_handler = error_handler
+        self.look_ahead = look_ahead
+        self.weight = weight
+        self.max_weight = max_weight
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("fork")
+
+    def imap(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Lazily process the items, yielding the results in the same order as the items.
+
+        Args:
+            items (Iterable): The items to process. They are consumed only when a worker is free.
+
+        Yields:
+            Any: The value returned by ``func`` for each item.
+        """
+        pending = iter(items)
+        buffer: deque[tuple[Any, int]] = deque()
+        running: dict[Connection, _Task] = {}
+        finished: dict[int, Any] = {}
+        submitted = 0
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while len(running) < self.jobs:
+                    if not buffer and not exhausted:
+                        exhausted = not self._read_item(pending, buffer)
+                    if not buffer or not self._can_start(buffer[0], running):
+                        break
+                    item, item_weight = buffer.popleft()
+                    conn, task = self._start(submitted, item, item_weight)
+                    running[conn] = task
+                    submitted += 1
+
+                if not running:
+                    break
+
+                # Read ahead while all the workers are busy
+                ready = wait(list(running), timeout=0)
+                while not ready and not exhausted and len(buffer) < self.look_ahead:
+                    exhausted = not self._read_item(pending, buffer)
+                    ready = wait(list(running), timeout=0)
+
+                finished.update(self._collect_finished(running, ready))
+
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+        finally:
+            for conn, task in running.items():
+                self._terminate(task)
+                conn.close()
+
+    def _collect_finished(self, running: dict[Connection, "_Task"], ready: list) -> dict[int, Any]:
+        """
+        Collect the results of the workers that are ready, waiting for one if none is, and kill the
+        workers that timed out. The collected workers are removed from ``running``.
+        """
+        results: dict[int, Any] = {}
+        for ready_conn in ready or wait(list(running), timeout=self._get_wait(running)):
+            conn = cast(Connection, ready_conn)
+            task = running.pop(conn)
+            results[task.index] = self._collect(conn, task)
+        for conn in self._get_expired(running):
+            task = running.pop(conn)
+            results[task.index] = self._kill(conn, task)
+        return results
+
+    def _get_weight(self, item: Any) -> int:
+        if self.max_weight is None or self.weight is None:
+            return 0
+        return self.weight(item)
+
+    def _can_start(self, buffered: tuple[Any, int], running: dict[Connection, "_Task"]) -> bool:
+        if self.max_weight is None or not running:
+            return True
+        running_weight = sum(task.weight for task in running.values())
+        return running_weight + buffered[1] <= self.max_weight
+
+    def _get_wait(self, running: dict[Connection, "_Task"]) -> float | None:
+        """
+        Get how long to wait for a worker to finish before checking the timeouts.
+        """
+        if self.timeout is None:
+            return None
+        deadline = min(task.start_time for task in running.values()) + self.timeout
+        return max(0.0, deadline - time.monotonic())
+
+    def _get_expired(self, running: dict[Connection, "_Task"]) -> list[Connection]:
+        if self.timeout is None:
+            return []
+        now = time.monotonic()
+        return [
+            conn
+            for conn, task in running.items()
+            if now - task.start_time >= self.timeout and not conn.poll()
+        ]
+
+    def _read_item(self, pending: Iterator[Any], buffer: deque[tuple[Any, int]]) -> bool:
+        try:
+            item = next(pending)
+        except StopIteration:
+            return False
+        buffer.append((item, self._get_weight(item)))
+        return True
+
+    def _start(self, index: int, item: Any, weight: int) -> tuple[Connection, "_Task"]:
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=self._work, args=(sender, item))
+        process.start()
+        sender.close()
+        return receiver, _Task(index, item, process, weight, time.monotonic())
+
+    def _work(self, conn: Connection, item: Any) -> None:
+        if self.timeout is not None:
+            # Start a process group, so that the external tools started by the worker are killed
+            # with it when it times out
+            os.setpgid(0, 0)
+        try:
+            conn.send((True, self.func(item)))
+        except BaseException as e:  # pylint: disable=broad-except
+            conn.send((False, ProcessPoolError(f"{type(e).__name__}: {e}")))
+        finally:
+            conn.close()
+
+    def _collect(self, conn: Connection, task: "_Task") -> Any:
+        try:
+            success, value = conn.recv()
+        except EOFError:
+            success = False
+            value = None
+        finally:
+            conn.close()
+            task.process.join()
+
+        if success:
+            return value
+
+        error = value or ProcessPoolError(
+            f"Worker process exited unexpectedly with code {task.process.exitcode}"
+        )
+        return self._handle_error(task.item, error)
+
+    def _terminate(self, task: "_Task") -> None:
+        if self.timeout is None:
+            task.process.terminate()
+        else:
+            # The worker is in its own process group, that doesn't receive the signals of the
+            # terminal, so the processes it started are killed too
+            try:
+                os.killpg(cast(int, task.process.pid), signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                # The worker hasn't started its process group yet
+                task.process.kill()
+        task.process.join()
+
+    def _kill(self, conn: Connection, task: "_Task") -> Any:
+        self._terminate(task)
+        conn.close()
+        return self._handle_error(
+            task.item, ProcessPoolTimeoutError(f"Timed out after {self.timeout:g} seconds")
+        )
+
+    def _handle_error(self, item: Any, error: ProcessPoolError) -> Any:
+        if self.error_handler is None:
+            raise error
+        return self.error_handler(item, error)
+
+
+@dataclass
+class _Task:
+    """
+    An item being processed by a worker process.
+    """
+
+    index: int
+    item: Any
+    process: BaseProcess
+    weight: int
+    start_time: float
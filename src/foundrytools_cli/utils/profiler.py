@@ -0,0 +1,123 @@
+import cProfile
+import hashlib
+import pstats
+from collections import defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Call paths whose time is lower than this value (in seconds) are not written to collapsed stacks
+MIN_STACK_TIME = 1e-6
+
+# The pstats key of a function: (file name, line number, function name)
+FunctionKey = tuple[str, int, str]
+
+
+def get_profile_file(profile_dir: Path, file: Path) -> Path:
+    """
+    Get the path of the profile of a font file.
+
+    A short hash of the full path is added to the file name, so that fonts with the same name in
+    different directories don't overwrite each other's profile.
+
+    :param profile_dir: The directory where the profiles are saved
+    :type profile_dir: Path
+    :param file: The font file
+    :type file: Path
+    :return: The profile file
+    :rtype: Path
+    """
+    path_hash = hashlib.sha1(str(file).encode("utf-8"), usedforsecurity=False).hexdigest()[:8]
+    return profile_dir / f"{file.name}.{path_hash}.prof"
+
+
+@contextmanager
+def profile(out_file: Path | None, stacks: bool = False) -> Generator[None, None, None]:
+    """
+    Profile the code run in the context, and save the stats to ``out_file``.
+
+    :param out_file: The file where the ``pstats`` data are saved. If ``None``, nothing is profiled.
+    :type out_file: Path | None
+    :param stacks: Whether to also save the collapsed stacks next to the stats file, with the
+        ``.collapsed`` extension.
+    :type stacks: bool
+    """
+    if out_file is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        out_file.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(out_file)
+        if stacks:
+            write_collapsed_stacks(pstats.Stats(profiler), out_file.with_suffix(".collapsed"))
+
+
+def write_collapsed_stacks(stats: pstats.Stats, out_file: Path) -> None:
+    """
+    Write the stats in the collapsed stacks format read by ``flamegraph.pl``, speedscope and other
+    flame graph viewers. Each line contains a call path and its own time, in microseconds.
+
+    :param stats: The stats to write
+    :type stats: pstats.Stats
+    :param out_file: The output file
+    :type out_file: Path
+    """
+    with open(out_file, "w", encoding="utf-8") as f:
+        for stack, seconds in get_collapsed_stacks(stats).items():
+            if (microseconds := round(seconds * 1_000_000)) > 0:
+                f.write(f"{stack} {microseconds}\n")
+
+
+def get_collapsed_stacks(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Get the own time of each call path, in seconds.
+
+    ``cProfile`` only records the caller/callee pairs, not the full call paths. The time of a
+    function called from several paths is split among them in proportion to the time spent in each
+    call, as flameprof and gprof2dot do, so the result is an approximation.
+
+    :param stats: The profile stats
+    :type stats: pstats.Stats
+    :return: A dictionary mapping the call paths, separated by semicolons, to their own time
+    :rtype: dict[str, float]
+    """
+    raw_stats = stats.stats  # type: ignore[attr-defined]
+    callees: dict[FunctionKey, dict[FunctionKey, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in raw_stats.items():
+        for caller, (_, _, _, caller_cumtime) in callers.items():
+            callees[caller][func] = caller_cumtime
+
+    stacks: dict[str, float] = defaultdict(float)
+
+    def _walk(func: FunctionKey, path: list[FunctionKey], share: float) -> None:
+        path = [*path, func]
+        own_time = raw_stats[func][2] * share
+        if own_time >= MIN_STACK_TIME:
+            stacks[";".join(_get_label(f) for f in path)] += own_time
+        for callee, cumtime in callees[func].items():
+            callee_cumtime = raw_stats[callee][3]
+            if callee in path or callee_cumtime <= 0:
+                continue
+            callee_share = share * cumtime / callee_cumtime
+            if callee_cumtime * callee_share >= MIN_STACK_TIME:
+                _walk(callee, path, callee_share)
+
+    for func, (_, _, _, _, callers) in raw_stats.items():
+        if not callers:
+            _walk(func, [], 1.0)
+
+    return stacks
+
+
+def _get_label(func: FunctionKey) -> str:
+    file_name, line, name = func
+    if file_name == "~":
+        # Built-in functions
+        return name.replace(";", ",")
+    return f"{name} ({Path(file_name).name}:{line})".replace(";", ",")
@@ -0,0 +1,191 @@
+from typing import TYPE_CHECKING
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    ProgressColumn,
+    Task,
+    TaskID,
+    TextColumn,
+    TimeRemainingColumn,
+)
+from rich.text import Text
+
+from foundrytools_cli.utils import SIZE_UNITS
+from foundrytools_cli.utils.logger import add_console_sink, get_console_level, logger
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+# While the progress is displayed, only the messages at this level or above are printed
+PROGRESS_LOG_LEVEL = "WARNING"
+
+
+class _ThroughputColumn(ProgressColumn):
+    """
+    Render the fonts processed per second and the megabytes of input processed per second. A
+    megabyte is 1024 KB, like in ``SIZE_UNITS``.
+    """
+
+    def render(self, task: Task) -> Text:
+        elapsed = task.elapsed or 0.0
+        if not elapsed:
+            return Text("-- fonts/s  -- MB/s", style="progress.data.speed")
+        fonts_per_second = task.fields["processed"] / elapsed
+        mb_per_second = task.fields["bytes"] / elapsed / SIZE_UNITS["M"]
+        return Text(
+            f"{fonts_per_second:.1f} fonts/s  {mb_per_second:.1f} MB/s",
+            style="progress.data.speed",
+        )
+
+
+class _TimeRemainingColumn(TimeRemainingColumn):
+    """
+    Render the estimated time remaining, once all the files of the run are found.
+    """
+
+    def render(self, task: Task) -> Text:
+        if task.fields["discovering"]:
+            return Text("-:--:--", style="progress.remaining")
+        return super().render(task)
+
+
+class _OutcomeColumn(ProgressColumn):
+    """
+    Render the number of fonts that failed and that were skipped.
+    """
+
+    def render(self, task: Task) -> Text:
+        text = Text()
+        text.append(f"{task.fields['failed']} failed", style="red" if task.fields["failed"] else "")
+        text.append(f"  {task.fields['skipped']} skipped", style="bright_black")
+        return text
+
+
+class RunProgress:
+    """
+    A live display of the progress of one or more runs, with the throughput, the fonts that failed
+    or were skipped, and the estimated time remaining.
+
+    While the display is active, the log messages below ``PROGRESS_LOG_LEVEL`` are not printed to
+    the console, and the other messages are printed above the display.
+    """
+
+    def __init__(self, console: Console | None = None) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            console (Console, optional): The console to display the progress on. Defaults to a
+                console writing to the standard error.
+        """
+        self.progress = Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(bar_width=20),
+            MofNCompleteColumn(),
+            _ThroughputColumn(),
+            _OutcomeColumn(),
+            _TimeRemainingColumn(),
+            console=console or Console(stderr=True),
+            redirect_stdout=False,
+            redirect_stderr=False,
+        )
+
+    def start(self) -> None:
+        """Start the display, and print the log messages above it."""
+        self.progress.start()
+        level = max(PROGRESS_LOG_LEVEL, get_console_level(), key=lambda name: logger.level(name).no)
+        add_console_sink(self._print_message, level=level)
+
+    def stop(self) -> None:
+        """Stop the display, and print the log messages to the standard error again."""
+        add_console_sink()
+        self.progress.stop()
+
+    def add_task(self, description: str, total: int | None) -> TaskID:
+        """
+        Add a run to the display.
+
+        :param description: The description of the run
+        :type description: str
+        :param total: The number of files of the run, or ``None`` if they are still being found
+            (see ``add_found`` and ``finish_discovery``)
+        :type total: int | None
+        :return: The id of the run, to be passed to the other methods
+        :rtype: TaskID
+        """
+        return self.progress.add_task(
+            description,
+            total=total,
+            processed=0,
+            bytes=0,
+            failed=0,
+            skipped=0,
+            discovering=total is None,
+        )
+
+    def add_found(self, task_id: TaskID) -> None:
+        """
+        Count a file found by a run whose number of files was unknown when it started.
+
+        :param task_id: The id of the run
+        :type task_id: TaskID
+        """
+        total = next(task.total for task in self.progress.tasks if task.id == task_id)
+        self.progress.update(task_id, total=(total or 0) + 1)
+
+    def finish_discovery(self, task_id: TaskID) -> None:
+        """
+        Mark all the files of a run as found, to show the estimated time remaining.
+
+        :param task_id: The id of the run
+        :type task_id: TaskID
+        """
+        task = next(task for task in self.progress.tasks if task.id == task_id)
+        self.progress.update(task_id, total=task.total or 0, discovering=False)
+
+    def add_processed(self, task_id: TaskID, size: int, failed: bool) -> None:
+        """
+        Count a font that was processed.
+
+        :param task_id: The id of the run
+        :type task_id: TaskID
+        :param size: The size of the input file, in bytes
+        :type size: int
+        :param failed: Whether processing the font failed
+        :type failed: bool
+        """
+        fields = self._get_fields(task_id)
+        self.progress.update(
+            task_id,
+            advance=1,
+            processed=fields["processed"] + 1,
+            bytes=fields["bytes"] + size,
+            failed=fields["failed"] + failed,
+        )
+
+    def add_skipped(self, task_id: TaskID) -> None:
+        """
+        Count a font that was skipped, since it was processed by a previous run.
+
+        :param task_id: The id of the run
+        :type task_id: TaskID
+        """
+        self.progress.update(task_id, advance=1, skipped=self._get_fields(task_id)["skipped"] + 1)
+
+    def add_ignored(self, task_id: TaskID) -> None:
+        """
+        Count a file that is not a font, or that is filtered out.
+
+        :param task_id: The id of the run
+        :type task_id: TaskID
+        """
+        self.progress.advance(task_id)
+
+    def _get_fields(self, task_id: TaskID) -> dict:
+        return next(task.fields for task in self.progress.tasks if task.id == task_id)
+
+    def _print_message(self, message: "Message") -> None:
+        self.progress.console.print(Text.from_ansi(str(message).rstrip("\n")))
@@ -0,0 +1,65 @@
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+# Put in the queue after the last item
+_DONE = object()
+
+
+class _Error:
+    """An exception raised by the iterable, to raise again in the consumer."""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+def read_ahead(
+    items: Iterable[_T],
+    on_item: Callable[[_T], None] | None = None,
+    on_done: Callable[[], None] | None = None,
+) -> Iterator[_T]:
+    """
+    Iterate over some items in a background thread, ahead of the caller, so that slow producers
+    like a directory walk are not paced by the consumer.
+
+    The exceptions raised by ``items`` are raised again by the returned iterator. If the caller
+    stops early, the background thread stops at the next item.
+
+    :param items: The items to iterate over
+    :type items: Iterable[_T]
+    :param on_item: A function called in the background thread with each item, as soon as it is
+        produced
+    :type on_item: Callable[[_T], None] | None
+    :param on_done: A function called in the background thread after the last item
+    :type on_done: Callable[[], None] | None
+    :return: The items, in the same order
+    :rtype: Iterator[_T]
+    """
+    buffer: queue.SimpleQueue[Any] = queue.SimpleQueue()
+    stopped = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if stopped.is_set():
+                    return
+                if on_item is not None:
+                    on_item(item)
+                buffer.put(item)
+            if on_done is not None:
+                on_done()
+        except Exception as e:  # pylint: disable=broad-except
+            buffer.put(_Error(e))
+        buffer.put(_DONE)
+
+    threading.Thread(target=produce, name="ftcli-read-ahead", daemon=True).start()
+    try:
+        while (item := buffer.get()) is not _DONE:
+            if isinstance(item, _Error):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
@@ -0,0 +1,132 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from foundrytools_cli.utils.cache import IncrementalCache
+from foundrytools_cli.utils.journal import COMPLETED, FAILED, TIMED_OUT, ResumeJournal
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.metrics import PHASES, MetricsWriter
+
+if TYPE_CHECKING:
+    from foundrytools_cli.utils.task_runner import FontResult
+
+
+def get_status(result: "FontResult") -> str:
+    """
+    Get the status of a processed font in the resume journal.
+
+    :param result: The result of the font
+    :type result: FontResult
+    :return: ``TIMED_OUT``, ``FAILED`` or ``COMPLETED``
+    :rtype: str
+    """
+    if result.timed_out:
+        return TIMED_OUT
+    return FAILED if result.failed else COMPLETED
+
+
+def get_metrics(result: "FontResult") -> dict[str, Any]:
+    """
+    Get the metrics record of a processed font.
+
+    :param result: The result of the font
+    :type result: FontResult
+    :return: The record, with the keys in ``METRICS_FIELDS``
+    :rtype: dict[str, Any]
+    """
+    return {
+        "file": str(result.file),
+        "failed": result.failed,
+        "timed_out": result.timed_out,
+        "size_in": result.size_in,
+        "size_out": sum(f.stat().st_size for f in result.out_files if f.is_file()),
+        **{phase: round(result.timings.get(phase, 0.0), 6) for phase in PHASES},
+        "cpu_time": round(result.cpu_time, 6),
+        "out_files": [str(f) for f in result.out_files],
+    }
+
+
+class RunRecorder:
+    """
+    Record the results of a run in the incremental cache, the resume journal and the metrics file,
+    each one if requested, and skip the fonts already processed according to them.
+    """
+
+    def __init__(
+        self,
+        get_identity: Callable[[], dict[str, Any]] | None = None,
+        incremental: bool = False,
+        resume: Path | None = None,
+        metrics_out: Path | None = None,
+    ) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            get_identity (Callable, optional): Describe the command and the options that affect
+                the output. Required with ``incremental`` and ``resume``.
+            incremental (bool): Whether the fonts unchanged since they were processed are skipped.
+            resume (Path, optional): The journal of the fonts processed by the previous runs.
+            metrics_out (Path, optional): The file to write the metrics of each font to.
+        """
+        identity = get_identity() if get_identity is not None else {}
+        self._cache = IncrementalCache(identity=identity) if incremental else None
+        self._journal = ResumeJournal(resume, identity=identity) if resume is not None else None
+        self._metrics = MetricsWriter(metrics_out) if metrics_out is not None else None
+
+    @property
+    def has_skipped(self) -> bool:
+        """
+        Whether some fonts were skipped, since they were processed before.
+        """
+        return bool(
+            (self._cache is not None and self._cache.hits)
+            or (self._journal is not None and self._journal.hits)
+        )
+
+    def is_done(self, file: Path) -> bool:
+        """
+        Check whether a font is unchanged since it was processed, or was completed by a previous
+        run.
+
+        :param file: The font file
+        :type file: Path
+        :return: ``True`` if the font can be skipped, ``False`` otherwise
+        :rtype: bool
+        """
+        return (self._cache is not None and self._cache.is_up_to_date(file)) or (
+            self._journal is not None and self._journal.is_completed(file)
+        )
+
+    def record(self, result: "FontResult") -> None:
+        """
+        Record the result of a processed font.
+
+        :param result: The result of the font
+        :type result: FontResult
+        """
+        if self._cache is not None and result.file is not None and not result.failed:
+            self._cache.store(result.file, result.out_files)
+        if self._journal is not None and result.file is not None:
+            self._journal.record(result.file, get_status(result), result.out_files)
+        if self._metrics is not None:
+            self._metrics.write(get_metrics(result))
+
+    def close(self) -> None:
+        """
+        Close the metrics file, the incremental cache and the journal, logging how many fonts were
+        skipped.
+        """
+        if self._metrics is not None:
+            self._metrics.close()
+            self._metrics = None
+
+        if self._cache is not None:
+            logger.skip(f"{self._cache.hits} unchanged fonts skipped")  # type: ignore
+            self._cache.close()
+            self._cache = None
+
+        if self._journal is not None:
+            logger.skip(f"{self._journal.hits} completed fonts skipped")  # type: ignore
+            self._journal.close()
+            self._journal = None
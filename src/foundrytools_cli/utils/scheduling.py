@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from foundrytools_cli.utils.metrics import PHASES, read_metrics
+
+# The decompiled size of a font is estimated as a multiple of its file size. WOFF and WOFF2 files
+# are compressed, so they are expanded more.
+SFNT_MEMORY_FACTOR = 8
+WEB_FONT_MEMORY_FACTOR = 24
+WEB_FONT_SIGNATURES = (b"wOFF", b"wOF2")
+
+
+def estimate_memory(file: Path) -> int:
+    """
+    Estimate the memory used to decompile and process a font, from its file size and format.
+
+    :param file: The font file
+    :type file: Path
+    :return: The estimated memory, in bytes
+    :rtype: int
+    """
+    with open(file, "rb") as f:
+        signature = f.read(4)
+    factor = WEB_FONT_MEMORY_FACTOR if signature in WEB_FONT_SIGNATURES else SFNT_MEMORY_FACTOR
+    return file.stat().st_size * factor
+
+
+def load_timings(metrics_file: Path) -> dict[str, float]:
+    """
+    Read the processing time of each font from a metrics file written by ``--metrics-out``.
+
+    The discovery phase runs in the main process and is not included.
+
+    :param metrics_file: The metrics file
+    :type metrics_file: Path
+    :return: A dictionary mapping the font paths to their processing time, in seconds
+    :rtype: dict[str, float]
+    """
+    return {
+        record["file"]: sum(record[phase] for phase in PHASES if phase != "discovery")
+        for record in read_metrics(metrics_file)
+    }
+
+
+def sort_longest_first(files: list[Path], timings: dict[str, float] | None = None) -> list[Path]:
+    """
+    Sort the files by their estimated processing time, longest first, so that the slowest fonts
+    don't start last and leave the other workers idle.
+
+    The processing time is read from ``timings`` when available. Otherwise, it is estimated from
+    the file size, with the average time per byte of the fonts that have timings, or the file size
+    itself is used if no timings are available.
+
+    :param files: The files to sort
+    :type files: list[Path]
+    :param timings: The past processing time of the fonts, as returned by ``load_timings``
+    :type timings: dict[str, float] | None
+    :return: The sorted files
+    :rtype: list[Path]
+    """
+    sizes = {file: file.stat().st_size for file in files}
+    timings = timings or {}
+    timed = [file for file in files if str(file) in timings]
+    timed_size = sum(sizes[file] for file in timed)
+    time_per_byte = sum(timings[str(file)] for file in timed) / timed_size if timed_size else 1.0
+
+    def _cost(file: Path) -> float:
+        return timings.get(str(file), sizes[file] * time_per_byte)
+
+    return sorted(files, key=_cost, reverse=True)
@@ -0,0 +1,162 @@
+import hashlib
+import heapq
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+SHARD_BY_HASH = "hash"
+SHARD_BY_SIZE = "size"
+
+
+def get_shard_index(relative_path: str, count: int) -> int:
+    """
+    Get the shard of a file from a stable hash of its relative path, so that the same file goes
+    to the same shard on every machine and in every run.
+
+    :param relative_path: The path of the file relative to the input directory, in POSIX form
+    :type relative_path: str
+    :param count: The number of shards
+    :type count: int
+    :return: The 0-based index of the shard
+    :rtype: int
+    """
+    digest = hashlib.sha1(relative_path.encode("utf-8"), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def get_size_shards(sizes: dict[str, int], count: int) -> dict[str, int]:
+    """
+    Split the files in shards of roughly the same total size.
+
+    The files are assigned from the largest to the smallest to the shard with the smallest total
+    size so far. Ties are broken by path and by shard index, so the result only depends on the
+    files and on their sizes.
+
+    :param sizes: The size of each file, by relative path
+    :type sizes: dict[str, int]
+    :param count: The number of shards
+    :type count: int
+    :return: The 0-based shard index of each file, by relative path
+    :rtype: dict[str, int]
+    """
+    bins = [(0, index) for index in range(count)]
+    shards: dict[str, int] = {}
+    for path in sorted(sizes, key=lambda p: (-sizes[p], p)):
+        total, index = heapq.heappop(bins)
+        shards[path] = index
+        heapq.heappush(bins, (total + sizes[path], index))
+    return shards
+
+
+def select_shard(
+    files: Iterable[Path],
+    base_dir: Path,
+    shard: tuple[int, int],
+    sizes: dict[Path, int] | None = None,
+) -> Iterator[Path]:
+    """
+    Select the files of a shard.
+
+    Running all the shards of the same input covers every file exactly once, without any
+    coordination between the runs.
+
+    :param files: The files to split
+    :type files: Iterable[Path]
+    :param base_dir: The directory the paths are made relative to
+    :type base_dir: Path
+    :param shard: The 1-based index of the shard and the number of shards
+    :type shard: tuple[int, int]
+    :param sizes: The size of each file in a snapshot of the input, like an index. If given, the
+        files are split in shards of roughly the same total size, and the files that are not in the
+        snapshot are split by hash. The sizes must not be read from the files themselves: the files
+        overwritten by a shard would change the shards of the next runs.
+    :type sizes: dict[Path, int] | None
+    :return: The files of the shard, in the same order as ``files``
+    :rtype: Iterator[Path]
+    """
+    index, count = shard
+    size_shards = (
+        get_size_shards(
+            {_get_relative_path(file, base_dir): size for file, size in sizes.items()}, count
+        )
+        if sizes is not None
+        else {}
+    )
+    for file in files:
+        relative_path = _get_relative_path(file, base_dir)
+        file_shard = size_shards.get(relative_path)
+        if file_shard is None:
+            file_shard = get_shard_index(relative_path, count)
+        if file_shard == index - 1:
+            yield file
+
+
+class ShardSelector:  # pylint: disable=too-few-public-methods
+    """
+    Select the files of a shard of a run, split by hash or by the sizes in an index.
+    """
+
+    def __init__(
+        self,
+        shard: tuple[int, int],
+        input_path: Path,
+        by: str = SHARD_BY_HASH,
+        index: Path | None = None,
+        recursive: bool = False,
+        where: str | None = None,
+    ) -> None:
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            shard (tuple[int, int]): The 1-based index of the shard and the number of shards.
+            input_path (Path): The input path of the run. The paths of the files are made relative
+                to it, or to its parent if it is a file.
+            by (str): How the files are split, ``SHARD_BY_HASH`` or ``SHARD_BY_SIZE``.
+            index (Path, optional): The index to read the sizes of the files from.
+            recursive (bool): Whether the sizes of the files in the subdirectories are read.
+            where (str, optional): The condition the files of the index must meet.
+        """
+        self.shard = shard
+        self.input_path = input_path
+        self.by = by
+        self.index = index
+        self.recursive = recursive
+        self.where = where
+
+    def __str__(self) -> str:
+        return f"{self.shard[0]}/{self.shard[1]}"
+
+    def select(self, files: Iterable[Path]) -> Iterator[Path]:
+        """
+        Select the files of the shard.
+
+        :param files: The files of the run
+        :type files: Iterable[Path]
+        :return: The files of the shard, in the same order as ``files``
+        :rtype: Iterator[Path]
+        :raises FontIndexError: If the files are split by size without an index
+        """
+        base_dir = self.input_path if self.input_path.is_dir() else self.input_path.parent
+        sizes = self._get_indexed_sizes() if self.by == SHARD_BY_SIZE else None
+        return select_shard(files, base_dir, self.shard, sizes=sizes)
+
+    def _get_indexed_sizes(self) -> dict[Path, int]:
+        """
+        Get the sizes of the fonts of the input path from the index, to split them by size. The
+        sizes of the files on disk change when a shard overwrites them.
+        """
+        # The constants of this module are imported at startup, when the fonts are not needed
+        # pylint: disable=import-outside-toplevel
+        from foundrytools_cli.utils.font_index import FontIndex, FontIndexError
+
+        if self.index is None:
+            raise FontIndexError("Splitting the files by size requires an index")
+        index = FontIndex(self.index, read_only=True)
+        try:
+            return index.get_sizes(self.input_path, recursive=self.recursive, where=self.where)
+        finally:
+            index.close()
+
+
+def _get_relative_path(file: Path, base_dir: Path) -> str:
+    return file.relative_to(base_dir).as_posix()
@@ -0,0 +1,148 @@
+import struct
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fontTools.ttLib import TTLibError
+from fontTools.ttLib.woff2 import WOFF2DirectoryEntry, woff2DirectoryEntryMaxSize
+from foundrytools.constants import (
+    PS_SFNT_VERSION,
+    T_FVAR,
+    TT_SFNT_VERSION,
+    WOFF2_FLAVOR,
+    WOFF_FLAVOR,
+)
+
+# The sfnt versions accepted by fontTools
+SFNT_VERSIONS = (TT_SFNT_VERSION, PS_SFNT_VERSION, "true")
+WOFF_SIGNATURE = b"wOFF"
+WOFF2_SIGNATURE = b"wOF2"
+
+# The size of the header and of each table record, and the offset of the number of tables in the
+# header, of each flavor
+SFNT_HEADER_SIZE, SFNT_ENTRY_SIZE, SFNT_NUM_TABLES_OFFSET = 12, 16, 4
+WOFF_HEADER_SIZE, WOFF_ENTRY_SIZE, WOFF_NUM_TABLES_OFFSET = 44, 20, 12
+WOFF2_HEADER_SIZE, WOFF2_NUM_TABLES_OFFSET = 48, 12
+
+
+@dataclass(frozen=True)
+class FontSignature:
+    """
+    The type of a font file, read from its header and its table directory.
+
+    The properties have the same names and meaning as the ones of ``Font``, so that a
+    ``FinderFilter`` can be applied without loading the font (see ``is_filtered_out``).
+    """
+
+    sfnt_version: str
+    flavor: str | None
+    tags: frozenset[str]
+
+    @property
+    def is_ps(self) -> bool:
+        """``True`` if the font has PostScript outlines."""
+        return self.sfnt_version == PS_SFNT_VERSION
+
+    @property
+    def is_tt(self) -> bool:
+        """``True`` if the font has TrueType outlines."""
+        return self.sfnt_version == TT_SFNT_VERSION
+
+    @property
+    def is_woff(self) -> bool:
+        """``True`` if the font is a WOFF font."""
+        return self.flavor == WOFF_FLAVOR
+
+    @property
+    def is_woff2(self) -> bool:
+        """``True`` if the font is a WOFF2 font."""
+        return self.flavor == WOFF2_FLAVOR
+
+    @property
+    def is_sfnt(self) -> bool:
+        """``True`` if the font is an SFNT font."""
+        return self.flavor is None
+
+    @property
+    def is_static(self) -> bool:
+        """``True`` if the font has no ``fvar`` table."""
+        return T_FVAR not in self.tags
+
+    @property
+    def is_variable(self) -> bool:
+        """``True`` if the font has a ``fvar`` table."""
+        return T_FVAR in self.tags
+
+
+def sniff_font(file: Path | BinaryIO) -> FontSignature | None:
+    """
+    Read the type of a font file from its header and its table directory, without parsing any
+    table.
+
+    Font collections are not recognized, since they are not processed as single fonts.
+
+    :param file: The file to read, or a stream of its data positioned at its start
+    :type file: Path | BinaryIO
+    :return: The type of the font, or ``None`` if the file is not a font or can't be read
+    :rtype: FontSignature | None
+    """
+    try:
+        with open(file, "rb") if isinstance(file, Path) else nullcontext(file) as f:
+            header = f.read(WOFF2_HEADER_SIZE)
+            signature = header[:4]
+            if signature == WOFF_SIGNATURE:
+                flavor = WOFF_FLAVOR
+                num_tables = _read_num_tables(header, WOFF_NUM_TABLES_OFFSET)
+                sfnt_version = header[4:8]
+                directory = _read_at(f, WOFF_HEADER_SIZE, num_tables * WOFF_ENTRY_SIZE)
+                tags = _read_tags(directory, num_tables, WOFF_ENTRY_SIZE)
+            elif signature == WOFF2_SIGNATURE:
+                flavor = WOFF2_FLAVOR
+                num_tables = _read_num_tables(header, WOFF2_NUM_TABLES_OFFSET)
+                sfnt_version = header[4:8]
+                directory = _read_at(
+                    f, WOFF2_HEADER_SIZE, num_tables * woff2DirectoryEntryMaxSize, exact=False
+                )
+                tags = _read_woff2_tags(directory, num_tables)
+            else:
+                flavor = None
+                num_tables = _read_num_tables(header, SFNT_NUM_TABLES_OFFSET)
+                sfnt_version = signature
+                directory = _read_at(f, SFNT_HEADER_SIZE, num_tables * SFNT_ENTRY_SIZE)
+                tags = _read_tags(directory, num_tables, SFNT_ENTRY_SIZE)
+    except (OSError, struct.error, TTLibError):
+        return None
+
+    version = sfnt_version.decode("latin-1")
+    if version not in SFNT_VERSIONS:
+        return None
+    return FontSignature(sfnt_version=version, flavor=flavor, tags=tags)
+
+
+def _read_num_tables(header: bytes, offset: int) -> int:
+    return int(struct.unpack_from(">H", header, offset)[0])
+
+
+def _read_at(f: BinaryIO, offset: int, size: int, exact: bool = True) -> bytes:
+    f.seek(offset)
+    data = f.read(size)
+    if exact and len(data) < size:
+        raise TTLibError("Truncated table directory")
+    return data
+
+
+def _read_tags(directory: bytes, num_tables: int, entry_size: int) -> frozenset[str]:
+    return frozenset(
+        directory[i * entry_size : i * entry_size + 4].decode("latin-1") for i in range(num_tables)
+    )
+
+
+def _read_woff2_tags(directory: bytes, num_tables: int) -> frozenset[str]:
+    # The entries of the WOFF2 table directory have a variable size
+    tags = set()
+    for _ in range(num_tables):
+        entry = WOFF2DirectoryEntry()
+        directory = entry.fromString(directory)
+        tags.add(str(entry.tag))
+    return frozenset(tags)
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from foundrytools import Font
+from foundrytools.lib.font_finder import FinderFilter
+
+from foundrytools_cli.utils.logger import logger
+from foundrytools_cli.utils.task_runner import TaskRunner, is_filtered_out
+
+
+@dataclass
+class ChainStep:
+    """
+    A command of a chain, with the TaskRunner created by the command.
+    """
+
+    name: str
+    runner: TaskRunner
+
+
+class TaskChain(TaskRunner):  # pylint: disable=too-few-public-methods
+    """
+    A TaskRunner that applies the tasks of several commands to each font, in order.
+
+    Each font is loaded only once, and it is saved only once if any of the tasks reported a
+    modification. Fonts are searched with the filters shared by all the steps, then each step is
+    skipped for the fonts that its own filter would exclude.
+
+    The last step may be a command that saves the fonts by itself (like the converters). In that
+    case, the chain doesn't save the fonts.
+    """
+
+    def __init__(self, input_path: Path, steps: list[ChainStep], **options: dict[str, Any]):
+        """
+        Initialize a new instance of the class.
+
+        Args:
+            input_path (Path): The input path to search for fonts.
+            steps (list[ChainStep]): The steps to apply to each font.
+            **options (Dict[str, Any]): A dictionary containing the options to be parsed.
+        """
+        super().__init__(input_path=input_path, task=self._run_steps, **options)
+        self.steps = steps
+
+        for flag in fields(FinderFilter):
+            setattr(
+                self.filter,
+                flag.name,
+                all(getattr(step.runner.filter, flag.name) for step in steps),
+            )
+
+        self.depends_on_file_name = any(step.runner.depends_on_file_name for step in steps)
+        if steps and not steps[-1].runner.save_if_modified:
+            self.save_if_modified = False
+
+        # A step may require the fonts to be processed in the main process
+        if any(step.runner.config.runner_options.jobs == 1 for step in steps):
+            self.config.runner_options.jobs = 1
+        if any(step.runner.config.runner_options.timeout is None for step in steps):
+            self.config.runner_options.timeout = None
+        if any(step.runner.config.runner_options.verbose for step in steps):
+            self.config.runner_options.verbose = True
+
+    def _get_identity(self) -> dict[str, Any]:
+        identity = super()._get_identity()
+        identity["steps"] = [
+            {"name": step.name, "task_options": step.runner.config.task_options}
+            for step in self.steps
+        ]
+        return identity
+
+    def _run_steps(self, font: Font) -> Any:
+        modified = False
+        for step in self.steps:
+            if is_filtered_out(font, step.runner.filter):
+                logger.skip(f"{step.name}: skipped")  # type: ignore
+                continue
+
+            logger.opt(colors=True).info(f"Running <cyan>{step.name}</>")
+            result = step.runner.task(font, **step.runner.config.task_options)
+            if not step.runner.save_if_modified:
+                # The last step saved the font, return the files it has written
+                return result
+            modified = modified or step.runner.force_modified or bool(result)
+        return modified
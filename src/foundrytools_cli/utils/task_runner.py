@@ -1,8 +1,16 @@
-from collections.abc import Callable
-from dataclasses import dataclass
+import itertools
+import os
+import pstats
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from io import BytesIO
 from pathlib import Path
-from typing import Any, get_type_hints
+from typing import Any, ClassVar, TypeVar, get_type_hints
 
+import click
+from fontTools.ttLib import TTLibError
 from foundrytools import Font
 from foundrytools.lib.font_finder import (
     FinderError,
@@ -10,9 +18,71 @@ from foundrytools.lib.font_finder import (
     FinderOptions,
     FontFinder,
 )
-
-from foundrytools_cli.utils.logger import logger
-from foundrytools_cli.utils.timer import Timer
+from rich.progress import TaskID
+
+from foundrytools_cli import VERSION
+from foundrytools_cli.utils.archives import (
+    ArchiveError,
+    ArchiveMember,
+    ArchiveSession,
+    is_archive,
+    is_font_member,
+)
+from foundrytools_cli.utils.duplicates import DuplicateSkipper
+from foundrytools_cli.utils.fast_save import can_fast_save, fast_save
+from foundrytools_cli.utils.font_index import FontIndex, FontIndexError
+from foundrytools_cli.utils.journal import write_atomic
+from foundrytools_cli.utils.logger import (
+    capture_logs,
+    get_min_level,
+    is_console_structured,
+    logger,
+    replay_logs,
+)
+from foundrytools_cli.utils.process_pool import (
+    FORK_AVAILABLE,
+    ProcessPool,
+    ProcessPoolError,
+    ProcessPoolTimeoutError,
+)
+from foundrytools_cli.utils.profiler import get_profile_file, profile, write_collapsed_stacks
+from foundrytools_cli.utils.progress import RunProgress
+from foundrytools_cli.utils.read_ahead import read_ahead
+from foundrytools_cli.utils.recorder import RunRecorder
+from foundrytools_cli.utils.scheduling import estimate_memory, load_timings, sort_longest_first
+from foundrytools_cli.utils.sharding import SHARD_BY_HASH, ShardSelector
+from foundrytools_cli.utils.sniffing import FontSignature, sniff_font
+from foundrytools_cli.utils.timer import Timer, cpu_time
+from foundrytools_cli.utils.walker import walk_fonts
+
+_T = TypeVar("_T")
+
+# Map each FinderFilter flag to the Font property that it checks
+FILTER_PROPERTIES = {
+    "filter_out_tt": "is_tt",
+    "filter_out_ps": "is_ps",
+    "filter_out_woff": "is_woff",
+    "filter_out_woff2": "is_woff2",
+    "filter_out_sfnt": "is_sfnt",
+    "filter_out_static": "is_static",
+    "filter_out_variable": "is_variable",
+}
+
+
+def is_filtered_out(font: Font | FontSignature, filter_: FinderFilter) -> bool:
+    """
+    Check if a font would be filtered out by a ``FinderFilter``.
+
+    :param font: The font to check, or its type read by ``sniff_font``
+    :type font: Font | FontSignature
+    :param filter_: The filter to apply
+    :type filter_: FinderFilter
+    :return: ``True`` if the font is filtered out, ``False`` otherwise
+    :rtype: bool
+    """
+    return any(
+        getattr(filter_, flag) and getattr(font, prop) for flag, prop in FILTER_PROPERTIES.items()
+    )
 
 
 class FontSaveError(Exception):
@@ -33,6 +103,52 @@ class SaveOptions:
     suffix: str = ""
     output_dir: Path | None = None
     overwrite: bool = False
+    fast_save: bool = False
+
+
+@dataclass
+class RunnerOptions:  # pylint: disable=too-many-instance-attributes
+    """
+    A class that specifies how the TaskRunner processes the fonts.
+    """
+
+    jobs: int = 1
+    incremental: bool = False
+    metrics_out: Path | None = None
+    profile_dir: Path | None = None
+    profile_stacks: bool = False
+    longest_first: bool = False
+    timings_from: Path | None = None
+    max_memory: int | None = None
+    timeout: float | None = None
+    resume: Path | None = None
+    shard: tuple[int, int] | None = None
+    shard_by: str = SHARD_BY_HASH
+    verbose: bool = False
+    index: Path | None = None
+    where: str | None = None
+    dedupe: bool = False
+    input_files: list[Path] | None = None
+
+
+@dataclass
+class FontResult:  # pylint: disable=too-many-instance-attributes
+    """
+    The outcome of processing a single font.
+
+    When the font is processed in a worker process, ``logs`` holds the log messages to be emitted
+    by the main process. ``timings`` holds the wall time of each phase, in seconds.
+    """
+
+    file: Path | None = None
+    failed: bool = False
+    timed_out: bool = False
+    out_files: list[Path] = field(default_factory=list)
+    size_in: int = 0
+    cpu_time: float = 0.0
+    timings: dict[str, float] = field(default_factory=dict)
+    profile_file: Path | None = None
+    logs: list[tuple[str, str]] = field(default_factory=list)
 
 
 class TaskRunnerConfig:  # pylint: disable=too-few-public-methods
@@ -45,12 +161,14 @@ class TaskRunnerConfig:  # pylint: disable=too-few-public-methods
         self.filter = FinderFilter()
         self.finder_options = FinderOptions()
         self.save_options = SaveOptions()
+        self.runner_options = RunnerOptions()
         self.task_options: dict[str, Any] = {}
         self._handle_options(options)
 
     def _handle_options(self, options: dict[str, Any]) -> None:
         self._parse_finder_options(options)
         self._parse_save_options(options)
+        self._parse_runner_options(options)
         self._parse_task_options(options)
 
     def _parse_finder_options(self, options: dict[str, Any]) -> None:
@@ -59,6 +177,9 @@ class TaskRunnerConfig:  # pylint: disable=too-few-public-methods
     def _parse_save_options(self, options: dict[str, Any]) -> None:
         self._set_options(self.save_options, options)
 
+    def _parse_runner_options(self, options: dict[str, Any]) -> None:
+        self._set_options(self.runner_options, options)
+
     def _parse_task_options(self, options: dict[str, Any]) -> None:
         if "kwargs" in get_type_hints(self.task):
             self.task_options.update(
@@ -67,6 +188,7 @@ class TaskRunnerConfig:  # pylint: disable=too-few-public-methods
                     for k, v in options.items()
                     if k not in get_type_hints(FinderOptions)
                     and k not in get_type_hints(SaveOptions)
+                    and k not in get_type_hints(RunnerOptions)
                 }
             )
         for key, value in options.items():
@@ -75,7 +197,8 @@ class TaskRunnerConfig:  # pylint: disable=too-few-public-methods
 
     @staticmethod
     def _set_options(
-        options_group: dict | FinderOptions | SaveOptions, options: dict[str, Any]
+        options_group: dict | FinderOptions | SaveOptions | RunnerOptions,
+        options: dict[str, Any],
     ) -> None:
         """
         Update attributes of an options_group with provided options if the attribute exists.
@@ -85,7 +208,7 @@ class TaskRunnerConfig:  # pylint: disable=too-few-public-methods
                 setattr(options_group, key, value)
 
 
-class TaskRunner:  # pylint: disable=too-few-public-methods
+class TaskRunner:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
     """
     A class for running tasks on multiple fonts.
 
@@ -98,10 +221,18 @@ class TaskRunner:  # pylint: disable=too-few-public-methods
         force_modified (bool): Whether to force the font to be saved even if it has not been
             modified. Set to True when it's not possible to determine if the font has been modified,
             or when it's too expensive to check. Defaults to False.
+        depends_on_file_name (bool): Whether the result of the task depends on the font file, and
+            not only on its tables, like the tasks that run external tools on the file. With
+            ``--dedupe``, only the fonts with the same tables and the same file name, in different
+            directories, are then deduplicated. Defaults to False.
         config (TaskRunnerConfig): A configuration object containing FinderOptions, SaveOptions,
             and specific task options.
+        look_ahead (int): The maximum number of fonts to find in advance while the worker
+            processes are busy. Defaults to 64.
     """
 
+    _collected: ClassVar[list["TaskRunner"] | None] = None
+
     def __init__(
         self,
         input_path: Path,
@@ -121,68 +252,659 @@ class TaskRunner:  # pylint: disable=too-few-public-methods
         self.filter = FinderFilter()
         self.save_if_modified = True
         self.force_modified = False
+        self.depends_on_file_name = False
         self.config = TaskRunnerConfig(options=options, task_callable=task)
+        self.look_ahead = 64
+        self._recorder = RunRecorder()
+        self._shard: ShardSelector | None = None
+        self._duplicates: DuplicateSkipper | None = None
+        self._run_stats: pstats.Stats | None = None
+        # The discovery and load timings of the fonts found but not processed yet
+        self._timings: dict[Path, dict[str, float]] = {}
+        self._timed_out: list[Path] = []
+        self._progress: RunProgress | None = None
+        self._progress_task: TaskID | None = None
+        self._owns_progress = False
+        # The archive processed in memory, and the member and the data of each font found in it
+        self._archive: ArchiveSession | None = None
+        self._archive_members: dict[Path, tuple[ArchiveMember, bytes]] = {}
+        self._output_dir: Path | None = None
+
+    @classmethod
+    @contextmanager
+    def collect(cls) -> Generator[list["TaskRunner"], None, None]:
+        """
+        Collect the instances on which ``run`` is called, instead of running them.
+
+        This allows to get the task and the options of an existing command by invoking it.
+        """
+        # Restore the outer collection on exit, since collections can be nested (``ftcli run``
+        # collects the runners of ``ftcli chain``, which collects the runners of its steps)
+        outer = cls._collected
+        cls._collected = []
+        try:
+            yield cls._collected
+        finally:
+            cls._collected = outer
 
-    @Timer(logger=logger.opt(colors=True).info, text="Elapsed time <cyan>{:0.4f} seconds</>")
     def run(self) -> None:
         """
         Executes a task processing multiple fonts.
+
+        When more than one job is requested, each font is processed in a separate worker process.
+        The log messages of each font are emitted by the main process, in the same order as the
+        fonts are found.
         """
+        if self._collected is not None:
+            self._collected.append(self)
+            return
+
+        timer = Timer(logger=None)
+        timer.start()
+        total_cpu_time = 0.0
+
+        self.start_run()
         try:
-            fonts = self._find_fonts()
-        except (FinderError, NoFontsFoundError) as e:
+            results = (
+                self._process_files(self.find_files())
+                if self.uses_workers()
+                else self.process_fonts(self.find_fonts())
+            )
+        except (FinderError, NoFontsFoundError, FontIndexError, ArchiveError) as e:
             logger.error(e)
+        else:
+            for result in results:
+                self.handle_result(result)
+                total_cpu_time += result.cpu_time
+        finally:
+            self.finish_run()
+
+        logger.opt(colors=True).info(
+            f"Elapsed time <cyan>{timer.stop():0.4f} seconds</> "
+            f"(CPU time <cyan>{total_cpu_time:0.4f} seconds</>)"
+        )
+
+    def start_run(
+        self, progress: RunProgress | None = None, description: str | None = None
+    ) -> None:
+        """
+        Open the incremental cache and the metrics file, if requested, and start the progress
+        display.
+
+        :param progress: A progress display shared with other runs. If ``None``, the run starts its
+            own display unless the per-font messages are requested with ``verbose``.
+        :param description: The description of the run in the progress display. Defaults to the
+            name of the input path.
+        """
+        options = self.config.runner_options
+        if is_archive(self.input_path):
+            self._start_archive()
+        self._recorder = RunRecorder(
+            self._get_identity,
+            incremental=options.incremental and self._archive is None,
+            resume=options.resume if self._archive is None else None,
+            metrics_out=options.metrics_out,
+        )
+        if options.shard is not None:
+            self._shard = ShardSelector(
+                options.shard,
+                self.input_path,
+                by=options.shard_by,
+                index=options.index,
+                recursive=self.config.finder_options.recursive,
+                where=options.where,
+            )
+        if options.dedupe:
+            self._duplicates = DuplicateSkipper(
+                depends_on_file_name=self.depends_on_file_name,
+                overwrite=self.config.save_options.overwrite,
+            )
+
+        if progress is None and self.shows_progress():
+            progress = RunProgress()
+            progress.start()
+            self._owns_progress = True
+        if progress is not None:
+            self._progress = progress
+            # The files are counted as they are found (see ``_generate_files``), so that the input
+            # path isn't walked twice. The time remaining is shown once all the files are found.
+            self._progress_task = progress.add_task(
+                description or self.input_path.name,
+                total=self._archive.count_files() if self._archive is not None else None,
+            )
+
+    def _start_archive(self) -> None:
+        """
+        Process the fonts of an archive in memory, writing the output files to the output directory
+        or to a new archive. The options that need the fonts on disk, or worker processes, are not
+        supported.
+        """
+        options = self.config.runner_options
+        ignored = [
+            name
+            for name, value in (
+                ("--jobs", options.jobs != 1),
+                ("--timeout", options.timeout),
+                ("--incremental", options.incremental),
+                ("--resume", options.resume),
+                ("--shard", options.shard),
+                ("--dedupe", options.dedupe),
+                ("--index", options.index),
+            )
+            if value
+        ]
+        if ignored:
+            logger.warning(f"{', '.join(ignored)} not supported with archives, ignored")
+
+        # The fonts are saved next to their path in the staging directory of the archive, so that
+        # the output files keep the directory structure of the archive
+        self._output_dir = self.config.save_options.output_dir
+        self._archive = ArchiveSession(
+            self.input_path,
+            output_dir=self._output_dir,
+            overwrite=self.config.save_options.overwrite,
+        )
+        self._set_output_dir(None)
+
+    def _finish_archive(self, archive: ArchiveSession) -> None:
+        """
+        Write the new archive, if any, and restore the output directory.
+        """
+        self._archive_members = {}
+        self._set_output_dir(self._output_dir)
+        try:
+            out_archive = archive.close()
+        except (OSError, ArchiveError) as e:
+            logger.error(f"Can't write {archive.out_archive}: {e}")
+            return
+        if out_archive is not None:
+            logger.success(f"Archive saved to {out_archive}")
+        elif archive.out_archive is not None and archive.saved:
+            logger.error(f"{archive.archive} was not read completely, no archive saved")
+
+    def _set_output_dir(self, output_dir: Path | None) -> None:
+        self.config.save_options.output_dir = output_dir
+        if "output_dir" in self.config.task_options:
+            self.config.task_options["output_dir"] = output_dir
+
+    def shows_progress(self) -> bool:
+        """
+        The progress is displayed instead of the per-font messages when processing a directory,
+        unless ``verbose`` is set or the messages are printed as JSON lines.
+        """
+        return (
+            not self.config.runner_options.verbose
+            and not is_console_structured()
+            and (self.input_path.is_dir() or is_archive(self.input_path))
+        )
+
+    def finish_run(self) -> None:
+        """
+        Stop the progress display, close the incremental cache and the metrics file, and save the
+        profile of the run.
+        """
+        if self._progress is not None:
+            if self._owns_progress:
+                self._progress.stop()
+                self._owns_progress = False
+            self._progress = None
+            self._progress_task = None
+
+        self._shard = None
+        self._duplicates = None
+
+        if self._archive is not None:
+            self._finish_archive(self._archive)
+            self._archive = None
+
+        self._recorder.close()
+        self._recorder = RunRecorder()
+
+        if self._run_stats is not None:
+            self._save_run_profile(self._run_stats)
+            self._run_stats = None
+
+        if self._timed_out:
+            logger.warning(
+                f"{len(self._timed_out)} fonts timed out: "
+                + ", ".join(str(file) for file in self._timed_out)
+            )
+            self._timed_out = []
+
+    def handle_result(self, result: FontResult) -> None:
+        """
+        Emit the log messages of a processed font, and record its result in the progress display,
+        the incremental cache, the journal and the metrics file. The output files are copied to the
+        duplicates of the font.
+
+        :param result: The result of the font
+        :type result: FontResult
+        """
+        with logger.contextualize(file=str(result.file)):
+            replay_logs(result.logs)
+        if self._progress is not None:
+            self._update_progress(result=result)
+        else:
+            print()  # add a newline after each font
+        if result.file is not None:
+            result.timings = {**self._timings.pop(result.file, {}), **result.timings}
+        if result.timed_out and result.file is not None:
+            self._timed_out.append(result.file)
+        if self._duplicates is not None and result.file is not None:
+            copies, copy_failed = self._duplicates.copy_outputs(
+                result.file, result.out_files, failed=result.failed
+            )
+            result.out_files.extend(copies)
+            result.failed = result.failed or copy_failed
+        self._recorder.record(result)
+        if result.profile_file is not None:
+            if self._run_stats is None:
+                self._run_stats = pstats.Stats(str(result.profile_file))
+            else:
+                self._run_stats.add(str(result.profile_file))
+        if self._archive is not None and result.file in self._archive_members:
+            self._add_to_archive(self._archive, result)
+
+    def _add_to_archive(self, archive: ArchiveSession, result: FontResult) -> None:
+        """
+        Move the output files of a font read from an archive to the new archive.
+        """
+        member, data = self._archive_members.pop(result.file)  # type: ignore[arg-type]
+        try:
+            archive.add_outputs(member, data, result.out_files)
+        except (OSError, ArchiveError) as e:
+            logger.error(f"Can't add the output files of {member.name} to the archive: {e}")
+
+    def _update_progress(self, result: FontResult | None = None, skipped: bool = False) -> None:
+        """
+        Count a processed font, a font skipped since it was processed by a previous run, or else a
+        file that is not a font or is filtered out.
+        """
+        if self._progress is None or self._progress_task is None:
+            return
+        if result is not None:
+            self._progress.add_processed(self._progress_task, result.size_in, result.failed)
+        elif skipped:
+            self._progress.add_skipped(self._progress_task)
+        else:
+            self._progress.add_ignored(self._progress_task)
+
+    def _save_run_profile(self, stats: pstats.Stats) -> None:
+        """
+        Save the profiles of all the fonts aggregated in a single profile.
+        """
+        profile_dir = self.config.runner_options.profile_dir
+        if profile_dir is None:
             return
+        run_file = profile_dir / "run.prof"
+        stats.dump_stats(run_file)
+        if self.config.runner_options.profile_stacks:
+            write_collapsed_stacks(stats, run_file.with_suffix(".collapsed"))
+        logger.info(f"Profiles saved to {profile_dir}")
+
+    def _get_jobs(self) -> int:
+        if self._archive is not None:
+            # The fonts of an archive are read in memory by the main process
+            return 1
+        jobs = self.config.runner_options.jobs or os.cpu_count() or 1
+        if jobs > 1 and not FORK_AVAILABLE:
+            logger.warning("Parallel processing is not supported on this platform")
+            return 1
+        return jobs
+
+    def _get_timeout(self) -> float | None:
+        timeout = self.config.runner_options.timeout
+        if self._archive is not None:
+            return None
+        if timeout is not None and not FORK_AVAILABLE:
+            logger.warning("Timeouts are not supported on this platform")
+            return None
+        return timeout
+
+    def uses_workers(self) -> bool:
+        """
+        Whether the fonts are processed in worker processes. With a timeout, each font is processed
+        in a worker process that can be killed, also with a single job.
+        """
+        return self._get_jobs() != 1 or self._get_timeout() is not None
 
+    def process_fonts(self, fonts: Iterator[Font]) -> Iterator[FontResult]:
+        """
+        Process the fonts in the main process.
+        """
         timer = Timer(
             logger=logger.opt(colors=True).info,
             text="Processing time: <cyan>{:0.4f} seconds</>",
         )
         for font in fonts:
-            self._process_font(font, timer=timer)
+            yield self._process_font(font, timer=timer)
 
-    def _find_fonts(self) -> list[Font]:
-        finder = FontFinder(
-            input_path=self.input_path, options=self.config.finder_options, filter_=self.filter
+    def _process_files(self, files: Iterator[Path]) -> Iterator[FontResult]:
+        """
+        Process the font files in worker processes, which open the fonts themselves.
+        """
+        pool = ProcessPool(
+            self.process_file,
+            jobs=self._get_jobs(),
+            error_handler=self.handle_worker_error,
+            look_ahead=self.look_ahead,
+            weight=estimate_memory,
+            max_weight=self.config.runner_options.max_memory,
+            timeout=self._get_timeout(),
         )
-        fonts = finder.find_fonts()
-        if not fonts:
+        yield from pool.imap(self._get_scheduled_files(files))
+
+    def _get_scheduled_files(self, files: Iterator[Path]) -> Iterable[Path]:
+        """
+        Get the files to process in the worker processes, sorted longest first if requested. Sorting
+        requires all the fonts to be found before the first one is processed.
+        """
+        options = self.config.runner_options
+        if not options.longest_first and options.timings_from is None:
+            return files
+        timings = load_timings(options.timings_from) if options.timings_from else None
+        return sort_longest_first(list(files), timings=timings)
+
+    def _get_identity(self) -> dict[str, Any]:
+        """
+        Describe the command and the options that affect the output, for the incremental cache.
+        """
+        ctx = click.get_current_context(silent=True)
+        finder_options = asdict(self.config.finder_options)
+        finder_options.pop("recursive")
+        return {
+            "version": VERSION,
+            "command": ctx.command_path if ctx else self.task.__qualname__,
+            "task_options": self.config.task_options,
+            "save_options": asdict(self.config.save_options),
+            "finder_options": finder_options,
+        }
+
+    def find_fonts(self) -> Iterator[Font]:
+        """
+        Lazily find and open the fonts, so that the first font can be processed as soon as it is
+        found.
+
+        The first font is searched immediately, to raise a ``NoFontsFoundError`` before processing
+        if nothing matches.
+        """
+        return self._check_found(self._generate_fonts())
+
+    def find_files(self) -> Iterator[Path]:
+        """
+        Lazily find the font files, without opening them, for the worker processes.
+
+        The first file is searched immediately, to raise a ``NoFontsFoundError`` before processing
+        if nothing matches.
+        """
+        return self._check_found(self._generate_font_files())
+
+    def _check_found(self, items: Iterator[_T]) -> Iterator[_T]:
+        first_item = next(items, None)
+        if first_item is None:
+            if self._recorder.has_skipped:
+                return iter(())
+            if self._shard is not None and next(self._walk_input_path(), None) is not None:
+                # With few fonts, some shards may get none
+                logger.skip(f"No fonts in shard {self._shard}")  # type: ignore
+                return iter(())
             raise NoFontsFoundError(f"No fonts found in {self.input_path}")
-        return fonts
+        return itertools.chain([first_item], items)
+
+    def _generate_files(self) -> Iterator[Path]:
+        files = self._walk_input_path()
+        if self._shard is not None:
+            files = self._shard.select(files)
+        if self._duplicates is not None:
+            files = self._duplicates.skip(files)
+        if self._progress is not None and self._progress_task is not None:
+            # The files are found ahead of the processing, so that their number, and the time
+            # remaining, are known long before the end of the run
+            progress, task_id = self._progress, self._progress_task
+            files = read_ahead(
+                files,
+                on_item=lambda _: progress.add_found(task_id),
+                on_done=lambda: progress.finish_discovery(task_id),
+            )
+        yield from files
+
+    def _walk_input_path(self) -> Iterator[Path]:
+        if self.config.runner_options.input_files is not None:
+            # The listed files are used as they are. The ones that don't exist, like the files
+            # deleted in a ``git diff``, are skipped
+            yield from (x for x in self.config.runner_options.input_files if x.is_file())
+        elif self.config.runner_options.index is not None:
+            yield from self._select_from_index(self.config.runner_options.index)
+        else:
+            yield from walk_fonts(self.input_path, recursive=self.config.finder_options.recursive)
+
+    def _select_from_index(self, index_file: Path) -> Iterator[Path]:
+        """
+        Get the fonts of the input path from the index instead of searching the file system,
+        optionally selected by their metadata.
+        """
+        index = FontIndex(index_file, read_only=True)
+        try:
+            files = index.select(
+                self.input_path,
+                recursive=self.config.finder_options.recursive,
+                where=self.config.runner_options.where,
+            )
+        finally:
+            index.close()
+        # The files deleted since the index was updated are skipped
+        yield from (file for file in files if file.is_file())
+
+    def _validate_input(self) -> None:
+        """
+        Validate the input path and the filter.
+        """
+        FontFinder(
+            input_path=self.input_path, options=self.config.finder_options, filter_=self.filter
+        )
+
+    def _generate_font_files(self) -> Iterator[Path]:
+        """
+        Find the files that are fonts and are not filtered out, timing the discovery of each font.
+        Files are checked against the cache, and their type is read from the header and the table
+        directory, without opening them.
+        """
+        self._validate_input()
+        start_time = time.perf_counter()
+        for file in self._generate_files():
+            if self._recorder.is_done(file):
+                self._update_progress(skipped=True)
+                continue
+
+            signature = sniff_font(file)
+            if signature is None or is_filtered_out(signature, self.filter):
+                self._update_progress()
+                continue
+
+            self._timings[file] = {"discovery": time.perf_counter() - start_time}
+            yield file
+            start_time = time.perf_counter()
+
+    def _generate_fonts(self) -> Iterator[Font]:
+        """
+        Open the fonts found by ``_generate_font_files``, or the fonts of an archive, timing the
+        load of each font.
+        """
+        if self._archive is not None:
+            self._validate_input()
+            yield from self._generate_archive_fonts(self._archive)
+            return
 
-    def _process_font(self, font: Font, timer: Timer) -> None:
-        with font:
+        for file in self._generate_font_files():
+            load_start_time = time.perf_counter()
+            try:
+                font = self._load_font(file)
+            except (TTLibError, PermissionError):
+                self._timings.pop(file, None)
+                self._update_progress()
+                continue
+            self._timings[file]["load"] = time.perf_counter() - load_start_time
+            yield font
+
+    def _generate_archive_fonts(self, archive: ArchiveSession) -> Iterator[Font]:
+        """
+        Open the fonts of an archive from memory, as if they were in the staging directory of the
+        archive. The other members are copied to the new archive, if any, as they are.
+        """
+        start_time = time.perf_counter()
+        try:
+            for member, stream in archive.members():
+                if stream is None or not member.is_safe or not is_font_member(member):
+                    archive.copy_member(member, stream)
+                    if member.is_file:
+                        self._update_progress()
+                    continue
+
+                data = stream.read()
+                signature = sniff_font(BytesIO(data))
+                load_start_time = time.perf_counter()
+                try:
+                    if signature is None or is_filtered_out(signature, self.filter):
+                        raise TTLibError("Not a font, or filtered out")
+                    font = self._load_font(BytesIO(data))
+                except TTLibError:
+                    archive.copy_member(member, BytesIO(data))
+                    self._update_progress()
+                    continue
+                load_time = time.perf_counter() - load_start_time
+
+                file = font.file = archive.get_member_path(member)
+                self._archive_members[file] = (member, data)
+                self._timings[file] = {
+                    "discovery": load_start_time - start_time,
+                    "load": load_time,
+                }
+                yield font
+                start_time = time.perf_counter()
+        except ArchiveError as e:
+            logger.error(e)
+
+    def process_file(self, file: Path) -> FontResult:
+        """
+        Open and process a font file. This is the entry point of the worker processes.
+        """
+        # Only the messages that are emitted by some sink are sent back to the main process
+        with capture_logs(level=get_min_level()) as logs:
+            timer = Timer(
+                logger=logger.opt(colors=True).info,
+                text="Processing time: <cyan>{:0.4f} seconds</>",
+            )
+            load_start_time = time.perf_counter()
+            try:
+                font = self._load_font(file)
+            except Exception as e:  # pylint: disable=broad-except
+                self._log_error(e)
+                result = FontResult(file=file, failed=True)
+            else:
+                load_time = time.perf_counter() - load_start_time
+                result = self._process_font(font, timer=timer)
+                result.timings["load"] = load_time
+        result.logs = logs
+        return result
+
+    def _load_font(self, file: Path | BytesIO) -> Font:
+        return Font(
+            file,
+            lazy=self.config.finder_options.lazy,
+            recalc_bboxes=self.config.finder_options.recalc_bboxes,
+            recalc_timestamp=self.config.finder_options.recalc_timestamp,
+        )
+
+    def _process_font(self, font: Font, timer: Timer) -> FontResult:
+        result = FontResult(file=font.file)
+        if font.file in self._archive_members:
+            result.size_in = len(self._archive_members[font.file][1])
+        elif font.file is not None:
+            # Read the size before the font is overwritten
+            result.size_in = font.file.stat().st_size
+        cpu_timer = Timer(logger=None, clock=cpu_time)
+        task_timer = Timer(logger=None)
+        profile_dir = self.config.runner_options.profile_dir
+        if profile_dir is not None and font.file is not None:
+            result.profile_file = get_profile_file(profile_dir, font.file)
+        with font, logger.contextualize(file=str(font.file)):
             timer.start()
+            cpu_timer.start()
             logger.info(f"Processing file {font.file}")
-            task_result = bool(self._execute_task(font))
-            self._save_or_skip(font, task_status=task_result)
+            with profile(result.profile_file, stacks=self.config.runner_options.profile_stacks):
+                task_timer.start()
+                task_result = self._execute_task(font, result=result)
+                result.timings["task"] = task_timer.stop()
+                self._save_or_skip(font, task_status=bool(task_result), result=result)
             timer.stop()
-            print()  # add a newline after each font
+            result.cpu_time = cpu_timer.stop()
+            return result
 
-    def _execute_task(self, font: Font) -> bool:
+    @staticmethod
+    def handle_worker_error(file: Path, error: ProcessPoolError) -> FontResult:
+        """
+        Get the result of a font whose worker process failed or timed out.
+
+        :param file: The font file
+        :type file: Path
+        :param error: The error of the worker process
+        :type error: ProcessPoolError
+        :return: The failed result of the font
+        :rtype: FontResult
+        """
+        return FontResult(
+            file=file,
+            failed=True,
+            timed_out=isinstance(error, ProcessPoolTimeoutError),
+            logs=[("ERROR", f"Error processing file {file}: {error}")],
+        )
+
+    def _execute_task(self, font: Font, result: FontResult) -> Any:
+        """
+        Execute the task. Tasks that save the font by themselves may return the list of the files
+        they have written.
+        """
         try:
-            return bool(self.task(font, **self.config.task_options))
+            task_result = self.task(font, **self.config.task_options)
         except Exception as e:  # pylint: disable=broad-except
             self._log_error(e)
+            result.failed = True
             return False
 
-    def _save_or_skip(self, font: Font, task_status: bool) -> None:
+        if not self.save_if_modified and isinstance(task_result, list):
+            result.out_files.extend(task_result)
+        return task_result
+
+    def _save_or_skip(self, font: Font, task_status: bool, result: FontResult) -> None:
         if not self._font_should_be_saved(task_status=task_status):
             if self.save_if_modified:
                 logger.skip("No changes made")  # type: ignore
         else:
-            self._save_font_to_file(font)
+            self._save_font_to_file(font, result=result)
 
     def _font_should_be_saved(self, task_status: bool) -> bool:
         return (self.save_if_modified and task_status) or self.force_modified
 
-    def _save_font_to_file(self, font: Font) -> None:
+    def _save_font_to_file(self, font: Font, result: FontResult) -> None:
+        timer = Timer(logger=None)
         try:
             out_file = self._get_out_file_name(font)
-            font.save(out_file, reorder_tables=self.config.save_options.reorder_tables)
+            # Compile to memory first, to time the compilation and the writing separately
+            buffer = BytesIO()
+            timer.start()
+            if self.config.save_options.fast_save and can_fast_save(font):
+                fast_save(font, buffer, reorder_tables=self.config.save_options.reorder_tables)
+            else:
+                font.save(buffer, reorder_tables=self.config.save_options.reorder_tables)
+            result.timings["compile"] = timer.stop()
+            timer.start()
+            write_atomic(out_file, buffer.getbuffer())
+            result.timings["write"] = timer.stop()
             logger.success(f"File saved to {out_file}")
+            result.out_files.append(out_file)
         except Exception as e:  # pylint: disable=broad-except
             self._log_error(e)
+            result.failed = True
 
     def _get_out_file_name(self, font: Font) -> Path:
         return font.get_file_path(
@@ -1,5 +1,6 @@
 # https://realpython.com/python-timer/#the-python-timer-code
 
+import os
 import time
 from collections.abc import Callable
 from contextlib import ContextDecorator
@@ -11,6 +12,12 @@ class TimerError(Exception):
     """A custom exception used to report errors in use of Timer class"""
 
 
+def cpu_time() -> float:
+    """Return the CPU time of the current process and of its terminated children"""
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
 @dataclass
 class Timer(ContextDecorator):
     """Time your code using a class, context manager, or decorator"""
@@ -19,6 +26,7 @@ class Timer(ContextDecorator):
     name: str | None = None
     text: str = "Elapsed time: {:0.4f} seconds"
     logger: Callable[[str], None] | None = print
+    clock: Callable[[], float] = time.perf_counter
     _start_time: float | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
@@ -31,7 +39,7 @@ class Timer(ContextDecorator):
         if self._start_time is not None:
             raise TimerError("Timer is running. Use .stop() to stop it")
 
-        self._start_time = time.perf_counter()
+        self._start_time = self.clock()
 
     def stop(self) -> float:
         """Stop the timer, and report the elapsed time"""
@@ -39,7 +47,7 @@ class Timer(ContextDecorator):
             raise TimerError("Timer is not running. Use .start() to start it")
 
         # Calculate elapsed time
-        elapsed_time = time.perf_counter() - self._start_time
+        elapsed_time = self.clock() - self._start_time
         self._start_time = None
 
         # Report elapsed time
@@ -0,0 +1,123 @@
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+# The extensions of the font files, which are accepted without reading them
+FONT_EXTENSIONS = frozenset({".ttf", ".otf", ".woff", ".woff2", ".ttc", ".otc", ".dfont"})
+# The first bytes of the font files: sfnt (TrueType, OpenType-PS, Apple), WOFF, WOFF2 and
+# collections
+FONT_MAGIC = frozenset({b"\0\1\0\0", b"OTTO", b"true", b"wOFF", b"wOF2", b"ttcf"})
+MAGIC_SIZE = 4
+
+
+def has_font_extension(name: str) -> bool:
+    """
+    Check if a file name has the extension of a font file.
+
+    :param name: The file name
+    :type name: str
+    :return: ``True`` if the extension is a font extension, ``False`` otherwise
+    :rtype: bool
+    """
+    return os.path.splitext(name)[1].lower() in FONT_EXTENSIONS
+
+
+def is_font_magic(data: bytes) -> bool:
+    """
+    Check if the first bytes of a file are the magic bytes of a font.
+
+    :param data: The first bytes of the file (at least ``MAGIC_SIZE``)
+    :type data: bytes
+    :return: ``True`` if the file starts like a font, ``False`` otherwise
+    :rtype: bool
+    """
+    return data[:MAGIC_SIZE] in FONT_MAGIC
+
+
+def is_font_candidate(path: str) -> bool:
+    """
+    Check if a file may be a font: its extension is a font extension, or it starts with the magic
+    bytes of a font. Other files are rejected without being parsed.
+
+    :param path: The path of the file
+    :type path: str
+    :return: ``True`` if the file may be a font, ``False`` otherwise
+    :rtype: bool
+    """
+    if has_font_extension(path):
+        return True
+    try:
+        with open(path, "rb") as f:
+            return is_font_magic(f.read(MAGIC_SIZE))
+    except OSError:
+        return False
+
+
+def _scan_dir(directory: str) -> tuple[list[Path], list[str]]:
+    """
+    List the font candidates and the subdirectories of a directory, sorted by name. Symbolic links
+    to directories are not followed, and the directories that can't be read are skipped, like
+    ``Path.rglob`` does.
+    """
+    files: list[Path] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file() and is_font_candidate(entry.path):
+                        files.append(Path(entry.path))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    files.sort()
+    subdirs.sort()
+    return files, subdirs
+
+
+def walk_fonts(
+    input_path: Path, recursive: bool = False, max_workers: int | None = None
+) -> Iterator[Path]:
+    """
+    Find the files that may be fonts in a directory (see ``is_font_candidate``).
+
+    The directories are listed with ``os.scandir`` by a pool of threads, so that the latency of
+    each listing, and of reading the first bytes of the files, overlap. This matters on network
+    file systems.
+
+    The files are yielded as soon as their directory is listed, in a stable order: the listings are
+    consumed in the order they were submitted, so the directories are walked breadth first, each
+    one sorted by name. The logs, the fonts kept by ``--dedupe`` and the order of the resume journal
+    are then the same in every run.
+
+    :param input_path: The directory to search, or a file, which is yielded as is
+    :type input_path: Path
+    :param recursive: Whether to search the subdirectories
+    :type recursive: bool
+    :param max_workers: The number of threads. Defaults to the default of ``ThreadPoolExecutor``.
+    :type max_workers: int | None
+    :return: The files that may be fonts
+    :rtype: Iterator[Path]
+    """
+    if input_path.is_file():
+        yield input_path
+        return
+    if not recursive:
+        yield from _scan_dir(str(input_path))[0]
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ftcli-walk")
+    try:
+        pending: deque[Future] = deque([executor.submit(_scan_dir, str(input_path))])
+        while pending:
+            files, subdirs = pending.popleft().result()
+            pending.extend(executor.submit(_scan_dir, subdir) for subdir in subdirs)
+            yield from files
+    finally:
+        # Don't wait for the listings that are no longer needed if the caller stops early
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from foundrytools_cli.utils.cache import IncrementalCache
+
+IDENTITY = {"command": "ftcli os2 set-attrs", "task_options": {"weight_class": 500}}
+
+
+def _run(cache_file: Path, font_file: Path, new_data: bytes) -> bool:
+    """
+    Simulate an ``--incremental`` run that overwrites the font in place. Return whether the font
+    was skipped.
+    """
+    cache = IncrementalCache(identity=IDENTITY, cache_file=cache_file)
+    try:
+        if cache.is_up_to_date(font_file):
+            return True
+        font_file.write_bytes(new_data)
+        cache.store(font_file, [font_file])
+        return False
+    finally:
+        cache.close()
+
+
+def test_overwritten_font_is_skipped_on_rerun(tmp_path: Path) -> None:
+    cache_file = tmp_path / "incremental.sqlite3"
+    font_file = tmp_path / "font.ttf"
+    font_file.write_bytes(b"original")
+
+    assert not _run(cache_file, font_file, b"processed")
+    assert _run(cache_file, font_file, b"processed again")
+    assert font_file.read_bytes() == b"processed"
+
+
+def test_changed_font_is_processed_again(tmp_path: Path) -> None:
+    cache_file = tmp_path / "incremental.sqlite3"
+    font_file = tmp_path / "font.ttf"
+    font_file.write_bytes(b"original")
+
+    assert not _run(cache_file, font_file, b"processed")
+    font_file.write_bytes(b"edited")
+    assert not _run(cache_file, font_file, b"processed")
+
+
+def test_other_options_are_not_skipped(tmp_path: Path) -> None:
+    cache_file = tmp_path / "incremental.sqlite3"
+    font_file = tmp_path / "font.ttf"
+    font_file.write_bytes(b"original")
+    assert not _run(cache_file, font_file, b"processed")
+
+    cache = IncrementalCache(identity={**IDENTITY, "task_options": {}}, cache_file=cache_file)
+    try:
+        assert not cache.is_up_to_date(font_file)
+    finally:
+        cache.close()
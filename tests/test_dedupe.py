@@ -0,0 +1,33 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from foundrytools import Font
+
+from benchmarks.corpus import CorpusSpec, build_corpus
+from foundrytools_cli.utils.task_runner import TaskRunner
+
+
+@pytest.mark.parametrize(("depends_on_file_name", "expected"), [(False, 1), (True, 2)])
+def test_dedupe_keeps_fonts_with_other_names(
+    tmp_path: Path, depends_on_file_name: bool, expected: int
+) -> None:
+    corpus_dir = build_corpus(tmp_path / "corpus", CorpusSpec(cjk_fonts=0, variable_fonts=0))
+    font_file = next((corpus_dir / "latin-ttf").iterdir())
+    input_dir = tmp_path / "input"
+    for name in ["a/Font.ttf", "b/Font.ttf", "b/Twin.ttf"]:
+        (input_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(font_file, input_dir / name)
+
+    processed: list[Path] = []
+
+    def task(font: Font) -> bool:
+        assert font.file is not None
+        processed.append(font.file)
+        return False
+
+    runner = TaskRunner(input_path=input_dir, task=task, recursive=True, dedupe=True, jobs=1)
+    runner.depends_on_file_name = depends_on_file_name
+    runner.run()
+
+    assert len(processed) == expected
@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from foundrytools_cli.utils.journal import ResumeJournal, write_atomic
+
+
+def test_symlink_is_written_through(tmp_path: Path) -> None:
+    target = tmp_path / "font.ttf"
+    target.write_bytes(b"original")
+    link = tmp_path / "link.ttf"
+    link.symlink_to(target)
+
+    write_atomic(link, b"processed")
+
+    assert link.is_symlink()
+    assert target.read_bytes() == b"processed"
+
+
+def test_files_are_synced_only_with_a_journal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    synced: list[int] = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    font_file = tmp_path / "font.ttf"
+
+    write_atomic(font_file, b"processed")
+    assert not synced
+
+    journal = ResumeJournal(tmp_path / "journal.jsonl", identity={})
+    try:
+        write_atomic(font_file, b"processed again")
+    finally:
+        journal.close()
+    assert len(synced) == 1
+    assert font_file.read_bytes() == b"processed again"
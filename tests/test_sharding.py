@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from benchmarks.corpus import CorpusSpec, build_corpus
+from foundrytools_cli.__main__ import cli
+
+SHARDS = 3
+
+
+def test_size_shards_process_each_font_once(tmp_path: Path) -> None:
+    corpus_dir = build_corpus(tmp_path / "corpus", CorpusSpec(cjk_fonts=0, variable_fonts=0))
+    fonts = sorted(file for file in corpus_dir.rglob("*.*") if file.suffix != ".json")
+    index_file = tmp_path / "index.sqlite3"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["index", "build", str(corpus_dir), "-r", "--index", str(index_file)]
+    )
+    assert result.exit_code == 0, result.output
+
+    processed: list[str] = []
+    for shard in range(1, SHARDS + 1):
+        metrics_file = tmp_path / f"metrics-{shard}.jsonl"
+        args = ["name", "set-name", str(corpus_dir), "-r", "-n", "3", "-s", "x" * 100 * shard]
+        args += ["--shard", f"{shard}/{SHARDS}", "--shard-by", "size", "--index", str(index_file)]
+        args += ["--metrics-out", str(metrics_file)]
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 0, result.output
+        with metrics_file.open(encoding="utf-8") as f:
+            processed.extend(json.loads(line)["file"] for line in f)
+
+    assert sorted(processed) == [str(font) for font in fonts]
+
+
+def test_size_shards_require_an_index(tmp_path: Path) -> None:
+    result = CliRunner().invoke(
+        cli, ["name", "set-name", str(tmp_path), "-n", "3", "-s", "x", "--shard-by", "size"]
+    )
+    assert result.exit_code != 0
+    assert "--shard-by size requires --index" in result.output
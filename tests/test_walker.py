@@ -0,0 +1,12 @@
+from pathlib import Path
+
+from foundrytools_cli.utils.walker import walk_fonts
+
+
+def test_fonts_are_walked_in_a_stable_order(tmp_path: Path) -> None:
+    for name in ["b/2.ttf", "b/1.otf", "a/c/1.ttf", "a/1.ttf", "2.ttf", "1.ttf", "a/notes.txt"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_bytes(b"")
+
+    files = [path.relative_to(tmp_path).as_posix() for path in walk_fonts(tmp_path, recursive=True)]
+    assert files == ["1.ttf", "2.ttf", "a/1.ttf", "b/1.otf", "b/2.ttf", "a/c/1.ttf"]